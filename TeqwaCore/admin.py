@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from authentication.models import User
+from authentication.models import User, OutgoingEmail, AdminAlert
+from TeqwaCore.models import ImageVariantJob, SearchDocument, UploadIntent
 
 
 from authentication.forms import CustomUserCreationForm, CustomUserChangeForm
@@ -24,4 +25,46 @@ class CustomUserAdmin(UserAdmin):
             'classes': ('wide',),
             'fields': ('email', 'username', 'password1', 'password2', 'role', 'phone'),
         }),
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('subject', 'recipients')
+    readonly_fields = ('attempts', 'last_error', 'locked_at', 'sent_at', 'created_at')
+    ordering = ('-created_at',)
+
+
+@admin.register(AdminAlert)
+class AdminAlertAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'event_type', 'created_at', 'digested_at')
+    list_filter = ('event_type', 'digested_at')
+    search_fields = ('subject', 'message')
+
+
+@admin.register(ImageVariantJob)
+class ImageVariantJobAdmin(admin.ModelAdmin):
+    list_display = ('model_label', 'object_id', 'field_name', 'status', 'attempts', 'next_attempt_at', 'processed_at')
+    list_filter = ('status', 'model_label')
+    search_fields = ('source_name',)
+    readonly_fields = ('attempts', 'last_error', 'locked_at', 'processed_at', 'created_at')
+    ordering = ('-created_at',)
+
+
+@admin.register(UploadIntent)
+class UploadIntentAdmin(admin.ModelAdmin):
+    list_display = ('id', 'purpose', 'user', 'status', 'size', 'created_at', 'attached_at')
+    list_filter = ('purpose', 'status')
+    search_fields = ('key', 'filename', 'user__email')
+    readonly_fields = ('key', 'size', 'completed_at', 'attached_at', 'created_at')
+    ordering = ('-created_at',)
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ('title', 'doc_type', 'object_id', 'published', 'date', 'updated_at')
+    list_filter = ('doc_type', 'published')
+    search_fields = ('title',)
+    readonly_fields = ('updated_at',)
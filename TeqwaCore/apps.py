@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class TeqwacoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'TeqwaCore'
+
+    def ready(self):
+        from .search import connect_search_index
+        from .signals import connect_cache_invalidation
+        from .variants import connect_image_variants
+        connect_cache_invalidation()
+        connect_image_variants()
+        connect_search_index()
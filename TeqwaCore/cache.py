@@ -0,0 +1,115 @@
+"""
+Response caching for public list endpoints.
+
+Cached responses are grouped into namespaces (e.g. 'events', 'education').
+Each namespace has a version token stored in the cache; invalidating a
+namespace just replaces the token, so stale entries are never read again and
+expire on their own. This works the same on the local-memory, file and
+shared (Redis/Memcached) backends because it never needs pattern deletes.
+"""
+import hashlib
+import logging
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+PRIVILEGED_ROLES = ['admin', 'staff']
+
+
+def _cache():
+    return caches[getattr(settings, 'PUBLIC_CACHE_ALIAS', 'default')]
+
+
+def _timeout():
+    return getattr(settings, 'PUBLIC_CACHE_TIMEOUT', 300)
+
+
+def _version_key(namespace):
+    return f'public-cache:{namespace}:version'
+
+
+def get_namespace_version(namespace):
+    """Return the current version token for a namespace, creating it if needed"""
+    cache = _cache()
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        # add() so concurrent workers agree on a single token
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key) or version
+    return version
+
+
+def invalidate_namespace(*namespaces):
+    """Invalidate every cached response in the given namespaces"""
+    cache = _cache()
+    for namespace in namespaces:
+        try:
+            cache.set(_version_key(namespace), uuid.uuid4().hex, timeout=None)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate cache namespace {namespace}: {e}")
+
+
+def build_cache_key(request, namespace, vary_on_role=False):
+    """Build a cache key from the view, host and query parameters"""
+    params = sorted(
+        (key, value)
+        for key in request.query_params.keys()
+        for value in request.query_params.getlist(key)
+    )
+    parts = [
+        request.path,
+        request.get_host(),
+        repr(params),
+    ]
+    if vary_on_role:
+        user = request.user
+        is_privileged = user.is_authenticated and getattr(user, 'role', None) in PRIVILEGED_ROLES
+        parts.append('privileged' if is_privileged else 'public')
+
+    digest = hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+    return f'public-cache:{namespace}:{get_namespace_version(namespace)}:{digest}'
+
+
+def cache_public_response(namespace, vary_on_role=False):
+    """
+    Cache successful GET responses of a function-based API view.
+
+    Must be applied below @api_view so it receives the DRF request.
+    Set vary_on_role for views whose payload differs for admin/staff users.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view_func(request, *args, **kwargs)
+
+            cache = _cache()
+            try:
+                key = build_cache_key(request, namespace, vary_on_role=vary_on_role)
+                cached = cache.get(key)
+            except Exception as e:
+                logger.warning(f"Public cache unavailable: {e}")
+                return view_func(request, *args, **kwargs)
+
+            if cached is not None:
+                response = Response(cached)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200:
+                try:
+                    cache.set(key, response.data, timeout=_timeout())
+                except Exception as e:
+                    logger.warning(f"Failed to store cached response: {e}")
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
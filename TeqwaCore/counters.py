@@ -0,0 +1,147 @@
+"""
+Denormalized capacity counters (attendees, participants, enrollments).
+
+Counters live on the parent row (Event.attendee_count, ...) and are only ever
+changed with single UPDATE statements using F() expressions, so concurrent
+requests never lose increments.
+
+* reserve_seat() takes a seat with a conditional UPDATE
+  (... SET count = count + 1 WHERE count < capacity); it either succeeds
+  atomically or reports that the parent is full, so registration paths cannot
+  overbook. The caller then flags the new row with mark_seat_reserved().
+* take_seat() does both for a row about to be saved with the counted status,
+  so confirmations (admin approval, payment) go through the same check.
+* track_counter() keeps a counter in sync with every other status
+  transition (admin edits, cancellations, deletes, payment confirmation).
+"""
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
+
+
+def reserve_seat(model, pk, counter_field, capacity_field='capacity'):
+    """Atomically take one seat. Returns False when the parent is already full."""
+    updated = model.objects.filter(
+        pk=pk,
+        **{f'{counter_field}__lt': F(capacity_field)}
+    ).update(**{counter_field: F(counter_field) + 1})
+    return updated == 1
+
+
+def adjust_counter(model, pk, counter_field, delta):
+    """Add delta to a counter, never letting it drop below zero"""
+    if not pk or not delta:
+        return
+    model.objects.filter(pk=pk).update(
+        **{counter_field: Greatest(F(counter_field) + delta, Value(0))}
+    )
+
+
+def mark_seat_reserved(instance, parent_field):
+    """Tell the tracker that the seat for this row was taken with reserve_seat()"""
+    reserved = instance.__dict__.setdefault('_reserved_seats', set())
+    reserved.add(parent_field)
+
+
+def _counted_state(instance, parent_field, counted_status):
+    """(counted, parent id) of the row as last loaded or saved"""
+    state = instance.__dict__.get(f'_counter_state_{parent_field}')
+    if state is not None:
+        return state
+    if instance.pk is None or instance._state.adding:
+        return (False, None)
+    attname = instance._meta.get_field(parent_field).attname
+    row = type(instance).objects.filter(pk=instance.pk).values('status', attname).first()
+    return (row['status'] == counted_status, row[attname]) if row else (False, None)
+
+
+def take_seat(instance, parent_field, counter_field, capacity_field='capacity', counted_status='confirmed'):
+    """
+    Reserve the seat for a row about to be saved with counted_status. Returns
+    False when the parent is full. Rows already counted for the same parent
+    keep their seat. Call it in the same transaction.atomic() block as the save.
+    """
+    field = instance._meta.get_field(parent_field)
+    parent_id = getattr(instance, field.attname)
+    if not parent_id or instance.status != counted_status:
+        return True
+    if _counted_state(instance, parent_field, counted_status) == (True, parent_id):
+        return True
+    if not reserve_seat(field.related_model, parent_id, counter_field, capacity_field):
+        return False
+    mark_seat_reserved(instance, parent_field)
+    return True
+
+
+def track_counter(sender, parent_field, counter_field, counted_status='confirmed'):
+    """
+    Keep parent.<counter_field> equal to the number of sender rows whose
+    status is counted_status.
+
+    The status and parent seen when the row was loaded are remembered on the
+    instance, so tracking costs no extra queries on save.
+    """
+    parent_model = sender._meta.get_field(parent_field).related_model
+    parent_attname = sender._meta.get_field(parent_field).attname
+    state_attr = f'_counter_state_{parent_field}'
+    uid = f'counter-{sender._meta.label_lower}-{parent_field}'
+
+    def current_state(instance):
+        return (
+            instance.__dict__.get('status') == counted_status,
+            instance.__dict__.get(parent_attname),
+        )
+
+    def remember_state(sender, instance, **kwargs):
+        if 'status' in instance.__dict__ and parent_attname in instance.__dict__:
+            instance.__dict__[state_attr] = current_state(instance) if instance.pk else (False, None)
+
+    def load_missing_state(sender, instance, raw=False, **kwargs):
+        if raw or state_attr in instance.__dict__:
+            return
+        if instance.pk is None or instance._state.adding:
+            instance.__dict__[state_attr] = (False, None)
+            return
+        row = sender.objects.filter(pk=instance.pk).values('status', parent_attname).first()
+        if row:
+            instance.__dict__[state_attr] = (row['status'] == counted_status, row[parent_attname])
+        else:
+            instance.__dict__[state_attr] = (False, None)
+
+    def apply_transition(sender, instance, created=False, raw=False, **kwargs):
+        if raw:
+            return
+        was_counted, old_parent = (False, None) if created else instance.__dict__.get(state_attr, (False, None))
+        is_counted, new_parent = current_state(instance)
+
+        # A seat taken by reserve_seat() for the new parent is already counted
+        reserved = instance.__dict__.get('_reserved_seats', set())
+        seat_reserved = parent_field in reserved
+        reserved.discard(parent_field)
+
+        if (was_counted, old_parent) != (is_counted, new_parent):
+            if was_counted and old_parent:
+                adjust_counter(parent_model, old_parent, counter_field, -1)
+            if is_counted and new_parent and not seat_reserved:
+                adjust_counter(parent_model, new_parent, counter_field, 1)
+
+        instance.__dict__[state_attr] = (is_counted, new_parent)
+
+    def release_on_delete(sender, instance, **kwargs):
+        was_counted, parent = instance.__dict__.get(state_attr, current_state(instance))
+        if was_counted and parent:
+            adjust_counter(parent_model, parent, counter_field, -1)
+
+    post_init.connect(remember_state, sender=sender, weak=False, dispatch_uid=f'{uid}-init')
+    pre_save.connect(load_missing_state, sender=sender, weak=False, dispatch_uid=f'{uid}-pre-save')
+    post_save.connect(apply_transition, sender=sender, weak=False, dispatch_uid=f'{uid}-save')
+    post_delete.connect(release_on_delete, sender=sender, weak=False, dispatch_uid=f'{uid}-delete')
+
+
+def recount(sender, parent_field, counter_field, counted_status='confirmed'):
+    """Recompute a counter from scratch for every parent row (repair tool)"""
+    parent_model = sender._meta.get_field(parent_field).related_model
+    counted = sender.objects.filter(
+        **{parent_field: OuterRef('pk'), 'status': counted_status}
+    ).order_by().values(parent_field).annotate(total=Count('pk')).values('total')
+    return parent_model.objects.update(**{counter_field: Coalesce(Subquery(counted), Value(0))})
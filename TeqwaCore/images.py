@@ -0,0 +1,136 @@
+"""
+Image helpers shared by models that accept uploaded or base64 images.
+
+Clients used to post images as base64 data URLs, which were stored in text
+columns and sent back inline on every list response. These helpers turn a
+data URL into a regular file for the configured storage (filesystem or S3),
+build the small thumbnails served on list endpoints and the resized
+variants generated by the image variant worker (TeqwaCore.variants).
+"""
+import base64
+import binascii
+import os
+import uuid
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Formats Pillow reports -> file extension used when storing the image
+EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'GIF': 'gif', 'WEBP': 'webp'}
+
+
+def is_data_url(value):
+    return isinstance(value, str) and value.strip().startswith('data:')
+
+
+def decode_data_url(value, name_prefix='image'):
+    """
+    Decode a base64 image data URL into a ContentFile named after its real
+    format. Raises ValueError for anything that is not a readable image.
+    """
+    header, sep, payload = value.strip().partition(',')
+    if not sep or ';base64' not in header:
+        raise ValueError('Image data URL must be base64 encoded')
+
+    max_bytes = getattr(settings, 'IMAGE_DATA_URL_MAX_BYTES', 10 * 1024 * 1024)
+    if len(payload) * 3 // 4 > max_bytes:
+        raise ValueError('Image is too large')
+    try:
+        raw = base64.b64decode(payload, validate=False)
+    except (binascii.Error, ValueError):
+        raise ValueError('Image data URL is not valid base64')
+
+    try:
+        with Image.open(BytesIO(raw)) as image:
+            image_format = image.format
+            image.verify()
+    except Exception:
+        raise ValueError('Image data URL does not contain a readable image')
+
+    extension = EXTENSIONS.get(image_format)
+    if not extension:
+        raise ValueError(f'Unsupported image format: {image_format}')
+    return ContentFile(raw, name=f'{name_prefix}-{uuid.uuid4().hex[:12]}.{extension}')
+
+
+def _flatten(image):
+    """RGB copy of an image, with any transparency composited onto white"""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    if image.mode != 'RGB':
+        return image.convert('RGB')
+    return image
+
+
+def make_thumbnail(file, size=None, quality=80):
+    """
+    Return a JPEG ContentFile no larger than `size` (width, height) made from
+    an image file or field file, honouring EXIF orientation.
+    """
+    size = size or getattr(settings, 'IMAGE_THUMBNAIL_SIZE', (480, 480))
+    file.seek(0)
+    with Image.open(file) as image:
+        image = _flatten(ImageOps.exif_transpose(image))
+        image.thumbnail(size)
+
+        output = BytesIO()
+        image.save(output, format='JPEG', quality=quality, optimize=True)
+
+    stem = os.path.splitext(os.path.basename(file.name or 'image'))[0]
+    return ContentFile(output.getvalue(), name=f'{stem}-thumb.jpg')
+
+
+def generate_variants(field_file, widths, formats=('webp', 'jpeg'), quality=80):
+    """
+    Write resized copies of a stored image next to it, under variants/.
+
+    One file is written per width and format. Widths larger than the
+    original are capped to it, so a small image still gets one re-encoded
+    copy and is never upscaled. Returns the map stored in a model's
+    <field>_variants column:
+    {'source': name, 'width': w, 'height': h, 'webp': {'320': path, ...}, ...}
+    """
+    storage = field_file.storage
+    directory, filename = os.path.split(field_file.name)
+    stem = os.path.splitext(filename)[0]
+
+    with field_file.open('rb') as source, Image.open(source) as original:
+        original = ImageOps.exif_transpose(original)
+        original.load()
+    width, height = original.size
+    has_alpha = original.mode in ('RGBA', 'LA', 'P')
+
+    targets = sorted({min(w, width) for w in widths}) or [width]
+    variants = {'source': field_file.name, 'width': width, 'height': height}
+    for image_format in formats:
+        paths = {}
+        for target in targets:
+            resized = original.copy()
+            resized.thumbnail((target, height))
+            output = BytesIO()
+            if image_format == 'webp':
+                resized = resized.convert('RGBA' if has_alpha else 'RGB')
+                resized.save(output, format='WEBP', quality=quality, method=4)
+                extension = 'webp'
+            else:
+                _flatten(resized).save(output, format='JPEG', quality=quality, optimize=True, progressive=True)
+                extension = 'jpg'
+            name = os.path.join(directory, 'variants', f'{stem}-{target}w.{extension}')
+            paths[str(target)] = storage.save(name, ContentFile(output.getvalue()))
+        variants[image_format] = paths
+    return variants
+
+
+def absolute_media_url(field_file, request=None):
+    """URL of a stored file, made absolute with the request for local media"""
+    if not field_file:
+        return None
+    url = field_file.url
+    if request and not url.startswith(('http://', 'https://')):
+        return request.build_absolute_uri(url)
+    return url
@@ -0,0 +1,79 @@
+"""
+Generate resized WebP/JPEG variants for uploaded images (TeqwaCore.variants).
+
+Uploads only queue an ImageVariantJob; this worker does the resizing. Run it
+with --loop as the image_worker service in docker-compose does, or once from
+cron. --enqueue-existing queues every stored image that has no up-to-date
+variants yet (run once after deploying, or after changing
+IMAGE_VARIANT_WIDTHS with --force).
+"""
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from TeqwaCore.models import ImageVariantJob
+from TeqwaCore.variants import VARIANT_FIELDS, process_variant_jobs, variants_column
+
+
+class Command(BaseCommand):
+    help = 'Generate resized image variants for queued uploads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Jobs claimed per batch (default: IMAGE_VARIANT_BATCH_SIZE)')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep polling for jobs instead of exiting when the queue is empty')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds to sleep between polls when the queue is empty (with --loop)')
+        parser.add_argument('--enqueue-existing', action='store_true',
+                            help='Queue jobs for stored images without current variants, then process')
+        parser.add_argument('--force', action='store_true',
+                            help='With --enqueue-existing, also re-queue images that already have variants')
+
+    def handle(self, *args, **options):
+        if options['enqueue_existing']:
+            queued = self.enqueue_existing(options['force'])
+            self.stdout.write(f'Queued {queued} image(s) for variant generation')
+
+        total_done = total_failed = 0
+        while True:
+            close_old_connections()
+            done, failed = process_variant_jobs(options['batch_size'])
+            total_done += done
+            total_failed += failed
+            if done or failed:
+                self.stdout.write(f'Processed {done} image(s), {failed} failed')
+
+            if done + failed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Image variants: {total_done} done, {total_failed} failed'))
+
+    def enqueue_existing(self, force):
+        queued = 0
+        for label, field_names in VARIANT_FIELDS.items():
+            model = apps.get_model(label)
+            for field_name in field_names:
+                column = variants_column(field_name)
+                rows = (
+                    model.objects.exclude(**{f'{field_name}__isnull': True}).exclude(**{field_name: ''})
+                    .order_by('pk').values_list('pk', field_name, column)
+                )
+                for pk, name, variants in rows.iterator(chunk_size=500):
+                    if not force and (variants or {}).get('source') == name:
+                        continue
+                    ImageVariantJob.objects.update_or_create(
+                        model_label=label, object_id=pk, field_name=field_name,
+                        defaults={
+                            'source_name': name, 'status': 'pending', 'attempts': 0, 'last_error': '',
+                            'next_attempt_at': timezone.now(), 'locked_at': None,
+                        },
+                    )
+                    queued += 1
+        return queued
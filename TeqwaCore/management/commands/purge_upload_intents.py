@@ -0,0 +1,50 @@
+"""
+Delete abandoned direct uploads (TeqwaCore.uploads).
+
+Intents that were never attached to a model are removed once they are
+older than --older-than hours, together with any object the client managed
+to upload; unfinished resumable uploads also lose their part file or S3
+multipart upload. Attached intents are kept: their key is referenced by a
+model.
+"""
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from TeqwaCore.models import UploadIntent
+from TeqwaCore.resumable import discard_resumable
+
+
+class Command(BaseCommand):
+    help = 'Remove upload intents (and their stored files) that were never attached'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=24,
+                            help='Only purge intents created at least this many hours ago')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report what would be removed')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['older_than'])
+        abandoned = UploadIntent.objects.filter(
+            status__in=['pending', 'uploaded'], created_at__lt=cutoff
+        ).exclude(status='pending', expires_at__gt=timezone.now())
+        if options['dry_run']:
+            self.stdout.write(f'{abandoned.count()} abandoned upload(s) would be removed')
+            return
+
+        removed = 0
+        for intent in abandoned.iterator(chunk_size=500):
+            try:
+                if intent.resumable:
+                    discard_resumable(intent)
+                if default_storage.exists(intent.key):
+                    default_storage.delete(intent.key)
+            except Exception as e:
+                self.stderr.write(f'Could not delete {intent.key}: {e}')
+                continue
+            intent.delete()
+            removed += 1
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} abandoned upload(s)'))
@@ -0,0 +1,26 @@
+"""
+Rebuild the site-wide search table (TeqwaCore.search).
+
+Documents are kept current by signals; run this after deploying the search
+table and after bulk imports or deletes that bypass model signals.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from TeqwaCore.search import SEARCH_SOURCES, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Re-index every searchable object into the site-wide search table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', action='append', dest='types', choices=list(SEARCH_SOURCES),
+                            help='Only rebuild this document type (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        counts = rebuild_index(options['types'], batch_size=options['batch_size'])
+        for doc_type, count in counts.items():
+            self.stdout.write(f'{doc_type}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Indexed {sum(counts.values())} document(s)'))
@@ -0,0 +1,27 @@
+"""
+Recompute the denormalized capacity counters from the registration tables.
+Normally the counters are kept in sync incrementally; run this after bulk
+imports or manual SQL edits.
+"""
+from django.core.management.base import BaseCommand
+
+from TeqwaCore.counters import recount
+from education.models import ServiceEnrollment
+from events.models import EventRegistration
+from itikaf.models import ItikafRegistration
+
+COUNTERS = [
+    ('Event.attendee_count', EventRegistration, 'event', 'attendee_count'),
+    ('ItikafProgram.participant_count', ItikafRegistration, 'program', 'participant_count'),
+    ('Course.enrolled_count', ServiceEnrollment, 'course', 'enrolled_count'),
+    ('EducationalService.enrolled_count', ServiceEnrollment, 'service', 'enrolled_count'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Recompute attendee, participant and enrollment counters'
+
+    def handle(self, *args, **options):
+        for label, sender, parent_field, counter_field in COUNTERS:
+            updated = recount(sender, parent_field, counter_field)
+            self.stdout.write(self.style.SUCCESS(f'{label}: recounted {updated} rows'))
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('TeqwaCore', '0002_upload_intent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadintent',
+            name='length',
+            field=models.PositiveBigIntegerField(blank=True, help_text='Declared total size of a resumable upload', null=True),
+        ),
+        migrations.AddField(
+            model_name='uploadintent',
+            name='multipart_id',
+            field=models.CharField(blank=True, help_text='S3 multipart upload id', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='uploadintent',
+            name='offset',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='uploadintent',
+            name='parts',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='uploadintent',
+            name='resumable',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:12
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+def create_search_index(apps, schema_editor):
+    # GIN index on the weighted vector; SQLite searches with icontains instead
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS search_document_vector_idx ON "TeqwaCore_searchdocument" USING gin (search_vector)'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS search_document_vector_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('TeqwaCore', '0003_resumable_uploads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('doc_type', models.CharField(max_length=30)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('keywords', models.TextField(blank=True, help_text='Secondary text: subject, location, instructor')),
+                ('content', models.TextField(blank=True)),
+                ('summary', models.CharField(blank=True, max_length=300)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True)),
+                ('published', models.BooleanField(default=True)),
+                ('date', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-date', '-id'],
+                'indexes': [models.Index(fields=['published', 'doc_type'], name='search_document_type_idx')],
+                'constraints': [models.UniqueConstraint(fields=('doc_type', 'object_id'), name='search_document_target')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
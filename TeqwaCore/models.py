@@ -1,3 +1,106 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
+
+
+class ImageVariantJob(models.Model):
+    """Resized variants still to be generated for an uploaded image (TeqwaCore.variants)"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    model_label = models.CharField(max_length=100)
+    object_id = models.PositiveBigIntegerField()
+    field_name = models.CharField(max_length=50)
+    source_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(fields=['model_label', 'object_id', 'field_name'], name='image_variant_job_target'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='image_variant_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label}#{self.object_id}.{self.field_name} ({self.status})"
+
+
+class UploadIntent(models.Model):
+    """A direct-to-storage upload: issued with a presigned URL, then attached to a model (TeqwaCore.uploads)"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('uploaded', 'Uploaded'),
+        ('attached', 'Attached'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True,
+                             related_name='upload_intents')
+    purpose = models.CharField(max_length=30)
+    key = models.CharField(max_length=255, help_text='Storage name the client uploads to')
+    filename = models.CharField(max_length=255, blank=True)
+    content_type = models.CharField(max_length=100)
+    max_size = models.PositiveBigIntegerField()
+    size = models.PositiveBigIntegerField(null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    # Resumable (chunked) uploads, see TeqwaCore.resumable
+    resumable = models.BooleanField(default=False)
+    length = models.PositiveBigIntegerField(null=True, blank=True, help_text='Declared total size of a resumable upload')
+    offset = models.PositiveBigIntegerField(default=0)
+    multipart_id = models.CharField(max_length=255, blank=True, help_text='S3 multipart upload id')
+    parts = models.JSONField(default=list, blank=True)
+    expires_at = models.DateTimeField()
+    completed_at = models.DateTimeField(null=True, blank=True)
+    attached_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'expires_at'], name='upload_intent_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.purpose}: {self.key} ({self.status})"
+
+
+class SearchDocument(models.Model):
+    """One searchable row per public content object, maintained by TeqwaCore.search"""
+    doc_type = models.CharField(max_length=30)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    keywords = models.TextField(blank=True, help_text='Secondary text: subject, location, instructor')
+    content = models.TextField(blank=True)
+    summary = models.CharField(max_length=300, blank=True)
+    # Weighted title/keywords/content vector, PostgreSQL only
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+    published = models.BooleanField(default=True)
+    date = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-date', '-id']
+        constraints = [
+            models.UniqueConstraint(fields=['doc_type', 'object_id'], name='search_document_target'),
+        ]
+        indexes = [
+            models.Index(fields=['published', 'doc_type'], name='search_document_type_idx'),
+        ]
 
-# Create your models here.
+    def __str__(self):
+        return f"{self.doc_type}#{self.object_id}: {self.title}"
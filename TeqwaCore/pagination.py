@@ -0,0 +1,150 @@
+"""
+Pagination for function-based list views.
+
+Two modes share the {message, data, count} envelope used across the API:
+
+* Page-number mode (default), for admin tables:
+  ?page=2&page_size=50 -> count is the total row count, plus next/previous links.
+* Cursor (keyset) mode, for feeds and infinite scrolling:
+  ?pagination=cursor or ?cursor=<token> -> rows are fetched with a
+  WHERE (timestamp, id) < (cursor) seek, so deep pages cost the same as the
+  first one and no COUNT(*) is issued. count is the number of rows returned.
+
+Both modes order by (-<timestamp field>, -id).
+"""
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def _page_size(request, default=None):
+    rest_settings = getattr(settings, 'REST_FRAMEWORK', {})
+    max_size = rest_settings.get('MAX_PAGE_SIZE', 100)
+    size = default or rest_settings.get('PAGE_SIZE', 20)
+    param = rest_settings.get('PAGE_SIZE_QUERY_PARAM', 'page_size')
+    try:
+        requested = int(request.query_params.get(param, size))
+        if requested > 0:
+            size = requested
+    except (TypeError, ValueError):
+        pass
+    return min(size, max_size)
+
+
+def encode_cursor(timestamp, pk):
+    payload = json.dumps([timestamp.isoformat(), pk])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(token, field):
+    """Decode a cursor token into a (timestamp, id) tuple for the given model field"""
+    try:
+        raw = base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8')
+        timestamp, pk = json.loads(raw)
+        return field.to_python(timestamp), int(pk)
+    except Exception:
+        raise InvalidCursor()
+
+
+def paginated_response(request, queryset, serializer_class, message, cursor_field='created_at',
+                       context=None, page_size=None):
+    """
+    Paginate a queryset and return the standard API response.
+
+    cursor_field is the creation timestamp used for ordering and keyset seeks
+    (e.g. 'created_at', 'registered_at', 'date_joined').
+    """
+    size = _page_size(request, default=page_size)
+    queryset = queryset.order_by(f'-{cursor_field}', '-id')
+    context = context or {}
+
+    cursor_token = request.query_params.get('cursor')
+    if cursor_token is not None or request.query_params.get('pagination') == 'cursor':
+        return _cursor_page(request, queryset, serializer_class, message, cursor_field,
+                            cursor_token, size, context)
+    return _number_page(request, queryset, serializer_class, message, size, context)
+
+
+def _cursor_page(request, queryset, serializer_class, message, cursor_field, cursor_token, size, context):
+    if cursor_token:
+        field = queryset.model._meta.get_field(cursor_field)
+        try:
+            timestamp, pk = decode_cursor(cursor_token, field)
+        except InvalidCursor:
+            return Response({
+                'error': 'Invalid cursor'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        queryset = queryset.filter(
+            Q(**{f'{cursor_field}__lt': timestamp}) |
+            Q(**{cursor_field: timestamp, 'id__lt': pk})
+        )
+
+    rows = list(queryset[:size + 1])
+    has_more = len(rows) > size
+    rows = rows[:size]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, cursor_field), last.pk)
+
+    url = request.build_absolute_uri()
+    serializer = serializer_class(rows, many=True, context=context)
+    return Response({
+        'message': message,
+        'data': serializer.data,
+        'count': len(rows),
+        'next_cursor': next_cursor,
+        'next': replace_query_param(url, 'cursor', next_cursor) if next_cursor else None,
+    })
+
+
+def _number_page(request, queryset, serializer_class, message, size, context):
+    try:
+        page = int(request.query_params.get('page', 1))
+    except (TypeError, ValueError):
+        page = 0
+    if page < 1:
+        return Response({
+            'error': 'Invalid page'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    total = queryset.count()
+    total_pages = max(1, -(-total // size))
+    if page > total_pages:
+        return Response({
+            'error': 'Invalid page'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    offset = (page - 1) * size
+    rows = queryset[offset:offset + size]
+
+    url = request.build_absolute_uri()
+    next_url = replace_query_param(url, 'page', page + 1) if page < total_pages else None
+    if page > 2:
+        previous_url = replace_query_param(url, 'page', page - 1)
+    elif page == 2:
+        previous_url = remove_query_param(url, 'page')
+    else:
+        previous_url = None
+
+    serializer = serializer_class(rows, many=True, context=context)
+    return Response({
+        'message': message,
+        'data': serializer.data,
+        'count': total,
+        'page': page,
+        'page_size': size,
+        'total_pages': total_pages,
+        'next': next_url,
+        'previous': previous_url,
+    })
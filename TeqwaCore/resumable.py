@@ -0,0 +1,216 @@
+"""
+Resumable chunked uploads for large files (lecture recordings).
+
+A resumable upload is an UploadIntent with resumable=True:
+
+1. POST /api/v1/uploads/resumable/ declares purpose, filename, content type
+   and total size.
+2. PATCH /api/v1/uploads/<id>/resumable/ sends the next chunk, with an
+   Upload-Offset header equal to the current offset.
+3. HEAD on the same URL returns Upload-Offset, so a client whose
+   connection dropped continues from there instead of from zero.
+4. POST .../finalize/ assembles the file and optionally attaches it to a
+   lecture.
+
+Chunks are appended to a part file under RESUMABLE_UPLOAD_DIR on filesystem
+storage, or uploaded as S3 multipart parts; no request ever holds more than
+one chunk (at most RESUMABLE_UPLOAD_MAX_CHUNK_BYTES) in memory.
+"""
+import os
+import posixpath
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from .uploads import complete_intent, create_intent, is_presigned_storage
+
+COPY_SIZE = 64 * 1024
+# S3 rejects multipart parts smaller than this, except the last one
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class UploadConflict(Exception):
+    """The client's offset does not match the server's, or another chunk is in flight"""
+
+    def __init__(self, message, offset):
+        super().__init__(message)
+        self.offset = offset
+
+
+def _part_path(intent):
+    return os.path.join(settings.RESUMABLE_UPLOAD_DIR, f'{intent.pk}.part')
+
+
+def _s3_params(intent):
+    storage = default_storage
+    key = posixpath.join(storage.location, intent.key) if storage.location else intent.key
+    return storage.connection.meta.client, {'Bucket': storage.bucket_name, 'Key': key}
+
+
+def _lock_key(intent):
+    return f'resumable-upload-lock:{intent.pk}'
+
+
+def _acquire_lock(lock_key):
+    """One request at a time may write to or finalize an upload"""
+    return cache.add(lock_key, 1, getattr(settings, 'RESUMABLE_UPLOAD_LOCK_SECONDS', 300))
+
+
+def create_resumable(user, purpose, filename, content_type, size):
+    """Declare a resumable upload. Raises ValueError/PermissionError like create_intent."""
+    intent = create_intent(user, purpose, filename, content_type, size)
+    intent.resumable = True
+    intent.length = int(size)
+    intent.expires_at = timezone.now() + timedelta(
+        seconds=getattr(settings, 'RESUMABLE_UPLOAD_EXPIRY_SECONDS', 24 * 3600)
+    )
+
+    if is_presigned_storage():
+        client, params = _s3_params(intent)
+        if default_storage.default_acl:
+            params['ACL'] = default_storage.default_acl
+        response = client.create_multipart_upload(ContentType=intent.content_type, **params)
+        intent.multipart_id = response['UploadId']
+    else:
+        os.makedirs(settings.RESUMABLE_UPLOAD_DIR, exist_ok=True)
+        open(_part_path(intent), 'wb').close()
+
+    intent.save(update_fields=['resumable', 'length', 'expires_at', 'multipart_id'])
+    return intent
+
+
+def current_offset(intent):
+    """Bytes received so far; on disk the part file is the source of truth"""
+    if not intent.multipart_id and intent.status == 'pending':
+        try:
+            return os.path.getsize(_part_path(intent))
+        except OSError:
+            return intent.offset
+    return intent.offset
+
+
+def write_chunk(intent, stream, offset, content_length):
+    """
+    Append one chunk read from `stream` at `offset`. Returns the new offset.
+    Raises UploadConflict (409) or ValueError (400).
+    """
+    max_chunk = getattr(settings, 'RESUMABLE_UPLOAD_MAX_CHUNK_BYTES', 16 * 1024 * 1024)
+    if intent.status != 'pending' or intent.expires_at < timezone.now():
+        raise ValueError('Upload is no longer accepting data')
+    if content_length <= 0 or content_length > max_chunk:
+        raise ValueError(f'Chunks must be between 1 byte and {max_chunk} bytes')
+
+    lock_key = _lock_key(intent)
+    if not _acquire_lock(lock_key):
+        raise UploadConflict('Another chunk is being written to this upload', current_offset(intent))
+    try:
+        intent.refresh_from_db()
+        server_offset = current_offset(intent)
+        if offset != server_offset:
+            raise UploadConflict('Upload-Offset does not match the server offset', server_offset)
+        if offset + content_length > intent.length:
+            raise ValueError('Chunk goes past the declared upload length')
+
+        if intent.multipart_id:
+            intent.offset = _write_s3_part(intent, stream, content_length)
+        else:
+            intent.offset = _append_to_part_file(intent, stream, content_length)
+        intent.save(update_fields=['offset', 'parts'])
+        return intent.offset
+    finally:
+        cache.delete(lock_key)
+
+
+def _append_to_part_file(intent, stream, content_length):
+    path = _part_path(intent)
+    remaining = content_length
+    try:
+        with open(path, 'ab') as part:
+            while remaining > 0:
+                data = stream.read(min(COPY_SIZE, remaining))
+                if not data:
+                    break
+                part.write(data)
+                remaining -= len(data)
+    except OSError:
+        # Client went away mid-chunk: keep what arrived, the client resumes from there
+        pass
+    return os.path.getsize(path)
+
+
+def _write_s3_part(intent, stream, content_length):
+    last = intent.offset + content_length == intent.length
+    if content_length < S3_MIN_PART_SIZE and not last:
+        raise ValueError('Chunks must be at least 5 MB, except the last one')
+    try:
+        data = stream.read(content_length)
+    except OSError:
+        data = b''
+    if len(data) != content_length:
+        # Incomplete part: S3 parts cannot be appended to, so nothing is kept
+        return intent.offset
+
+    client, params = _s3_params(intent)
+    part_number = len(intent.parts) + 1
+    response = client.upload_part(
+        UploadId=intent.multipart_id, PartNumber=part_number, Body=data, **params
+    )
+    intent.parts = intent.parts + [{'PartNumber': part_number, 'ETag': response['ETag'], 'Size': content_length}]
+    return intent.offset + content_length
+
+
+def finalize_resumable(intent):
+    """
+    Assemble a fully received upload into storage and mark it uploaded.
+    Raises UploadConflict while a chunk or another finalize is in flight, or ValueError.
+    """
+    lock_key = _lock_key(intent)
+    if not _acquire_lock(lock_key):
+        raise UploadConflict('This upload is being written or finalized', current_offset(intent))
+    try:
+        # A retry arriving after the first finalize finished gets the finished upload
+        intent.refresh_from_db()
+        if intent.status != 'pending':
+            return intent
+        offset = current_offset(intent)
+        if offset != intent.length:
+            raise ValueError(f'Upload is incomplete: {offset} of {intent.length} bytes received')
+        _assemble(intent)
+        return complete_intent(intent)
+    finally:
+        cache.delete(lock_key)
+
+
+def _assemble(intent):
+    """Turn the received chunks into the object at intent.key"""
+    if intent.multipart_id:
+        client, params = _s3_params(intent)
+        client.complete_multipart_upload(
+            UploadId=intent.multipart_id,
+            MultipartUpload={'Parts': [{'PartNumber': p['PartNumber'], 'ETag': p['ETag']} for p in intent.parts]},
+            **params,
+        )
+    else:
+        path = _part_path(intent)
+        with open(path, 'rb') as part:
+            saved = default_storage.save(intent.key, File(part, name=intent.key))
+        os.remove(path)
+        if saved != intent.key:
+            intent.key = saved
+            intent.save(update_fields=['key'])
+
+
+def discard_resumable(intent):
+    """Drop the partial data of an abandoned resumable upload"""
+    if intent.multipart_id and intent.status == 'pending':
+        client, params = _s3_params(intent)
+        client.abort_multipart_upload(UploadId=intent.multipart_id, **params)
+    elif not intent.multipart_id:
+        try:
+            os.remove(_part_path(intent))
+        except FileNotFoundError:
+            pass
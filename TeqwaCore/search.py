@@ -0,0 +1,243 @@
+"""
+Site-wide search.
+
+Every public content object has one SearchDocument row (type, object id,
+title, secondary keywords, body text, published flag, date), written by
+post_save/post_delete receivers from the SEARCH_SOURCES registry. The
+/api/v1/search/ endpoint queries that single table instead of running an
+icontains scan per app.
+
+On PostgreSQL each row carries a weighted search_vector (title A, keywords
+B, content C) behind a GIN index and results are ranked with ts_rank. Other
+databases (SQLite in local development) fall back to icontains over the same
+columns, ordered by date.
+"""
+from datetime import datetime, time
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_save, post_delete
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .models import SearchDocument
+
+SUMMARY_LENGTH = 300
+
+
+def _name(user):
+    return user.get_full_name() if user else ''
+
+
+def _join(*parts):
+    return ' '.join(str(part) for part in parts if part)
+
+
+def _as_datetime(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    return timezone.make_aware(datetime.combine(value, time.min))
+
+
+def _event(event):
+    return {
+        'title': event.title, 'keywords': event.location, 'content': event.description,
+        'published': event.status != 'cancelled', 'date': event.date,
+    }
+
+
+def _announcement(announcement):
+    return {
+        'title': announcement.title, 'keywords': '', 'content': announcement.content,
+        'published': announcement.published, 'date': announcement.created_at,
+    }
+
+
+def _lecture(lecture):
+    return {
+        'title': lecture.title,
+        'keywords': _join(lecture.get_subject_display(), _name(lecture.instructor)),
+        'content': lecture.description, 'published': True, 'date': _as_datetime(lecture.date_recorded),
+    }
+
+
+def _course(course):
+    return {
+        'title': course.title,
+        'keywords': _join(course.service.title, course.get_level_display(), _name(course.instructor)),
+        'content': course.description, 'published': course.status in ('active', 'full'),
+        'date': course.start_date,
+    }
+
+
+def _service(service):
+    return {
+        'title': service.title,
+        'keywords': _join(service.get_service_type_display(), service.get_level_display(), _name(service.instructor)),
+        'content': service.description, 'published': service.status in ('active', 'full'),
+        'date': service.start_date,
+    }
+
+
+def _donation_cause(cause):
+    return {
+        'title': cause.title, 'keywords': '', 'content': cause.description,
+        'published': cause.status != 'paused', 'date': cause.created_at,
+    }
+
+
+def _itikaf_program(program):
+    return {
+        'title': program.title, 'keywords': _join(program.short_description, program.location),
+        'content': _join(program.description, program.requirements),
+        'published': program.status != 'cancelled', 'date': program.start_date,
+    }
+
+
+# doc_type -> model, document builder, related fields to load, detail URL name,
+# and the user foreign keys whose name is part of the document
+SEARCH_SOURCES = {
+    'event': {'model': 'events.Event', 'document': _event, 'url': 'event_detail'},
+    'announcement': {'model': 'announcements.Announcement', 'document': _announcement, 'url': 'announcement_detail'},
+    'lecture': {
+        'model': 'education.Lecture', 'document': _lecture, 'related': ['instructor'],
+        'users': ['instructor'], 'url': 'lecture_detail',
+    },
+    'course': {
+        'model': 'education.Course', 'document': _course, 'related': ['service', 'instructor'],
+        'users': ['instructor'], 'url': 'course_detail',
+    },
+    'service': {
+        'model': 'education.EducationalService', 'document': _service, 'related': ['instructor'],
+        'users': ['instructor'], 'url': 'service_detail',
+    },
+    'donation_cause': {'model': 'donations.DonationCause', 'document': _donation_cause, 'url': 'cause_detail'},
+    'itikaf_program': {'model': 'itikaf.ItikafProgram', 'document': _itikaf_program, 'url': 'itikaf_program_detail'},
+}
+
+
+def is_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def _vector():
+    return (
+        SearchVector('title', weight='A')
+        + SearchVector('keywords', weight='B')
+        + SearchVector('content', weight='C')
+    )
+
+
+def build_document(doc_type, instance):
+    fields = SEARCH_SOURCES[doc_type]['document'](instance)
+    fields['content'] = strip_tags(fields['content'] or '')
+    fields['summary'] = fields['content'][:SUMMARY_LENGTH]
+    fields['title'] = (fields['title'] or '')[:255]
+    return fields
+
+
+def index_object(doc_type, instance):
+    """Create or refresh the search document of one object"""
+    document, _ = SearchDocument.objects.update_or_create(
+        doc_type=doc_type, object_id=instance.pk, defaults=build_document(doc_type, instance),
+    )
+    if is_postgres():
+        SearchDocument.objects.filter(pk=document.pk).update(search_vector=_vector())
+    return document
+
+
+def rebuild_index(doc_types=None, batch_size=500):
+    """Re-index every object of the given types and drop orphaned documents. Returns {doc_type: count}."""
+    counts = {}
+    for doc_type in doc_types or SEARCH_SOURCES:
+        source = SEARCH_SOURCES[doc_type]
+        queryset = apps.get_model(source['model']).objects.select_related(*source.get('related', []))
+        started = timezone.now()
+        indexed = 0
+        batch = []
+        for instance in queryset.order_by('pk').iterator(chunk_size=batch_size):
+            batch.append(SearchDocument(doc_type=doc_type, object_id=instance.pk, **build_document(doc_type, instance)))
+            indexed += 1
+            if len(batch) >= batch_size:
+                _upsert(batch)
+                batch = []
+        _upsert(batch)
+        # Every current object was just rewritten, so older rows belong to deleted objects
+        SearchDocument.objects.filter(doc_type=doc_type, updated_at__lt=started).delete()
+        if is_postgres():
+            SearchDocument.objects.filter(doc_type=doc_type).update(search_vector=_vector())
+        counts[doc_type] = indexed
+    return counts
+
+
+def _upsert(documents):
+    if documents:
+        SearchDocument.objects.bulk_create(
+            documents, update_conflicts=True, unique_fields=['doc_type', 'object_id'],
+            update_fields=['title', 'keywords', 'content', 'summary', 'published', 'date', 'updated_at'],
+        )
+
+
+def search(query, doc_types=None):
+    """
+    (results, facets) for a query: a ranked queryset of published documents,
+    optionally restricted to doc_types, and {doc_type: count} over all types.
+    """
+    documents = SearchDocument.objects.filter(published=True)
+    if is_postgres():
+        search_query = SearchQuery(query, search_type='websearch')
+        matches = documents.filter(search_vector=search_query)
+        ranked = matches.annotate(rank=SearchRank(F('search_vector'), search_query)).order_by('-rank', '-date', '-id')
+    else:
+        matches = documents.filter(
+            Q(title__icontains=query) | Q(keywords__icontains=query) | Q(content__icontains=query)
+        )
+        ranked = matches.order_by('-date', '-id')
+
+    facets = dict(matches.order_by().values_list('doc_type').annotate(total=Count('id')))
+    if doc_types:
+        ranked = ranked.filter(doc_type__in=doc_types)
+    return ranked, facets
+
+
+def document_url(document, request=None):
+    url_name = SEARCH_SOURCES.get(document.doc_type, {}).get('url')
+    if not url_name:
+        return None
+    url = reverse(url_name, args=[document.object_id])
+    return request.build_absolute_uri(url) if request else url
+
+
+def _make_receivers(doc_type):
+    def on_save(sender, instance, raw=False, **kwargs):
+        if not raw:
+            index_object(doc_type, instance)
+
+    def on_delete(sender, instance, **kwargs):
+        SearchDocument.objects.filter(doc_type=doc_type, object_id=instance.pk).delete()
+
+    return on_save, on_delete
+
+
+def reindex_user_content(sender, instance, raw=False, update_fields=None, **kwargs):
+    """post_save receiver for users: instructor names are indexed on lectures, courses and services"""
+    if raw or (update_fields is not None and not {'first_name', 'last_name'} & set(update_fields)):
+        return
+    for doc_type, source in SEARCH_SOURCES.items():
+        for field in source.get('users', []):
+            model = apps.get_model(source['model'])
+            for obj in model.objects.filter(**{field: instance}).select_related(*source.get('related', [])):
+                index_object(doc_type, obj)
+
+
+def connect_search_index():
+    for doc_type, source in SEARCH_SOURCES.items():
+        model = apps.get_model(source['model'])
+        on_save, on_delete = _make_receivers(doc_type)
+        post_save.connect(on_save, sender=model, weak=False, dispatch_uid=f'search-index-{doc_type}-save')
+        post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=f'search-index-{doc_type}-delete')
+    post_save.connect(reindex_user_content, sender=get_user_model(), dispatch_uid='search-index-users')
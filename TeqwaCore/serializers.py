@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+from .models import SearchDocument
+from .search import document_url
+
+
+class SearchDocumentSerializer(serializers.ModelSerializer):
+    type = serializers.CharField(source='doc_type')
+    id = serializers.IntegerField(source='object_id')
+    url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SearchDocument
+        fields = ['type', 'id', 'title', 'summary', 'date', 'url']
+
+    def get_url(self, obj):
+        return document_url(obj, self.context.get('request'))
@@ -0,0 +1,47 @@
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+
+from .cache import invalidate_namespace
+
+# Models whose changes affect each cached namespace. Related models are
+# included when the list serializers expose their data (names, counts, nested
+# schedules), otherwise the cached payload would go stale.
+CACHE_NAMESPACE_MODELS = {
+    'events': ['events.Event', 'events.EventRegistration'],
+    'announcements': ['announcements.Announcement', 'donations.DonationCause'],
+    'announcement_tags': ['announcements.Announcement'],
+    'donation_causes': ['donations.DonationCause'],
+    'education': [
+        'education.EducationalService', 'education.Course', 'education.ServiceEnrollment',
+        'education.Lecture', 'education.TimetableEntry',
+    ],
+    'staff': ['staff.StaffMember'],
+    'itikaf': ['itikaf.ItikafProgram', 'itikaf.ItikafSchedule', 'itikaf.ItikafRegistration'],
+}
+
+# Names and avatars shown on staff, announcements, lectures, courses and programs come from the user
+USER_DEPENDENT_NAMESPACES = ['staff', 'announcements', 'education', 'events', 'itikaf']
+
+
+def _make_receiver(namespaces):
+    def receiver(sender, **kwargs):
+        invalidate_namespace(*namespaces)
+    return receiver
+
+
+def connect_cache_invalidation():
+    """Connect post_save/post_delete receivers for every cached namespace"""
+    namespaces_by_model = {}
+    for namespace, model_labels in CACHE_NAMESPACE_MODELS.items():
+        for label in model_labels:
+            namespaces_by_model.setdefault(apps.get_model(label), []).append(namespace)
+
+    user_model = get_user_model()
+    namespaces_by_model.setdefault(user_model, []).extend(USER_DEPENDENT_NAMESPACES)
+
+    for model, namespaces in namespaces_by_model.items():
+        receiver = _make_receiver(tuple(namespaces))
+        uid = f'public-cache-{model._meta.label_lower}'
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=f'{uid}-save')
+        post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=f'{uid}-delete')
@@ -0,0 +1,261 @@
+"""
+Direct-to-storage uploads.
+
+Instead of posting multipart bodies through gunicorn, clients:
+
+1. POST /api/v1/uploads/ with purpose, filename, content_type and size, and
+   get back an UploadIntent with a PUT URL. On S3 this is a presigned URL,
+   so the bytes go straight to the bucket. With filesystem storage the URL
+   points at upload_content, a signed stand-in endpoint for development.
+2. PUT the file to that URL.
+3. Send the intent id wherever a file is expected (e.g. `proof_upload` on
+   the donation, booking, registration and enrollment endpoints), or
+   complete it explicitly via POST /api/v1/uploads/<id>/complete/.
+
+An intent is attached to at most one row: it is claimed with a conditional
+UPDATE in the transaction that saves that row, so a failed save leaves it
+unattached (and purgeable) and a reused id is rejected.
+
+App servers only ever see small JSON requests.
+"""
+import os
+import posixpath
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework import serializers
+
+from .media import sign_media_token
+from .models import UploadIntent
+
+MB = 1024 * 1024
+
+# purpose -> where uploads land, what they may be and who may upload them
+PURPOSES = {
+    'proof_image': {
+        'prefix': 'uploads/proofs/',
+        'content_types': ('image/jpeg', 'image/png', 'image/webp', 'image/gif'),
+        'max_size_setting': ('UPLOAD_MAX_PROOF_IMAGE_BYTES', 10 * MB),
+        'image': True,
+    },
+    'lecture_video': {
+        'prefix': 'lectures/videos/',
+        'content_types': ('video/mp4', 'video/webm', 'video/quicktime', 'video/x-matroska'),
+        'max_size_setting': ('UPLOAD_MAX_LECTURE_MEDIA_BYTES', 2048 * MB),
+        'roles': ('admin', 'staff'),
+        'lecture_field': 'video_file',
+    },
+    'lecture_audio': {
+        'prefix': 'lectures/audio/',
+        'content_types': ('audio/mpeg', 'audio/mp4', 'audio/aac', 'audio/ogg', 'audio/wav', 'audio/webm'),
+        'max_size_setting': ('UPLOAD_MAX_LECTURE_MEDIA_BYTES', 2048 * MB),
+        'roles': ('admin', 'staff'),
+        'lecture_field': 'audio_file',
+    },
+    'lecture_thumbnail': {
+        'prefix': 'lectures/thumbnails/',
+        'content_types': ('image/jpeg', 'image/png', 'image/webp'),
+        'max_size_setting': ('UPLOAD_MAX_PROOF_IMAGE_BYTES', 10 * MB),
+        'roles': ('admin', 'staff'),
+        'lecture_field': 'thumbnail',
+        'image': True,
+    },
+}
+
+
+def max_size_for(purpose):
+    setting, default = PURPOSES[purpose]['max_size_setting']
+    return getattr(settings, setting, default)
+
+
+def is_presigned_storage(storage=None):
+    """True for S3-compatible storages that can issue presigned PUT URLs"""
+    storage = storage or default_storage
+    return hasattr(storage, 'bucket_name') and hasattr(storage, 'connection')
+
+
+def create_intent(user, purpose, filename, content_type, size):
+    """Validate an upload request and record its intent. Raises ValueError."""
+    config = PURPOSES.get(purpose)
+    if not config:
+        raise ValueError(f"Unknown upload purpose. Use one of: {', '.join(PURPOSES)}")
+    roles = config.get('roles')
+    if roles and getattr(user, 'role', None) not in roles:
+        raise PermissionError('Permission denied')
+    if content_type not in config['content_types']:
+        raise ValueError(f"Unsupported content type for {purpose}: {content_type}")
+    max_size = max_size_for(purpose)
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise ValueError('size must be the file size in bytes')
+    if size <= 0 or size > max_size:
+        raise ValueError(f'File must be between 1 byte and {max_size // MB} MB')
+
+    extension = os.path.splitext(filename or '')[1].lower()[:10]
+    expires = getattr(settings, 'UPLOAD_INTENT_EXPIRY_SECONDS', 3600)
+    return UploadIntent.objects.create(
+        user=user if user and user.is_authenticated else None,
+        purpose=purpose,
+        key=f"{config['prefix']}{uuid.uuid4().hex}{extension}",
+        filename=(filename or '')[:255],
+        content_type=content_type,
+        max_size=max_size,
+        expires_at=timezone.now() + timedelta(seconds=expires),
+    )
+
+
+def upload_instructions(intent, request=None):
+    """How the client should send the bytes of an intent"""
+    headers = {'Content-Type': intent.content_type}
+    expires_in = max(int((intent.expires_at - timezone.now()).total_seconds()), 1)
+
+    if is_presigned_storage():
+        storage = default_storage
+        params = {
+            'Bucket': storage.bucket_name,
+            'Key': posixpath.join(storage.location, intent.key) if storage.location else intent.key,
+            'ContentType': intent.content_type,
+        }
+        if storage.default_acl:
+            params['ACL'] = storage.default_acl
+            headers['x-amz-acl'] = storage.default_acl
+        url = storage.connection.meta.client.generate_presigned_url(
+            'put_object', Params=params, ExpiresIn=expires_in, HttpMethod='PUT'
+        )
+    else:
+        url = f"{reverse('upload_content', args=[intent.pk])}?token={sign_media_token(f'upload:{intent.pk}')}"
+        if request:
+            url = request.build_absolute_uri(url)
+
+    return {
+        'id': str(intent.pk),
+        'method': 'PUT',
+        'upload_url': url,
+        'headers': headers,
+        'key': intent.key,
+        'max_size': intent.max_size,
+        'expires_at': intent.expires_at,
+    }
+
+
+def complete_intent(intent):
+    """
+    Check that the client's upload reached storage and is acceptable, and
+    mark the intent uploaded. Raises ValueError; rejected objects are removed.
+    """
+    if intent.status != 'pending':
+        return intent
+    storage = default_storage
+    if not storage.exists(intent.key):
+        if intent.expires_at < timezone.now():
+            raise ValueError('Upload link has expired')
+        raise ValueError('File has not been uploaded yet')
+
+    size = storage.size(intent.key)
+    if size > intent.max_size:
+        storage.delete(intent.key)
+        raise ValueError('Uploaded file is too large')
+
+    if PURPOSES.get(intent.purpose, {}).get('image'):
+        try:
+            with storage.open(intent.key, 'rb') as f, Image.open(f) as image:
+                image.verify()
+        except Exception:
+            storage.delete(intent.key)
+            raise ValueError('Uploaded file is not a readable image')
+
+    intent.size = size
+    intent.status = 'uploaded'
+    intent.completed_at = timezone.now()
+    intent.save(update_fields=['size', 'status', 'completed_at'])
+    return intent
+
+
+def get_user_intent(upload_id, user, purpose=None):
+    """The intent with this id that `user` may use, or None"""
+    try:
+        upload_id = uuid.UUID(str(upload_id))
+    except ValueError:
+        return None
+    intent = UploadIntent.objects.filter(pk=upload_id).first()
+    if intent is None or (purpose and intent.purpose != purpose):
+        return None
+    if intent.user_id and (not user or not user.is_authenticated or user.pk != intent.user_id):
+        return None
+    return intent
+
+
+ATTACHABLE_STATUSES = ('pending', 'uploaded')
+
+
+def mark_attached(intent):
+    """Claim an intent for the row being saved. Returns False if it was already attached."""
+    return UploadIntent.objects.filter(pk=intent.pk, status__in=ATTACHABLE_STATUSES).update(
+        status='attached', attached_at=timezone.now()
+    ) == 1
+
+
+class UploadIntentField(serializers.Field):
+    """
+    Write-only field taking an UploadIntent id and yielding its storage key,
+    for use with source=<file field>: the model field then points at the
+    object the client uploaded directly to storage. The serializer must
+    attach the intent when it saves (AttachUploadsMixin or attach_uploads).
+    """
+    default_error_messages = {
+        'invalid': 'Upload not found.',
+        'used': 'Upload has already been used.',
+        'incomplete': '{reason}',
+    }
+
+    def __init__(self, purpose, **kwargs):
+        self.purpose = purpose
+        self.intent = None
+        kwargs.setdefault('write_only', True)
+        kwargs.setdefault('required', False)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        request = self.context.get('request')
+        intent = get_user_intent(data, getattr(request, 'user', None), self.purpose)
+        if intent is None:
+            self.fail('invalid')
+        if intent.status not in ATTACHABLE_STATUSES:
+            self.fail('used')
+        try:
+            complete_intent(intent)
+        except ValueError as e:
+            self.fail('incomplete', reason=str(e))
+        self.intent = intent
+        return intent.key
+
+    def to_representation(self, value):
+        return None
+
+
+def attach_uploads(serializer):
+    """
+    Mark the intents given to the serializer's UploadIntentFields attached.
+    Call it in the transaction that saves the row; raises ValidationError
+    if another row claimed an intent first.
+    """
+    for name, field in serializer.fields.items():
+        if isinstance(field, UploadIntentField) and field.intent is not None:
+            if not mark_attached(field.intent):
+                raise serializers.ValidationError({name: [field.error_messages['used']]})
+
+
+class AttachUploadsMixin:
+    """Serializer mixin that saves the row and attaches its uploads in one transaction"""
+
+    def save(self, **kwargs):
+        with transaction.atomic():
+            attach_uploads(self)
+            return super().save(**kwargs)
@@ -4,4 +4,12 @@ from . import views
 urlpatterns = [
     path('', views.api_root, name='api_root'),
     path('health/', views.health_check, name='health_check'),
+    path('search/', views.site_search, name='site_search'),
+    path('uploads/', views.create_upload, name='create_upload'),
+    path('uploads/<uuid:upload_id>/content/', views.upload_content, name='upload_content'),
+    path('uploads/<uuid:upload_id>/complete/', views.complete_upload, name='complete_upload'),
+    path('uploads/resumable/', views.create_resumable_upload, name='create_resumable_upload'),
+    path('uploads/<uuid:upload_id>/resumable/', views.resumable_upload, name='resumable_upload'),
+    path('uploads/<uuid:upload_id>/resumable/finalize/', views.finalize_resumable_upload,
+         name='finalize_resumable_upload'),
 ]
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""
+Responsive image variants.
+
+Saving a model with a new image in one of VARIANT_FIELDS queues an
+ImageVariantJob; the process_image_variants worker then writes resized WebP
+and JPEG copies (TeqwaCore.images.generate_variants) and records them in the
+model's <field>_variants JSON column. Nothing is resized in the request
+thread. Serializers expose the variants with ImageVariantsField.
+"""
+import logging
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import pre_save, post_save
+from django.utils import timezone
+from rest_framework import serializers
+
+from .cache import invalidate_namespace
+from .images import generate_variants
+from .models import ImageVariantJob
+from .signals import CACHE_NAMESPACE_MODELS
+
+logger = logging.getLogger(__name__)
+
+# Image fields that get resized variants; each has a <field>_variants JSONField
+VARIANT_FIELDS = {
+    'events.Event': ['image'],
+    'itikaf.ItikafProgram': ['image'],
+    'itikaf.ItikafRegistration': ['proof_image'],
+    'education.Lecture': ['thumbnail'],
+    'education.ServiceEnrollment': ['proof_image'],
+    'donations.Donation': ['proof_image'],
+    'futsal_booking.FutsalBooking': ['proof_image'],
+    'memberships.UserMembership': ['proof_image'],
+}
+
+
+def variants_column(field_name):
+    return f'{field_name}_variants'
+
+
+def keep_stored_variants(sender, instance, raw=False, **kwargs):
+    """
+    pre_save receiver: an instance loaded before the worker finished would
+    save its stale (empty) variants column over the worker's result, so pick
+    up the stored value first when it belongs to the current image.
+    """
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    for field_name in VARIANT_FIELDS.get(sender._meta.label, []):
+        column = variants_column(field_name)
+        if column not in instance.__dict__ or field_name not in instance.__dict__:
+            continue
+        name = getattr(instance, field_name).name or ''
+        if not name or (getattr(instance, column) or {}).get('source') == name:
+            continue
+        stored = sender.objects.filter(pk=instance.pk).values_list(column, flat=True).first()
+        if stored and stored.get('source') == name:
+            setattr(instance, column, stored)
+
+
+def enqueue_variants(sender, instance, raw=False, update_fields=None, **kwargs):
+    """post_save receiver: queue a job for every image that has no current variants"""
+    if raw:
+        return
+    label = sender._meta.label
+    for field_name in VARIANT_FIELDS.get(label, []):
+        if update_fields is not None and field_name not in update_fields:
+            continue
+        name = getattr(instance, field_name).name or ''
+        variants = getattr(instance, variants_column(field_name)) or {}
+        if name and variants.get('source') == name:
+            continue
+
+        if not name:
+            if variants:
+                sender.objects.filter(pk=instance.pk).update(**{variants_column(field_name): {}})
+                setattr(instance, variants_column(field_name), {})
+            ImageVariantJob.objects.filter(model_label=label, object_id=instance.pk, field_name=field_name).delete()
+            continue
+
+        queued = ImageVariantJob.objects.filter(
+            model_label=label, object_id=instance.pk, field_name=field_name,
+            source_name=name, status__in=['pending', 'processing'],
+        )
+        if queued.exists():
+            continue
+        ImageVariantJob.objects.update_or_create(
+            model_label=label, object_id=instance.pk, field_name=field_name,
+            defaults={
+                'source_name': name, 'status': 'pending', 'attempts': 0, 'last_error': '',
+                'next_attempt_at': timezone.now(), 'locked_at': None, 'processed_at': None,
+            },
+        )
+
+
+def connect_image_variants():
+    for label in VARIANT_FIELDS:
+        model = apps.get_model(label)
+        uid = f'image-variants-{label.lower()}'
+        pre_save.connect(keep_stored_variants, sender=model, dispatch_uid=f'{uid}-pre-save')
+        post_save.connect(enqueue_variants, sender=model, dispatch_uid=f'{uid}-save')
+
+
+def _retry_delay(attempts):
+    base = getattr(settings, 'IMAGE_VARIANT_RETRY_BASE_SECONDS', 60)
+    cap = getattr(settings, 'IMAGE_VARIANT_RETRY_MAX_SECONDS', 3600)
+    return timedelta(seconds=min(base * 2 ** max(attempts - 1, 0), cap))
+
+
+def claim_jobs(batch_size):
+    """Lock a batch of due variant jobs (SELECT ... FOR UPDATE SKIP LOCKED)"""
+    now = timezone.now()
+    stale = now - timedelta(seconds=getattr(settings, 'IMAGE_VARIANT_LOCK_SECONDS', 600))
+    with transaction.atomic():
+        ids = list(
+            ImageVariantJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status='pending', next_attempt_at__lte=now) |
+                Q(status='processing', locked_at__lt=stale)
+            )
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if ids:
+            ImageVariantJob.objects.filter(id__in=ids).update(status='processing', locked_at=now)
+    return list(ImageVariantJob.objects.filter(id__in=ids).order_by('id'))
+
+
+def _delete_files(storage, variants, keep=()):
+    for image_format in ('webp', 'jpeg'):
+        for path in (variants.get(image_format) or {}).values():
+            if path in keep:
+                continue
+            try:
+                storage.delete(path)
+            except Exception as e:
+                logger.warning("Could not delete old image variant %s: %s", path, e)
+
+
+def _finish(job, **changes):
+    """Update a job unless it was re-queued for a newer upload meanwhile"""
+    ImageVariantJob.objects.filter(pk=job.pk, source_name=job.source_name, status='processing').update(
+        locked_at=None, **changes
+    )
+
+
+def process_job(job):
+    """Generate the variants of one job's image and store them on the model"""
+    model = apps.get_model(job.model_label)
+    instance = model.objects.filter(pk=job.object_id).first()
+    field_file = getattr(instance, job.field_name, None) if instance else None
+    if not field_file or field_file.name != job.source_name:
+        # Object deleted or image replaced; a newer job covers the new image
+        return False
+
+    column = variants_column(job.field_name)
+    old_variants = getattr(instance, column) or {}
+    variants = generate_variants(
+        field_file,
+        widths=getattr(settings, 'IMAGE_VARIANT_WIDTHS', (320, 640, 1280)),
+        formats=getattr(settings, 'IMAGE_VARIANT_FORMATS', ('webp', 'jpeg')),
+        quality=getattr(settings, 'IMAGE_VARIANT_QUALITY', 80),
+    )
+    stored = model.objects.filter(pk=job.object_id, **{job.field_name: job.source_name}).update(**{column: variants})
+    if not stored:
+        _delete_files(field_file.storage, variants)
+        return False
+
+    new_paths = {path for image_format in ('webp', 'jpeg') for path in (variants.get(image_format) or {}).values()}
+    _delete_files(field_file.storage, old_variants, keep=new_paths)
+    namespaces = [ns for ns, labels in CACHE_NAMESPACE_MODELS.items() if job.model_label in labels]
+    if namespaces:
+        invalidate_namespace(*namespaces)
+    return True
+
+
+def process_variant_jobs(batch_size=None):
+    """Process one batch of due variant jobs. Returns (done, failed)."""
+    batch_size = batch_size or getattr(settings, 'IMAGE_VARIANT_BATCH_SIZE', 10)
+    max_attempts = getattr(settings, 'IMAGE_VARIANT_MAX_ATTEMPTS', 5)
+    done = failed = 0
+    for job in claim_jobs(batch_size):
+        attempts = job.attempts + 1
+        try:
+            process_job(job)
+        except Exception as e:
+            failed += 1
+            if attempts >= max_attempts:
+                logger.error("Giving up on image variants for %s after %s attempts: %s", job, attempts, e)
+                _finish(job, status='failed', attempts=attempts, last_error=str(e)[:2000])
+            else:
+                logger.warning("Image variants for %s failed (attempt %s): %s", job, attempts, e)
+                _finish(job, status='pending', attempts=attempts, last_error=str(e)[:2000],
+                        next_attempt_at=timezone.now() + _retry_delay(attempts))
+            continue
+        done += 1
+        _finish(job, status='done', attempts=attempts, last_error='', processed_at=timezone.now())
+    return done, failed
+
+
+def variant_urls(instance, field_name, request=None):
+    """
+    {'webp': {'320w': url, ...}, 'jpeg': {...}} for an image whose variants
+    are up to date, otherwise None (clients fall back to the original).
+    """
+    field_file = getattr(instance, field_name)
+    variants = getattr(instance, variants_column(field_name)) or {}
+    if not field_file or variants.get('source') != field_file.name:
+        return None
+
+    storage = field_file.storage
+    urls = {}
+    for image_format in ('webp', 'jpeg'):
+        paths = variants.get(image_format)
+        if not paths:
+            continue
+        urls[image_format] = {}
+        for width, path in sorted(paths.items(), key=lambda item: int(item[0])):
+            url = storage.url(path)
+            if request and not url.startswith(('http://', 'https://')):
+                url = request.build_absolute_uri(url)
+            urls[image_format][f'{width}w'] = url
+    return urls or None
+
+
+class ImageVariantsField(serializers.Field):
+    """Read-only srcset-style map of an image field's variants"""
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        kwargs.update(source='*', read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        return variant_urls(instance, self.image_field, self.context.get('request'))
@@ -1,7 +1,27 @@
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from .media import check_media_token
+from .models import UploadIntent
+from .pagination import _page_size
+from .resumable import (
+    UploadConflict, create_resumable, current_offset, discard_resumable, finalize_resumable, write_chunk,
+)
+from .search import SEARCH_SOURCES, search
+from .serializers import SearchDocumentSerializer
+from .uploads import (
+    PURPOSES, complete_intent, create_intent, get_user_intent, is_presigned_storage,
+    mark_attached, upload_instructions,
+)
+
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -29,10 +49,13 @@ def api_root(request):
                 'update_profile': '/api/v1/accounts/profile/update/',
                 'sessions': '/api/v1/accounts/sessions/',
                 'activities': '/api/v1/accounts/activities/',
+                'leaderboard': '/api/v1/accounts/leaderboard/',
                 'change_password': '/api/v1/accounts/change-password/'
             },
             'announcements': {
                 'list': '/api/v1/announcements/',
+                'by_tags': '/api/v1/announcements/?tags=eid,ramadan',
+                'tags': '/api/v1/announcements/tags/',
                 'create': '/api/v1/announcements/create/',
                 'detail': '/api/v1/announcements/{id}/'
             },
@@ -85,6 +108,17 @@ def api_root(request):
                 'monthly': '/api/v1/prayer-times/monthly/{year}/{month}/',
                 'qibla': '/api/v1/prayer-times/qibla/'
             },
+            'search': {
+                'search': '/api/v1/search/?q={query}',
+                'by_type': '/api/v1/search/?q={query}&type=lecture,event'
+            },
+            'uploads': {
+                'create': '/api/v1/uploads/',
+                'complete': '/api/v1/uploads/{id}/complete/',
+                'resumable_create': '/api/v1/uploads/resumable/',
+                'resumable': '/api/v1/uploads/{id}/resumable/',
+                'resumable_finalize': '/api/v1/uploads/{id}/resumable/finalize/'
+            },
             'itikaf': {
                 'list': '/api/v1/itikaf/',
                 'create': '/api/v1/itikaf/create/',
@@ -110,4 +144,241 @@ def health_check(request):
     return Response({
         'status': 'healthy',
         'message': 'Teqwa Project API is running'
-    })
\ No newline at end of file
+    })
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def site_search(request):
+    """Search events, announcements, lectures, courses, services, donation causes and Iʿtikāf programs at once"""
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    doc_types = [t for t in request.query_params.get('type', '').split(',') if t]
+    unknown = [t for t in doc_types if t not in SEARCH_SOURCES]
+    if unknown:
+        return Response({
+            'error': f"Unknown type: {', '.join(unknown)}. Use any of: {', '.join(SEARCH_SOURCES)}"
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        page = int(request.query_params.get('page', 1))
+    except ValueError:
+        page = 0
+    if page < 1:
+        return Response({'error': 'Invalid page'}, status=status.HTTP_404_NOT_FOUND)
+    page_size = _page_size(request)
+
+    results, facets = search(query, doc_types)
+    total = sum(count for doc_type, count in facets.items() if not doc_types or doc_type in doc_types)
+    offset = (page - 1) * page_size
+    serializer = SearchDocumentSerializer(results[offset:offset + page_size], many=True, context={'request': request})
+    return Response({
+        'message': 'Search results retrieved successfully',
+        'data': serializer.data,
+        'count': total,
+        'facets': {doc_type: facets.get(doc_type, 0) for doc_type in SEARCH_SOURCES},
+        'page': page,
+        'page_size': page_size,
+    })
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def create_upload(request):
+    """Start a direct-to-storage upload and return where to PUT the file"""
+    try:
+        intent = create_intent(
+            request.user,
+            request.data.get('purpose'),
+            request.data.get('filename', ''),
+            request.data.get('content_type', ''),
+            request.data.get('size'),
+        )
+    except PermissionError as e:
+        return Response({'error': str(e)}, status=status.HTTP_403_FORBIDDEN)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'message': 'Upload created successfully',
+        'data': upload_instructions(intent, request)
+    }, status=status.HTTP_201_CREATED)
+
+
+@api_view(['PUT'])
+@permission_classes([AllowAny])
+def upload_content(request, upload_id):
+    """
+    Local stand-in for a presigned S3 PUT, used when media is on the
+    filesystem (development). The signed token in the URL authorizes it.
+    """
+    if is_presigned_storage():
+        return Response({'error': 'Upload directly to storage'}, status=status.HTTP_404_NOT_FOUND)
+    if not check_media_token(f'upload:{upload_id}', request.GET.get('token', '')):
+        return Response({'error': 'Upload link is invalid or has expired'}, status=status.HTTP_403_FORBIDDEN)
+
+    intent = UploadIntent.objects.filter(
+        pk=upload_id, status='pending', resumable=False, expires_at__gt=timezone.now()
+    ).first()
+    if intent is None:
+        return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        length = 0
+    if length <= 0 or length > intent.max_size:
+        return Response({'error': 'File is empty or too large'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if default_storage.exists(intent.key):
+        default_storage.delete(intent.key)
+    # Stream the raw body to storage without reading it into memory
+    saved = default_storage.save(intent.key, File(request._request, name=intent.key))
+    if saved != intent.key:
+        intent.key = saved
+        intent.save(update_fields=['key'])
+    return Response(status=status.HTTP_200_OK)
+
+
+def _completed_upload_response(request, intent):
+    """Attach a completed lecture upload to `lecture` when given, and describe the upload"""
+    lecture_id = request.data.get('lecture')
+    lecture_field = PURPOSES[intent.purpose].get('lecture_field')
+    if lecture_id and lecture_field:
+        from education.models import Lecture
+        if getattr(request.user, 'role', None) not in PURPOSES[intent.purpose].get('roles', ()):
+            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+        lecture = Lecture.objects.filter(pk=lecture_id).first()
+        if lecture is None:
+            return Response({'error': 'Lecture not found'}, status=status.HTTP_404_NOT_FOUND)
+        with transaction.atomic():
+            if not mark_attached(intent):
+                return Response({'error': 'Upload has already been used'}, status=status.HTTP_400_BAD_REQUEST)
+            setattr(lecture, lecture_field, intent.key)
+            lecture.save()
+        intent.refresh_from_db()
+
+    return Response({
+        'message': 'Upload completed successfully',
+        'data': {
+            'id': str(intent.pk),
+            'key': intent.key,
+            'size': intent.size,
+            'status': intent.status,
+            'url': default_storage.url(intent.key),
+        }
+    })
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def complete_upload(request, upload_id):
+    """
+    Confirm an upload reached storage. Lecture uploads can be attached to a
+    lecture at the same time by passing its id as `lecture`.
+    """
+    intent = get_user_intent(upload_id, request.user)
+    if intent is None or intent.resumable:
+        return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        complete_intent(intent)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return _completed_upload_response(request, intent)
+
+
+def _offset_headers(response, intent, offset):
+    response['Upload-Offset'] = str(offset)
+    response['Upload-Length'] = str(intent.length)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_resumable_upload(request):
+    """Start a resumable chunked upload (lecture recordings)"""
+    try:
+        intent = create_resumable(
+            request.user,
+            request.data.get('purpose'),
+            request.data.get('filename', ''),
+            request.data.get('content_type', ''),
+            request.data.get('size'),
+        )
+    except PermissionError as e:
+        return Response({'error': str(e)}, status=status.HTTP_403_FORBIDDEN)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    url = request.build_absolute_uri(reverse('resumable_upload', args=[intent.pk]))
+    response = Response({
+        'message': 'Upload created successfully',
+        'data': {
+            'id': str(intent.pk),
+            'upload_url': url,
+            'offset': 0,
+            'length': intent.length,
+            'max_chunk_size': getattr(settings, 'RESUMABLE_UPLOAD_MAX_CHUNK_BYTES', 16 * 1024 * 1024),
+            'expires_at': intent.expires_at,
+        }
+    }, status=status.HTTP_201_CREATED)
+    response['Location'] = url
+    return _offset_headers(response, intent, 0)
+
+
+@api_view(['GET', 'HEAD', 'PATCH', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def resumable_upload(request, upload_id):
+    """
+    HEAD/GET: current offset. PATCH: append the chunk in the body at the
+    Upload-Offset header. DELETE: abandon the upload.
+    """
+    intent = get_user_intent(upload_id, request.user)
+    if intent is None or not intent.resumable:
+        return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    if request.method == 'DELETE':
+        discard_resumable(intent)
+        intent.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    if request.method in ('GET', 'HEAD'):
+        offset = current_offset(intent)
+        return _offset_headers(Response({
+            'message': 'Upload status retrieved successfully',
+            'data': {'id': str(intent.pk), 'offset': offset, 'length': intent.length, 'status': intent.status}
+        }), intent, offset)
+
+    try:
+        offset = int(request.headers.get('Upload-Offset', ''))
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return Response({'error': 'Upload-Offset and Content-Length headers are required'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    try:
+        # Read the raw body straight from the WSGI request, never through DRF parsers
+        new_offset = write_chunk(intent, request._request, offset, content_length)
+    except UploadConflict as e:
+        return _offset_headers(Response({'error': str(e), 'offset': e.offset}, status=status.HTTP_409_CONFLICT),
+                               intent, e.offset)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return _offset_headers(Response(status=status.HTTP_204_NO_CONTENT), intent, new_offset)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def finalize_resumable_upload(request, upload_id):
+    """Assemble a fully received resumable upload; pass `lecture` to attach it"""
+    intent = get_user_intent(upload_id, request.user)
+    if intent is None or not intent.resumable:
+        return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        finalize_resumable(intent)
+    except UploadConflict as e:
+        return _offset_headers(Response({'error': str(e), 'offset': e.offset}, status=status.HTTP_409_CONFLICT),
+                               intent, e.offset)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return _completed_upload_response(request, intent)
@@ -0,0 +1,85 @@
+"""
+Writing UserActivity rows.
+
+Activities about an object carry (source, source_id, event_key), which is
+unique: repeated saves of the same object log once, enforced by the database
+(INSERT ... ON CONFLICT DO NOTHING) instead of a lookup before every insert.
+
+With USER_ACTIVITY_BUFFERED on, ActivityBufferMiddleware collects the rows
+logged during a request and writes them with one bulk_create when the
+request ends. Outside a request (workers, shell) rows are written at once.
+"""
+import logging
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from .models import UserActivity
+
+logger = logging.getLogger(__name__)
+
+_buffer = ContextVar('user_activity_buffer', default=None)
+
+
+def get_client_ip(request):
+    """Get client IP address from request"""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        return x_forwarded_for.split(',')[0]
+    return request.META.get('REMOTE_ADDR')
+
+
+def _build(user, activity_type, description, request=None, source='', source_id=None, event_key='',
+           metadata=None):
+    return UserActivity(
+        user=user,
+        activity_type=activity_type,
+        description=description,
+        ip_address=get_client_ip(request) if request else None,
+        user_agent=request.META.get('HTTP_USER_AGENT', '') if request else '',
+        metadata=metadata or {},
+        source=source,
+        source_id=source_id,
+        event_key=event_key,
+    )
+
+
+def log_activity(user, activity_type, description, **kwargs):
+    """
+    Log an activity, buffered until the end of the request when enabled.
+    kwargs: request, source, source_id, event_key, metadata.
+    """
+    activity = _build(user, activity_type, description, **kwargs)
+    buffer = _buffer.get()
+    if buffer is not None:
+        buffer.append(activity)
+    else:
+        UserActivity.objects.bulk_create([activity], ignore_conflicts=True)
+
+
+def flush_activities(activities):
+    if not activities:
+        return
+    try:
+        UserActivity.objects.bulk_create(activities, ignore_conflicts=True)
+    except Exception as e:
+        # Activity logging must never turn a finished request into an error
+        logger.error("Failed to write %s buffered user activities: %s", len(activities), e)
+
+
+class ActivityBufferMiddleware:
+    """Collect activities logged during a request and insert them in one query at the end"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'USER_ACTIVITY_BUFFERED', True):
+            return self.get_response(request)
+        activities = []
+        token = _buffer.set(activities)
+        try:
+            return self.get_response(request)
+        finally:
+            _buffer.reset(token)
+            flush_activities(activities)
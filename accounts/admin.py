@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import UserProfile, UserSession, UserActivity
+from .models import (
+    UserProfile, UserSession, UserActivity, ArchivedUserActivity, UserActivityMonthly, PointsLedger, LeaderboardEntry,
+)
 
 
 @admin.register(UserProfile)
@@ -20,7 +22,38 @@ class UserSessionAdmin(admin.ModelAdmin):
 
 @admin.register(UserActivity)
 class UserActivityAdmin(admin.ModelAdmin):
-    list_display = ['user', 'activity_type', 'ip_address', 'timestamp']
-    list_filter = ['activity_type', 'timestamp']
+    list_display = ['user', 'activity_type', 'source', 'source_id', 'ip_address', 'timestamp']
+    list_filter = ['activity_type', 'source', 'timestamp']
     search_fields = ['user__username', 'description']
-    readonly_fields = ['timestamp']
\ No newline at end of file
+    readonly_fields = ['timestamp']
+
+@admin.register(ArchivedUserActivity)
+class ArchivedUserActivityAdmin(admin.ModelAdmin):
+    list_display = ['user', 'activity_type', 'source', 'timestamp', 'archived_at']
+    list_filter = ['activity_type', 'source']
+    search_fields = ['user__username', 'description']
+    raw_id_fields = ['user']
+
+
+@admin.register(UserActivityMonthly)
+class UserActivityMonthlyAdmin(admin.ModelAdmin):
+    list_display = ['user', 'month', 'activity_type', 'count', 'last_at']
+    list_filter = ['activity_type', 'month']
+    search_fields = ['user__username']
+    raw_id_fields = ['user']
+
+
+@admin.register(PointsLedger)
+class PointsLedgerAdmin(admin.ModelAdmin):
+    list_display = ['user', 'points', 'reason', 'idempotency_key', 'created_at']
+    list_filter = ['reason', 'created_at']
+    search_fields = ['user__username', 'idempotency_key']
+    raw_id_fields = ['user']
+    readonly_fields = ['created_at']
+
+
+@admin.register(LeaderboardEntry)
+class LeaderboardEntryAdmin(admin.ModelAdmin):
+    list_display = ['rank', 'user', 'points', 'refreshed_at']
+    search_fields = ['user__username']
+    raw_id_fields = ['user']
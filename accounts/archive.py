@@ -0,0 +1,92 @@
+"""
+UserActivity archival.
+
+Rows older than the retention window are moved, one batch per transaction,
+into ArchivedUserActivity (a cold table nothing reads on the request path)
+and counted into UserActivityMonthly, then deleted from the hot table. The
+hot table keeps only recent rows, which is all user_activities and the
+dashboard read.
+
+Rows about an object (source_id set) stay hot: their unique (source,
+source_id, event_key) key is what stops a later save of an old task,
+attendance or booking from logging the same activity again. There is one
+such row per object and event, so they grow with the objects themselves.
+Points stay awarded once regardless, because PointsLedger holds their key.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest, Least
+from django.utils import timezone
+
+from .models import ArchivedUserActivity, UserActivity, UserActivityMonthly
+
+ARCHIVED_FIELDS = [
+    'id', 'user_id', 'activity_type', 'description', 'ip_address', 'user_agent', 'metadata',
+    'source', 'source_id', 'event_key', 'timestamp',
+]
+
+
+def retention_cutoff(days=None):
+    days = days if days is not None else getattr(settings, 'USER_ACTIVITY_RETENTION_DAYS', 180)
+    return timezone.now() - timedelta(days=days)
+
+
+def archivable(cutoff):
+    return UserActivity.objects.filter(timestamp__lt=cutoff, source_id__isnull=True)
+
+
+def _month(timestamp):
+    return timezone.localtime(timestamp).date().replace(day=1)
+
+
+def _add_to_summaries(rows):
+    """Fold rows (ordered by timestamp) into the monthly counts"""
+    summaries = {}
+    for row in rows:
+        key = (row['user_id'], _month(row['timestamp']), row['activity_type'])
+        summary = summaries.setdefault(key, {'count': 0, 'first_at': row['timestamp']})
+        summary['count'] += 1
+        summary['last_at'] = row['timestamp']
+
+    for (user_id, month, activity_type), summary in summaries.items():
+        updated = UserActivityMonthly.objects.filter(
+            user_id=user_id, month=month, activity_type=activity_type
+        ).update(
+            count=F('count') + summary['count'],
+            first_at=Least('first_at', summary['first_at']),
+            last_at=Greatest('last_at', summary['last_at']),
+        )
+        if not updated:
+            UserActivityMonthly.objects.create(user_id=user_id, month=month, activity_type=activity_type, **summary)
+
+
+def archive_batch(cutoff, batch_size):
+    """Move the oldest batch of archivable rows. Returns the number moved."""
+    with transaction.atomic():
+        ids = list(
+            archivable(cutoff)
+            .select_for_update(skip_locked=True)
+            .order_by('timestamp', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+        rows = list(UserActivity.objects.filter(id__in=ids).order_by('timestamp', 'id').values(*ARCHIVED_FIELDS))
+        ArchivedUserActivity.objects.bulk_create([ArchivedUserActivity(**row) for row in rows])
+        _add_to_summaries(rows)
+        UserActivity.objects.filter(id__in=ids).delete()
+    return len(ids)
+
+
+def archive_activities(cutoff, batch_size=1000, max_batches=None):
+    """Archive everything older than cutoff, batch by batch. Yields the size of each batch."""
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(cutoff, batch_size)
+        if not moved:
+            return
+        batches += 1
+        yield moved
@@ -0,0 +1,42 @@
+"""
+Move old UserActivity rows into the cold archive (accounts.archive).
+
+Rows older than --days (USER_ACTIVITY_RETENTION_DAYS by default) are copied
+to ArchivedUserActivity, counted into UserActivityMonthly and deleted from
+the hot table, --batch-size rows per transaction. Activity about a specific
+object stays in the hot table, where its key prevents duplicate logs. Safe
+to interrupt and re-run; schedule it daily.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.archive import archivable, archive_activities, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = 'Archive user activity older than the retention window into monthly summaries and a cold table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Archive rows older than this many days (default: USER_ACTIVITY_RETENTION_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help='Stop after this many batches (spread a large backlog over several runs)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many rows would be archived')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        if options['days'] is not None and options['days'] < 1:
+            raise CommandError('--days must be positive')
+        cutoff = retention_cutoff(options['days'])
+
+        if options['dry_run']:
+            self.stdout.write(f'{archivable(cutoff).count()} activity row(s) older than {cutoff:%Y-%m-%d} would be archived')
+            return
+
+        archived = 0
+        for moved in archive_activities(cutoff, options['batch_size'], options['max_batches']):
+            archived += moved
+            self.stdout.write(f'Archived {archived} row(s)...')
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} activity row(s) older than {cutoff:%Y-%m-%d}'))
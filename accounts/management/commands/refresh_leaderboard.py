@@ -0,0 +1,34 @@
+"""
+Rebuild the community-points leaderboard snapshot (accounts.points).
+
+The leaderboard endpoint only reads LeaderboardEntry; this command ranks
+all profiles and replaces the snapshot. Run it with --loop as the
+leaderboard_worker service in docker-compose does, or from cron.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from accounts.points import refresh_leaderboard
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the community-points leaderboard snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep refreshing every --interval seconds')
+        parser.add_argument('--interval', type=float, default=None,
+                            help='Seconds between refreshes with --loop (default: LEADERBOARD_REFRESH_SECONDS)')
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or getattr(settings, 'LEADERBOARD_REFRESH_SECONDS', 300)
+        while True:
+            close_old_connections()
+            ranked = refresh_leaderboard()
+            self.stdout.write(f'Leaderboard refreshed: {ranked} ranked user(s)')
+            if not options['loop']:
+                break
+            time.sleep(interval)
@@ -1,31 +1,74 @@
-from django.utils.deprecation import MiddlewareMixin
-from django.contrib.sessions.models import Session
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.utils import timezone
-from .models import UserSession, UserActivity
+from django.utils.deprecation import MiddlewareMixin
+from .models import UserSession
 
 
 class UserSessionMiddleware(MiddlewareMixin):
+    """
+    Record a UserSession for each logged-in Django session and keep its
+    last_activity roughly current.
+
+    The cache maps session_key -> (UserSession id, user id, last write), so a
+    request only touches the database when the session is new or its
+    last_activity is older than USER_SESSION_ACTIVITY_INTERVAL seconds.
+    """
+
     def process_request(self, request):
-        if request.user.is_authenticated and hasattr(request, 'session'):
-            session_key = request.session.session_key
-            if session_key:
-                try:
-                    session = Session.objects.get(session_key=session_key)
-                    user_session, created = UserSession.objects.get_or_create(
-                        session=session,
-                        defaults={
-                            'user': request.user,
-                            'ip_address': self.get_client_ip(request),
-                            'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                            'device_info': self.get_device_info(request),
-                        }
-                    )
-                    if not created:
-                        user_session.last_activity = timezone.now()
-                        user_session.save()
-                except Session.DoesNotExist:
-                    pass
-    
+        # The cookie is checked first: reading it costs nothing, while
+        # request.user loads the session and the user
+        if not hasattr(request, 'session'):
+            return
+        session_key = request.session.session_key
+        if not session_key or not request.user.is_authenticated:
+            return
+
+        now = timezone.now()
+        interval = getattr(settings, 'USER_SESSION_ACTIVITY_INTERVAL', 300)
+        key = self.cache_key(session_key)
+        cached = cache.get(key)
+        if cached and cached[1] == request.user.pk:
+            user_session_id, _, last_write = cached
+            if (now - last_write).total_seconds() < interval:
+                return
+            if UserSession.objects.filter(pk=user_session_id).update(last_activity=now):
+                cache.set(key, (user_session_id, request.user.pk, now), self.cache_timeout(interval))
+                return
+
+        user_session_id = self.touch_or_create(request, session_key, now)
+        if user_session_id:
+            cache.set(key, (user_session_id, request.user.pk, now), self.cache_timeout(interval))
+
+    def touch_or_create(self, request, session_key, now):
+        """Id of the session's UserSession, created on first sight; None if the session row is gone"""
+        user_sessions = UserSession.objects.filter(session_id=session_key, user=request.user)
+        user_session_id = user_sessions.values_list('pk', flat=True).first()
+        if user_session_id:
+            user_sessions.update(last_activity=now)
+            return user_session_id
+        try:
+            with transaction.atomic():
+                return UserSession.objects.create(
+                    session_id=session_key,
+                    user=request.user,
+                    ip_address=self.get_client_ip(request),
+                    user_agent=request.META.get('HTTP_USER_AGENT', ''),
+                    device_info=self.get_device_info(request),
+                ).pk
+        except IntegrityError:
+            # Session not stored in the database (or owned by another UserSession)
+            return None
+
+    @staticmethod
+    def cache_key(session_key):
+        return f'user-session:{session_key}'
+
+    @staticmethod
+    def cache_timeout(interval):
+        return max(interval * 10, 3600)
+
     def get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
@@ -33,11 +76,11 @@ class UserSessionMiddleware(MiddlewareMixin):
         else:
             ip = request.META.get('REMOTE_ADDR')
         return ip
-    
+
     def get_device_info(self, request):
         user_agent = request.META.get('HTTP_USER_AGENT', '')
         return {
             'user_agent': user_agent,
             'is_mobile': 'Mobile' in user_agent,
             'is_tablet': 'Tablet' in user_agent,
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+# metadata['source'] of admin actions logged from views -> source column
+ADMIN_ACTION_SOURCES = {'donations': 'donation_cause', 'futsal': 'futsal_slot'}
+
+
+def source_columns(activity):
+    metadata = activity.metadata if isinstance(activity.metadata, dict) else {}
+    source, source_id = metadata.get('source'), metadata.get('id')
+    if not source or not isinstance(source_id, int):
+        return None
+    if activity.activity_type == 'admin_action':
+        return ADMIN_ACTION_SOURCES.get(source, source), source_id, 'created'
+    if source == 'futsal':
+        return 'futsal_booking', source_id, metadata.get('status', '')
+    if source in ('donation', 'event_registration'):
+        return source, source_id, 'points'
+    return source, source_id, metadata.get('status') or metadata.get('type') or ''
+
+
+def backfill_source_columns(apps, schema_editor):
+    """Copy source/id out of metadata; later duplicates of an event keep empty columns"""
+    UserActivity = apps.get_model('accounts', 'UserActivity')
+    seen = set()
+    batch = []
+    for activity in UserActivity.objects.exclude(metadata={}).order_by('timestamp', 'id').iterator(chunk_size=1000):
+        columns = source_columns(activity)
+        if columns is None or columns in seen:
+            continue
+        seen.add(columns)
+        activity.source, activity.source_id, activity.event_key = columns
+        batch.append(activity)
+        if len(batch) >= 1000:
+            UserActivity.objects.bulk_update(batch, ['source', 'source_id', 'event_key'])
+            batch = []
+    UserActivity.objects.bulk_update(batch, ['source', 'source_id', 'event_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='useractivity',
+            name='event_key',
+            field=models.CharField(blank=True, max_length=30),
+        ),
+        migrations.AddField(
+            model_name='useractivity',
+            name='source',
+            field=models.CharField(blank=True, max_length=30),
+        ),
+        migrations.AddField(
+            model_name='useractivity',
+            name='source_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_source_columns, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='useractivity',
+            constraint=models.UniqueConstraint(condition=models.Q(('source_id__isnull', False)), fields=('source', 'source_id', 'event_key'), name='user_activity_source_event'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_activity_source'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedUserActivity',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('activity_type', models.CharField(max_length=30)),
+                ('description', models.TextField()),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('user_agent', models.TextField(blank=True)),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('source', models.CharField(blank=True, max_length=30)),
+                ('source_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('event_key', models.CharField(blank=True, max_length=30)),
+                ('timestamp', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Archived user activities',
+                'ordering': ['-timestamp'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserActivityMonthly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('activity_type', models.CharField(max_length=30)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('first_at', models.DateTimeField()),
+                ('last_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name_plural': 'Monthly user activity',
+                'ordering': ['-month', 'activity_type'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['user', '-timestamp'], name='user_activity_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['timestamp'], name='user_activity_timestamp_idx'),
+        ),
+        migrations.AddField(
+            model_name='archiveduseractivity',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_activities', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='useractivitymonthly',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_activity', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='useractivitymonthly',
+            constraint=models.UniqueConstraint(fields=('user', 'month', 'activity_type'), name='user_activity_monthly_key'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_ledger(apps, schema_editor):
+    """Record awards made before the ledger existed, so their source events cannot award again"""
+    UserActivity = apps.get_model('accounts', 'UserActivity')
+    PointsLedger = apps.get_model('accounts', 'PointsLedger')
+    entries = []
+    for activity in UserActivity.objects.filter(event_key='points').iterator(chunk_size=1000):
+        metadata = activity.metadata if isinstance(activity.metadata, dict) else {}
+        entries.append(PointsLedger(
+            user_id=activity.user_id,
+            points=int(metadata.get('points_awarded') or 0),
+            reason=activity.activity_type,
+            source=activity.source,
+            source_id=activity.source_id,
+            idempotency_key=f'{activity.source}:{activity.source_id}',
+            description=activity.description[:255],
+        ))
+        if len(entries) >= 1000:
+            PointsLedger.objects.bulk_create(entries, ignore_conflicts=True)
+            entries = []
+    PointsLedger.objects.bulk_create(entries, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_activity_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField(db_index=True)),
+                ('points', models.IntegerField()),
+                ('refreshed_at', models.DateTimeField()),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entry', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Leaderboard entries',
+                'ordering': ['rank', 'user_id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PointsLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points', models.IntegerField()),
+                ('reason', models.CharField(max_length=30)),
+                ('source', models.CharField(blank=True, max_length=30)),
+                ('source_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('idempotency_key', models.CharField(max_length=100, unique=True)),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='points_ledger', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='points_ledger_user_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_ledger, migrations.RunPython.noop),
+    ]
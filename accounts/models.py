@@ -65,11 +65,105 @@ class UserActivity(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
     metadata = models.JSONField(default=dict, blank=True)
+    # Object the activity is about; (source, source_id, event_key) is logged at most once
+    source = models.CharField(max_length=30, blank=True)
+    source_id = models.PositiveBigIntegerField(null=True, blank=True)
+    event_key = models.CharField(max_length=30, blank=True)
     timestamp = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-timestamp']
         verbose_name_plural = 'User Activities'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source', 'source_id', 'event_key'],
+                condition=models.Q(source_id__isnull=False),
+                name='user_activity_source_event',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-timestamp'], name='user_activity_recent_idx'),
+            models.Index(fields=['timestamp'], name='user_activity_timestamp_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.user.username} - {self.get_activity_type_display()}"
\ No newline at end of file
+        return f"{self.user.username} - {self.get_activity_type_display()}"
+
+
+class ArchivedUserActivity(models.Model):
+    """Cold copy of a UserActivity row moved out by archive_user_activity; keeps the original id"""
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_activities')
+    activity_type = models.CharField(max_length=30)
+    description = models.TextField()
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    user_agent = models.TextField(blank=True)
+    metadata = models.JSONField(default=dict, blank=True)
+    source = models.CharField(max_length=30, blank=True)
+    source_id = models.PositiveBigIntegerField(null=True, blank=True)
+    event_key = models.CharField(max_length=30, blank=True)
+    timestamp = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-timestamp']
+        verbose_name_plural = 'Archived user activities'
+
+    def __str__(self):
+        return f"{self.user_id} - {self.activity_type} ({self.timestamp:%Y-%m-%d})"
+
+
+class UserActivityMonthly(models.Model):
+    """Per-user, per-month activity counts of archived UserActivity rows"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='monthly_activity')
+    month = models.DateField(help_text='First day of the month')
+    activity_type = models.CharField(max_length=30)
+    count = models.PositiveIntegerField(default=0)
+    first_at = models.DateTimeField()
+    last_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-month', 'activity_type']
+        verbose_name_plural = 'Monthly user activity'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'month', 'activity_type'], name='user_activity_monthly_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.month:%Y-%m} {self.activity_type}: {self.count}"
+
+
+class PointsLedger(models.Model):
+    """One community-points award; idempotency_key makes each source event award once (accounts.points)"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='points_ledger')
+    points = models.IntegerField()
+    reason = models.CharField(max_length=30)
+    source = models.CharField(max_length=30, blank=True)
+    source_id = models.PositiveBigIntegerField(null=True, blank=True)
+    idempotency_key = models.CharField(max_length=100, unique=True)
+    description = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='points_ledger_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.points:+d} ({self.idempotency_key})"
+
+
+class LeaderboardEntry(models.Model):
+    """Ranking snapshot of community points, rebuilt by refresh_leaderboard"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='leaderboard_entry')
+    rank = models.PositiveIntegerField(db_index=True)
+    points = models.IntegerField()
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['rank', 'user_id']
+        verbose_name_plural = 'Leaderboard entries'
+
+    def __str__(self):
+        return f"#{self.rank} {self.user_id}: {self.points}"
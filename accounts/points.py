@@ -0,0 +1,65 @@
+"""
+Community points.
+
+Every award is a PointsLedger row whose idempotency_key names the source
+event (e.g. 'donation:42'); UserProfile.community_points is bumped with an
+F() increment in the same transaction. A second award for the same event
+hits the unique key and changes nothing, and concurrent awards never lose
+increments.
+
+The leaderboard is read from LeaderboardEntry, a ranking snapshot that
+refresh_leaderboard rebuilds periodically, so requests never sort every
+profile.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F, Window
+from django.db.models.functions import Rank
+from django.utils import timezone
+
+from .models import LeaderboardEntry, PointsLedger, UserProfile
+
+
+def points_key(source, source_id):
+    return f'{source}:{source_id}'
+
+
+def award_points(user, points, reason, source, source_id, description=''):
+    """Award points once per (source, source_id). Returns False if already awarded."""
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                PointsLedger.objects.create(
+                    user=user, points=points, reason=reason, source=source, source_id=source_id,
+                    idempotency_key=points_key(source, source_id), description=description[:255],
+                )
+        except IntegrityError:
+            return False
+        updated = UserProfile.objects.filter(user=user).update(community_points=F('community_points') + points)
+        if not updated:
+            UserProfile.objects.get_or_create(user=user)
+            UserProfile.objects.filter(user=user).update(community_points=F('community_points') + points)
+    return True
+
+
+def refresh_leaderboard(batch_size=1000):
+    """Rebuild the ranking snapshot from current profiles. Returns the number of ranked users."""
+    ranked = (
+        UserProfile.objects
+        .filter(community_points__gt=0, user__is_active=True)
+        .annotate(rank=Window(Rank(), order_by=F('community_points').desc()))
+        .values_list('user_id', 'community_points', 'rank')
+    )
+    now = timezone.now()
+    total = 0
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        batch = []
+        for user_id, points, rank in ranked.iterator(chunk_size=batch_size):
+            batch.append(LeaderboardEntry(user_id=user_id, points=points, rank=rank, refreshed_at=now))
+            if len(batch) >= batch_size:
+                LeaderboardEntry.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        LeaderboardEntry.objects.bulk_create(batch)
+        total += len(batch)
+    return total
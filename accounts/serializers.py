@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import UserProfile, UserSession, UserActivity
+from .models import UserProfile, UserSession, UserActivity, LeaderboardEntry
 
 User = get_user_model()
 
@@ -45,6 +45,15 @@ class UserActivitySerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'timestamp']
 
 
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    user_name = serializers.CharField(source='user.get_full_name', read_only=True)
+    avatar = serializers.CharField(source='user.avatar', read_only=True)
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ['rank', 'user', 'user_name', 'avatar', 'points']
+
+
 class UpdateProfileSerializer(serializers.ModelSerializer):
     profile = UserProfileSerializer(required=False)
     
@@ -2,7 +2,9 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from django.contrib.auth.signals import user_logged_in, user_logged_out
-from .models import UserProfile, UserActivity
+from .activity import get_client_ip, log_activity
+from .models import UserProfile
+from .points import award_points
 from donations.models import Donation
 from events.models import EventRegistration
 
@@ -19,12 +21,9 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(user_logged_in)
 def log_user_login(sender, request, user, **kwargs):
     """Log user login activity"""
-    UserActivity.objects.create(
-        user=user,
-        activity_type='login',
-        description=f'User logged in from {get_client_ip(request)}',
-        ip_address=get_client_ip(request),
-        user_agent=request.META.get('HTTP_USER_AGENT', ''),
+    log_activity(
+        user, 'login', f'User logged in from {get_client_ip(request)}',
+        request=request,
         metadata={
             'login_method': 'web',
             'session_key': request.session.session_key
@@ -36,12 +35,9 @@ def log_user_login(sender, request, user, **kwargs):
 def log_user_logout(sender, request, user, **kwargs):
     """Log user logout activity"""
     if user:
-        UserActivity.objects.create(
-            user=user,
-            activity_type='logout',
-            description=f'User logged out from {get_client_ip(request)}',
-            ip_address=get_client_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', ''),
+        log_activity(
+            user, 'logout', f'User logged out from {get_client_ip(request)}',
+            request=request,
             metadata={
                 'logout_method': 'web'
             }
@@ -52,28 +48,15 @@ def log_user_logout(sender, request, user, **kwargs):
 def award_points_for_donation(sender, instance, created, **kwargs):
     """Award points when a donation is completed"""
     if instance.status == 'completed' and instance.user:
-        # Check if points were already awarded for this donation
-        # This prevents double counting if the save method is called multiple times
-        already_awarded = UserActivity.objects.filter(
-            user=instance.user,
-            metadata__source='donation',
-            metadata__id=instance.id
-        ).exists()
-        
-        if not already_awarded:
-            # Calculate points: 10 points per 1 unit of currency (e.g. $1)
-            points_to_award = int(instance.amount * 10)
-            
-            # Update user profile
-            profile, _ = UserProfile.objects.get_or_create(user=instance.user)
-            profile.community_points += points_to_award
-            profile.save()
-            
-            # Log activity
-            UserActivity.objects.create(
-                user=instance.user,
-                activity_type='donation',
-                description=f'Earned {points_to_award} points for donation of {instance.currency} {instance.amount}',
+        # Calculate points: 10 points per 1 unit of currency (e.g. $1)
+        points_to_award = int(instance.amount * 10)
+        description = f'Earned {points_to_award} points for donation of {instance.currency} {instance.amount}'
+
+        # The ledger's idempotency key makes repeated saves award once
+        if award_points(instance.user, points_to_award, 'donation', 'donation', instance.id, description):
+            log_activity(
+                instance.user, 'donation', description,
+                source='donation', source_id=instance.id, event_key='points',
                 metadata={
                     'source': 'donation',
                     'id': instance.id,
@@ -86,27 +69,15 @@ def award_points_for_donation(sender, instance, created, **kwargs):
 def award_points_for_event(sender, instance, created, **kwargs):
     """Award points when an event registration is confirmed"""
     if instance.status == 'confirmed':
-        # Check if points were already awarded for this registration
-        already_awarded = UserActivity.objects.filter(
-            user=instance.user,
-            metadata__source='event_registration',
-            metadata__id=instance.id
-        ).exists()
-        
-        if not already_awarded:
-            # Award fixed 50 points for attending an event
-            points_to_award = 50
-            
-            # Update user profile
-            profile, _ = UserProfile.objects.get_or_create(user=instance.user)
-            profile.community_points += points_to_award
-            profile.save()
-            
-            # Log activity
-            UserActivity.objects.create(
-                user=instance.user,
-                activity_type='event_registration',
-                description=f'Earned {points_to_award} points for registering for event: {instance.event.title}',
+        # Award fixed 50 points for attending an event
+        points_to_award = 50
+        description = f'Earned {points_to_award} points for registering for event: {instance.event.title}'
+
+        if award_points(instance.user, points_to_award, 'event_registration', 'event_registration',
+                        instance.id, description):
+            log_activity(
+                instance.user, 'event_registration', description,
+                source='event_registration', source_id=instance.id, event_key='points',
                 metadata={
                     'source': 'event_registration',
                     'id': instance.id,
@@ -115,16 +86,6 @@ def award_points_for_event(sender, instance, created, **kwargs):
             )
 
 
-def get_client_ip(request):
-    """Get client IP address from request"""
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
-
-
 # --- Futsal Signals ---
 from futsal_booking.models import FutsalBooking
 
@@ -132,10 +93,10 @@ from futsal_booking.models import FutsalBooking
 def log_futsal_booking(sender, instance, created, **kwargs):
     """Log futsal booking activity"""
     if created:
-        UserActivity.objects.create(
-            user=instance.user,
-            activity_type='futsal_booking',
-            description=f'Booked futsal slot for {instance.slot.date} at {instance.slot.start_time}',
+        log_activity(
+            instance.user, 'futsal_booking',
+            f'Booked futsal slot for {instance.slot.date} at {instance.slot.start_time}',
+            source='futsal_booking', source_id=instance.id, event_key='created',
             metadata={
                 'source': 'futsal',
                 'id': instance.id,
@@ -143,10 +104,10 @@ def log_futsal_booking(sender, instance, created, **kwargs):
             }
         )
     elif instance.status == 'cancelled':
-         UserActivity.objects.create(
-            user=instance.user,
-            activity_type='futsal_booking',
-            description=f'Cancelled futsal booking for {instance.slot.date}',
+        log_activity(
+            instance.user, 'futsal_booking',
+            f'Cancelled futsal booking for {instance.slot.date}',
+            source='futsal_booking', source_id=instance.id, event_key='cancelled',
             metadata={
                 'source': 'futsal',
                 'id': instance.id,
@@ -161,34 +122,25 @@ from staff.models import StaffTask, StaffAttendance
 def log_staff_task(sender, instance, created, **kwargs):
     """Log staff task completion"""
     if instance.status == 'completed':
-        # Check double logging
-        already_logged = UserActivity.objects.filter(
-            user=instance.assigned_to.user,
-            metadata__source='staff_task',
-            metadata__id=instance.id,
-            metadata__status='completed'
-        ).exists()
-
-        if not already_logged:
-             UserActivity.objects.create(
-                user=instance.assigned_to.user,
-                activity_type='task_update',
-                description=f'Completed task: {instance.title}',
-                metadata={
-                    'source': 'staff_task',
-                    'id': instance.id,
-                    'status': 'completed'
-                }
-            )
+        # Logged once per task: a repeat insert is dropped by the unique constraint
+        log_activity(
+            instance.assigned_to.user, 'task_update', f'Completed task: {instance.title}',
+            source='staff_task', source_id=instance.id, event_key='completed',
+            metadata={
+                'source': 'staff_task',
+                'id': instance.id,
+                'status': 'completed'
+            }
+        )
 
 @receiver(post_save, sender=StaffAttendance)
 def log_staff_attendance(sender, instance, created, **kwargs):
     """Log staff attendance check-in/out"""
     if created: # Check-in
-         UserActivity.objects.create(
-            user=instance.staff.user,
-            activity_type='attendance',
-            description=f'Checked in for work at {instance.check_in.strftime("%H:%M")}' if instance.check_in else 'Marked present',
+        log_activity(
+            instance.staff.user, 'attendance',
+            f'Checked in for work at {instance.check_in.strftime("%H:%M")}' if instance.check_in else 'Marked present',
+            source='staff_attendance', source_id=instance.id, event_key='check_in',
             metadata={
                 'source': 'staff_attendance',
                 'id': instance.id,
@@ -196,25 +148,17 @@ def log_staff_attendance(sender, instance, created, **kwargs):
             }
         )
     elif instance.check_out and instance.status == 'present': # Check-out (update)
-         # Check if already logged check-out to avoid noise on every save
-         already_logged = UserActivity.objects.filter(
-            user=instance.staff.user,
-            metadata__source='staff_attendance',
-            metadata__id=instance.id,
-            metadata__type='check_out'
-        ).exists()
-         
-         if not already_logged:
-            UserActivity.objects.create(
-                user=instance.staff.user,
-                activity_type='attendance',
-                description=f'Checked out from work at {instance.check_out.strftime("%H:%M")}',
-                metadata={
-                    'source': 'staff_attendance',
-                    'id': instance.id,
-                    'type': 'check_out'
-                }
-            )
+        # Logged once per attendance record, so later saves add no noise
+        log_activity(
+            instance.staff.user, 'attendance',
+            f'Checked out from work at {instance.check_out.strftime("%H:%M")}',
+            source='staff_attendance', source_id=instance.id, event_key='check_out',
+            metadata={
+                'source': 'staff_attendance',
+                'id': instance.id,
+                'type': 'check_out'
+            }
+        )
 
 # --- Admin/Management Signals ---
 from donations.models import DonationCause
@@ -8,6 +8,7 @@ urlpatterns = [
     path('sessions/<str:session_id>/terminate/', views.terminate_session, name='terminate_session'),
     path('sessions/terminate-all/', views.terminate_all_sessions, name='terminate_all_sessions'),
     path('activities/', views.user_activities, name='user_activities'),
+    path('leaderboard/', views.leaderboard, name='leaderboard'),
     path('change-password/', views.change_password, name='change_password'),
     path('delete-account/', views.delete_account, name='delete_account'),
     path('dashboard-stats/', views.user_dashboard_stats, name='user_dashboard_stats'),
@@ -2,19 +2,23 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.conf import settings
 from django.contrib.sessions.models import Session
 from django.utils import timezone
 from django.db.models import Sum
-from .models import UserProfile, UserSession, UserActivity
+from .activity import log_activity
+from .models import UserProfile, UserSession, UserActivity, LeaderboardEntry
 from .serializers import (
     UserDetailSerializer, UserProfileSerializer, UpdateProfileSerializer,
-    UserSessionSerializer, UserActivitySerializer
+    UserSessionSerializer, UserActivitySerializer, LeaderboardEntrySerializer
 )
 from donations.models import Donation
+from donations.rollups import get_totals
 from events.models import Event
 from events.serializers import EventSerializer
 from donations.serializers import DonationSerializer
 from django.contrib.auth import get_user_model
+from TeqwaCore.pagination import paginated_response
 
 User = get_user_model()
 
@@ -29,14 +33,12 @@ def user_list(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    users = User.objects.all().order_by('-date_joined')
-    serializer = UserDetailSerializer(users, many=True)
-    
-    return Response({
-        'message': 'Users retrieved successfully',
-        'data': serializer.data,
-        'count': users.count()
-    })
+    users = User.objects.select_related('profile')
+    return paginated_response(
+        request, users, UserDetailSerializer,
+        message='Users retrieved successfully',
+        cursor_field='date_joined'
+    )
 
 
 @api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
@@ -108,12 +110,9 @@ def update_profile(request):
         serializer.save()
         
         # Log activity
-        UserActivity.objects.create(
-            user=request.user,
-            activity_type='profile_update',
-            description='User updated their profile',
-            ip_address=get_client_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', ''),
+        log_activity(
+            request.user, 'profile_update', 'User updated their profile',
+            request=request,
             metadata={'updated_fields': list(request.data.keys())}
         )
         
@@ -191,13 +190,35 @@ def terminate_all_sessions(request):
 @permission_classes([IsAuthenticated])
 def user_activities(request):
     """Get user's activity history"""
-    activities = UserActivity.objects.filter(user=request.user)[:50]  # Last 50 activities
-    serializer = UserActivitySerializer(activities, many=True)
-    
+    activities = UserActivity.objects.filter(user=request.user)
+    return paginated_response(
+        request, activities, UserActivitySerializer,
+        message='User activities retrieved successfully',
+        cursor_field='timestamp',
+        page_size=50
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def leaderboard(request):
+    """Top community point earners and the caller's rank, from the latest ranking snapshot"""
+    max_size = getattr(settings, 'LEADERBOARD_MAX_SIZE', 100)
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), max_size)
+    except ValueError:
+        return Response({
+            'error': 'limit must be a number'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    entries = list(LeaderboardEntry.objects.select_related('user')[:limit])
+    mine = LeaderboardEntry.objects.filter(user=request.user).first()
     return Response({
-        'message': 'User activities retrieved successfully',
-        'data': serializer.data,
-        'count': activities.count()
+        'message': 'Leaderboard retrieved successfully',
+        'data': LeaderboardEntrySerializer(entries, many=True).data,
+        'count': len(entries),
+        'me': {'rank': mine.rank, 'points': mine.points} if mine else None,
+        'refreshed_at': entries[0].refreshed_at if entries else None
     })
 
 
@@ -224,16 +245,10 @@ def change_password(request):
         }, status=status.HTTP_400_BAD_REQUEST)
     
     request.user.set_password(new_password)
-    request.user.save()
+    request.user.save(update_fields=['password', 'updated_at'])
     
     # Log activity
-    UserActivity.objects.create(
-        user=request.user,
-        activity_type='profile_update',
-        description='User changed their password',
-        ip_address=get_client_ip(request),
-        user_agent=request.META.get('HTTP_USER_AGENT', '')
-    )
+    log_activity(request.user, 'profile_update', 'User changed their password', request=request)
     
     return Response({
         'message': 'Password changed successfully'
@@ -258,32 +273,16 @@ def delete_account(request):
     
     # Soft delete by deactivating account
     request.user.is_active = False
-    request.user.save()
+    request.user.save(update_fields=['is_active', 'updated_at'])
     
     # Log activity
-    UserActivity.objects.create(
-        user=request.user,
-        activity_type='profile_update',
-        description='User deactivated their account',
-        ip_address=get_client_ip(request),
-        user_agent=request.META.get('HTTP_USER_AGENT', '')
-    )
+    log_activity(request.user, 'profile_update', 'User deactivated their account', request=request)
     
     return Response({
         'message': 'Account deactivated successfully'
     })
 
 
-def get_client_ip(request):
-    """Get client IP address from request"""
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
-
-
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_dashboard_stats(request):
@@ -306,7 +305,7 @@ def user_dashboard_stats(request):
                 total_staff = StaffMember.objects.count()
                 
                 # System Donations
-                total_donations = Donation.objects.filter(status='completed').aggregate(Sum('amount'))['amount__sum'] or 0
+                total_donations = get_totals('completed').amount
 
                 data.update({
                     'counts': {
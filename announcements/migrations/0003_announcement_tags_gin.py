@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def create_tags_index(apps, schema_editor):
+    # jsonb_path_ops serves the tags @> '[...]' containment filter; SQLite has no GIN indexes
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS announcement_tags_gin_idx '
+        'ON announcements_announcement USING gin (tags jsonb_path_ops)'
+    )
+
+
+def drop_tags_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS announcement_tags_gin_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_tags_index, drop_tags_index),
+    ]
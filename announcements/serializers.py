@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Announcement
+from .tags import clean_tags
 from donations.serializers import DonationCauseSerializer
 
 
@@ -15,6 +16,11 @@ class AnnouncementSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'author', 'created_at', 'updated_at']
 
+    def validate_tags(self, value):
+        if not isinstance(value, list) or not all(isinstance(tag, str) for tag in value):
+            raise serializers.ValidationError('Tags must be a list of strings.')
+        return clean_tags(value)
+
     def create(self, validated_data):
         validated_data['author'] = self.context['request'].user
         return super().create(validated_data)
\ No newline at end of file
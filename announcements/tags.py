@@ -0,0 +1,70 @@
+"""
+Announcement tags.
+
+Announcement.tags is a JSON list of strings. On PostgreSQL ?tags= filtering
+is a jsonb containment (@>) query served by a GIN index and the facet counts
+are aggregated in the database; other databases (SQLite in local
+development) use a JSON text match and count in Python.
+"""
+import json
+from collections import Counter
+
+from django.db import connection
+
+MAX_TAG_LENGTH = 50
+
+
+def is_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def clean_tags(tags):
+    """Stripped, non-empty, de-duplicated tags in their original order"""
+    cleaned = []
+    for tag in tags:
+        tag = str(tag).strip()[:MAX_TAG_LENGTH]
+        if tag and tag not in cleaned:
+            cleaned.append(tag)
+    return cleaned
+
+
+def parse_tags_param(value):
+    """Tags from a comma-separated query parameter"""
+    return clean_tags((value or '').split(','))
+
+
+def filter_by_tags(queryset, tags):
+    """Announcements carrying every one of `tags`"""
+    if not tags:
+        return queryset
+    if is_postgres():
+        return queryset.filter(tags__contains=tags)
+    for tag in tags:
+        queryset = queryset.filter(tags__icontains=json.dumps(tag))
+    return queryset
+
+
+def tag_counts(queryset):
+    """[(tag, count), ...] over a queryset, most used first"""
+    if is_postgres():
+        sql, params = queryset.order_by().values('tags').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT tag, COUNT(*) AS total
+                FROM ({sql}) AS announcement,
+                     jsonb_array_elements_text(
+                         CASE WHEN jsonb_typeof(announcement.tags) = 'array' THEN announcement.tags ELSE '[]'::jsonb END
+                     ) AS tag
+                GROUP BY tag
+                ORDER BY total DESC, tag
+                """,
+                params,
+            )
+            return cursor.fetchall()
+
+    counts = Counter()
+    for tags in queryset.values_list('tags', flat=True).iterator():
+        if isinstance(tags, list):
+            counts.update(clean_tags(tags))
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
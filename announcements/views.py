@@ -4,17 +4,21 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from .models import Announcement
 from .serializers import AnnouncementSerializer
+from .tags import filter_by_tags, parse_tags_param, tag_counts
+from TeqwaCore.cache import cache_public_response
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_public_response('announcements')
 def announcement_list(request):
-    """List all published announcements"""
+    """List all published announcements, optionally only those carrying every tag in ?tags=a,b"""
     featured_only = request.GET.get('featured', '').lower() == 'true'
     
     announcements = Announcement.objects.filter(published=True)
     if featured_only:
         announcements = announcements.filter(featured=True)
+    announcements = filter_by_tags(announcements, parse_tags_param(request.GET.get('tags')))
     
     serializer = AnnouncementSerializer(announcements, many=True)
     return Response({
@@ -24,6 +28,23 @@ def announcement_list(request):
     })
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@cache_public_response('announcement_tags')
+def announcement_tags(request):
+    """Tag counts over published announcements"""
+    announcements = Announcement.objects.filter(published=True)
+    if request.GET.get('featured', '').lower() == 'true':
+        announcements = announcements.filter(featured=True)
+
+    tags = [{'tag': tag, 'count': count} for tag, count in tag_counts(announcements)]
+    return Response({
+        'message': 'Announcement tags retrieved successfully',
+        'data': tags,
+        'count': len(tags)
+    })
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def announcement_detail(request, pk):
@@ -0,0 +1,47 @@
+"""
+Deliver queued transactional emails from the OutgoingEmail outbox.
+
+Run once (e.g. from cron) or keep it running with --loop, as the
+email_worker service in docker-compose does. Held admin alerts are flushed
+as a digest when ADMIN_ALERT_DIGEST_MINUTES is set.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from authentication.outbox import deliver_batch
+from authentication.utils import flush_admin_alert_digest
+
+
+class Command(BaseCommand):
+    help = 'Send pending emails from the outbox, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Emails sent per SMTP connection (default: EMAIL_OUTBOX_BATCH_SIZE)')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep polling the outbox instead of exiting when it is empty')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds to sleep between polls when the outbox is empty (with --loop)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total_sent = total_failed = 0
+
+        while True:
+            close_old_connections()
+            flush_admin_alert_digest()
+            sent, failed = deliver_batch(batch_size)
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f'Sent {sent} email(s), {failed} failed')
+
+            if sent + failed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Outbox drained: {total_sent} sent, {total_failed} failed'))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdminAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255)),
+                ('message', models.TextField()),
+                ('event_type', models.CharField(default='general', max_length=50)),
+                ('details', models.JSONField(blank=True, default=dict)),
+                ('digested_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['digested_at', 'created_at'], name='admin_alert_pending_idx')],
+            },
+        ),
+    ]
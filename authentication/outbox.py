@@ -0,0 +1,126 @@
+"""
+Transactional email outbox.
+
+Request handlers never talk to SMTP: enqueue_email() stores the message in
+the OutgoingEmail table (inside whatever transaction the caller is in, so an
+email is only sent if the surrounding work commits). The
+process_email_outbox management command drains the table, reusing one SMTP
+connection per batch and retrying failed messages with exponential backoff.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(subject, message, recipients, html_message=None, from_email=None):
+    """Queue an email for background delivery"""
+    recipients = [address for address in recipients if address]
+    if not recipients:
+        return None
+    return OutgoingEmail.objects.create(
+        subject=subject[:255],
+        body=message,
+        html_body=html_message or '',
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=recipients,
+    )
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt: base * 2^(attempts-1), capped"""
+    base = getattr(settings, 'EMAIL_OUTBOX_RETRY_BASE_SECONDS', 60)
+    cap = getattr(settings, 'EMAIL_OUTBOX_RETRY_MAX_SECONDS', 3600)
+    return timedelta(seconds=min(base * 2 ** max(attempts - 1, 0), cap))
+
+
+def claim_batch(batch_size):
+    """
+    Lock a batch of due emails for this worker.
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED so several workers
+    can run side by side. Rows stuck in 'sending' (worker killed mid-batch)
+    become claimable again after EMAIL_OUTBOX_LOCK_SECONDS.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=getattr(settings, 'EMAIL_OUTBOX_LOCK_SECONDS', 600))
+    with transaction.atomic():
+        ids = list(
+            OutgoingEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status='pending', next_attempt_at__lte=now) |
+                Q(status='sending', locked_at__lt=stale)
+            )
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if ids:
+            OutgoingEmail.objects.filter(id__in=ids).update(status='sending', locked_at=now)
+    return list(OutgoingEmail.objects.filter(id__in=ids).order_by('id'))
+
+
+def _mark_failed(email, error):
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    email.attempts += 1
+    email.last_error = str(error)[:2000]
+    email.locked_at = None
+    if email.attempts >= max_attempts:
+        email.status = 'failed'
+        logger.error("Giving up on outgoing email %s after %s attempts: %s", email.id, email.attempts, error)
+    else:
+        email.status = 'pending'
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+        logger.warning("Outgoing email %s failed (attempt %s): %s", email.id, email.attempts, error)
+    email.save(update_fields=['attempts', 'last_error', 'locked_at', 'status', 'next_attempt_at'])
+
+
+def deliver_batch(batch_size=None):
+    """Send one batch of due emails over a single SMTP connection. Returns (sent, failed)."""
+    batch_size = batch_size or getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 50)
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # Nothing could be delivered; every claimed row goes back into the queue
+        for email in emails:
+            _mark_failed(email, e)
+        return 0, len(emails)
+
+    try:
+        for email in emails:
+            message = EmailMultiAlternatives(
+                email.subject, email.body, email.from_email, email.recipients,
+                connection=connection,
+            )
+            if email.html_body:
+                message.attach_alternative(email.html_body, 'text/html')
+            try:
+                message.send()
+            except Exception as e:
+                _mark_failed(email, e)
+                failed += 1
+                continue
+            email.status = 'sent'
+            email.attempts += 1
+            email.sent_at = timezone.now()
+            email.locked_at = None
+            email.last_error = ''
+            email.save(update_fields=['status', 'attempts', 'sent_at', 'locked_at', 'last_error'])
+            sent += 1
+    finally:
+        connection.close()
+    return sent, failed
@@ -1,7 +1,59 @@
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
 
-class SoftJWTAuthentication(JWTAuthentication):
+from .user_cache import CachedUser, get_user_claims
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that serves request.user as a CachedUser, so permission
+    checks on role and status read the per-process user cache.
+
+    The outcome for a raw token is kept on the request, so when several JWT
+    authenticators are configured the token is decoded and the user looked
+    up only once.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        django_request = getattr(request, '_request', request)
+        memo = getattr(django_request, '_jwt_authentication', None)
+        if memo is None or memo[0] != raw_token:
+            try:
+                validated_token = self.get_validated_token(raw_token)
+                memo = (raw_token, (self.get_user(validated_token), validated_token), None)
+            except (InvalidToken, AuthenticationFailed) as e:
+                memo = (raw_token, None, e)
+            django_request._jwt_authentication = memo
+
+        _, result, error = memo
+        if error is not None:
+            raise error
+        return result
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        claims = get_user_claims(user_id)
+        if claims is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        user = CachedUser(user_id, claims)
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        return user
+
+
+class SoftJWTAuthentication(CachedJWTAuthentication):
     def authenticate(self, request):
         try:
             return super().authenticate(request)
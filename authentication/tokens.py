@@ -0,0 +1,45 @@
+"""
+JWTs carrying the user's role and status.
+
+Access tokens include role, is_active and is_verified claims, so clients
+(and any service that only verifies the signature) know what the user may do
+without a profile request. Claims are re-read from the user whenever an
+access token is issued, including on refresh, so a role change shows up in
+the next token.
+"""
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .user_cache import CachedUser, get_user_claims
+
+USER_CLAIMS = ('role', 'is_active', 'is_verified')
+
+
+def add_user_claims(token, user):
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim, None)
+    return token
+
+
+class RoleRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry current USER_CLAIMS"""
+
+    @classmethod
+    def for_user(cls, user):
+        return add_user_claims(super().for_user(user), user)
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+        claims = get_user_claims(user_id)
+        user = CachedUser(user_id, claims) if claims is not None else None
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed('User is inactive or no longer exists', code='user_inactive')
+        return add_user_claims(access, user)
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RoleRefreshToken
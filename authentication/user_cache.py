@@ -0,0 +1,83 @@
+"""
+Per-process cache of the user fields permission checks read.
+
+JWT-authenticated requests get a CachedUser: role and status flags come from
+this cache (entries live for USER_CACHE_TTL_SECONDS and are dropped as soon
+as the user is saved or deleted in this process), so ordinary permission
+checks run no query. Any other use of request.user - reading another field,
+assigning it to a foreign key, saving it - loads the current row from the
+database first, so writes never start from cached values.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.utils.functional import SimpleLazyObject, empty
+
+CACHED_FIELDS = ('role', 'is_active', 'is_verified', 'is_staff', 'is_superuser')
+
+_users = {}
+_lock = threading.Lock()
+
+
+def get_user_claims(user_id):
+    """{field: value} for CACHED_FIELDS of the user with this id, or None if there is none"""
+    now = time.monotonic()
+    with _lock:
+        entry = _users.get(user_id)
+    if entry and entry[0] > now:
+        return dict(entry[1])
+
+    claims = get_user_model().objects.filter(pk=user_id).values(*CACHED_FIELDS).first()
+    if claims is None:
+        return None
+    with _lock:
+        if len(_users) >= getattr(settings, 'USER_CACHE_MAX_ENTRIES', 10000):
+            for key in [key for key, (expires, _) in _users.items() if expires <= now] or list(_users)[:100]:
+                _users.pop(key, None)
+        _users[user_id] = (now + getattr(settings, 'USER_CACHE_TTL_SECONDS', 60), claims)
+    return dict(claims)
+
+
+class CachedUser(SimpleLazyObject):
+    """request.user that answers CACHED_FIELDS from the cache and loads the row for anything else"""
+
+    def __init__(self, user_id, claims):
+        super().__init__(lambda: get_user_model().objects.get(pk=user_id))
+        self.__dict__.update(claims, pk=user_id, id=user_id, is_authenticated=True, is_anonymous=False)
+
+    def _setup(self):
+        super()._setup()
+        # From here on every attribute comes from the freshly loaded row
+        for name in (*CACHED_FIELDS, 'pk', 'id', 'is_authenticated', 'is_anonymous'):
+            self.__dict__.pop(name, None)
+
+    def __bool__(self):
+        return True
+
+    def __repr__(self):
+        if self._wrapped is empty:
+            return f'<CachedUser: {self.__dict__["pk"]}>'
+        return super().__repr__()
+
+
+def invalidate_user(user_id):
+    with _lock:
+        _users.pop(user_id, None)
+
+
+def clear_user_cache():
+    with _lock:
+        _users.clear()
+
+
+def _invalidate(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+def connect_user_cache():
+    user_model = get_user_model()
+    post_save.connect(_invalidate, sender=user_model, dispatch_uid='user-cache-save')
+    post_delete.connect(_invalidate, sender=user_model, dispatch_uid='user-cache-delete')
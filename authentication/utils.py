@@ -1,10 +1,15 @@
-from django.core.mail import send_mail, send_mass_mail
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.contrib.auth import get_user_model
 import secrets
+from datetime import timedelta
+
+from .models import AdminAlert
+from .outbox import enqueue_email
 
 User = get_user_model()
 
@@ -80,14 +85,7 @@ def send_verification_email(user, token):
     </html>
     """
     
-    send_mail(
-        subject,
-        message,
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email],
-        html_message=html_message,
-        fail_silently=False,
-    )
+    enqueue_email(subject, message, [user.email], html_message=html_message)
 
 
 def send_password_reset_email(user, token):
@@ -146,14 +144,7 @@ def send_password_reset_email(user, token):
     </html>
     """
     
-    send_mail(
-        subject,
-        message,
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email],
-        html_message=html_message,
-        fail_silently=False,
-    )
+    enqueue_email(subject, message, [user.email], html_message=html_message)
 
 
 def send_donation_confirmation_email(donation, user=None):
@@ -227,16 +218,9 @@ def send_donation_confirmation_email(donation, user=None):
     """
     
     try:
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [recipient_email],
-            html_message=html_message,
-            fail_silently=False,
-        )
+        enqueue_email(subject, message, [recipient_email], html_message=html_message)
     except Exception as e:
-        print(f"Error sending donation confirmation email: {e}")
+        print(f"Error queueing donation confirmation email: {e}")
 
 
 def send_event_registration_email(event, user, registration):
@@ -256,7 +240,7 @@ def send_event_registration_email(event, user, registration):
     Event Details:
     - Event: {event.title}
     - Date: {event.date.strftime('%B %d, %Y') if event.date else 'TBA'}
-    - Time: {event.start_time.strftime('%I:%M %p') if event.start_time else 'TBA'}
+    - Time: {event.date.strftime('%I:%M %p') if event.date else 'TBA'}
     - Location: {event.location or 'TBA'}
     - Status: {registration.status}
     
@@ -278,7 +262,7 @@ def send_event_registration_email(event, user, registration):
                     <h3 style="margin-top: 0; color: #2c5282;">Event Details</h3>
                     <p><strong>Event:</strong> {event.title}</p>
                     {f"<p><strong>Date:</strong> {event.date.strftime('%B %d, %Y')}</p>" if event.date else ''}
-                    {f"<p><strong>Time:</strong> {event.start_time.strftime('%I:%M %p')}</p>" if event.start_time else ''}
+                    {f"<p><strong>Time:</strong> {event.date.strftime('%I:%M %p')}</p>" if event.date else ''}
                     {f"<p><strong>Location:</strong> {event.location}</p>" if event.location else ''}
                     <p><strong>Status:</strong> <span style="color: green;">{registration.status.title()}</span></p>
                 </div>
@@ -304,16 +288,9 @@ def send_event_registration_email(event, user, registration):
     """
     
     try:
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [recipient_email],
-            html_message=html_message,
-            fail_silently=False,
-        )
+        enqueue_email(subject, message, [user.email], html_message=html_message)
     except Exception as e:
-        print(f"Error sending event registration email: {e}")
+        print(f"Error queueing event registration email: {e}")
 
 
 def send_itikaf_approval_email(registration, program, user, status='approved'):
@@ -396,47 +373,39 @@ def send_itikaf_approval_email(registration, program, user, status='approved'):
     """
     
     try:
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [recipient_email],
-            html_message=html_message,
-            fail_silently=False,
-        )
+        enqueue_email(subject, message, [user.email], html_message=html_message)
     except Exception as e:
-        print(f"Error sending iʿtikāf approval email: {e}")
+        print(f"Error queueing iʿtikāf approval email: {e}")
 
 
-def send_admin_alert_email(subject_text, message_text, event_type='general', details=None):
-    """Send alert email to all admin users"""
-    try:
-        admin_users = User.objects.filter(role='admin', is_active=True)
-        admin_emails = [admin.email for admin in admin_users if admin.email]
-        
-        if not admin_emails:
-            print("No admin email addresses found for alert")
-            return
-        
-        subject = f'[ADMIN ALERT] {subject_text} - Teqwa'
-        
-        message = f"""
+def _admin_alert_recipients():
+    """Email addresses of active admins"""
+    return list(
+        User.objects.filter(role='admin', is_active=True)
+        .exclude(email='')
+        .values_list('email', flat=True)
+    )
+
+
+def _render_admin_alert(subject_text, message_text, event_type='general', details=None):
+    """Build the plain text and HTML bodies of a single admin alert"""
+    message = f"""
         Admin Alert: {subject_text}
         
         {message_text}
         """
-        
-        if details:
-            message += "\n\nDetails:\n"
-            for key, value in details.items():
-                message += f"- {key}: {value}\n"
-        
-        message += """
+    
+    if details:
+        message += "\n\nDetails:\n"
+        for key, value in details.items():
+            message += f"- {key}: {value}\n"
+    
+    message += """
         
         This is an automated alert from the Teqwa system.
         """
-        
-        html_message = f"""
+    
+    html_message = f"""
         <html>
             <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
                 <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
@@ -468,25 +437,101 @@ def send_admin_alert_email(subject_text, message_text, event_type='general', det
             </body>
         </html>
         """
+    return message, html_message
+
+
+def send_admin_alert_email(subject_text, message_text, event_type='general', details=None):
+    """
+    Send alert email to all admin users.
+
+    The alert is queued as a single message addressed to every admin. When
+    ADMIN_ALERT_DIGEST_MINUTES is set, the alert is held instead and sent with
+    the others in one digest email by the outbox worker.
+    """
+    try:
+        if getattr(settings, 'ADMIN_ALERT_DIGEST_MINUTES', 0) > 0:
+            AdminAlert.objects.create(
+                subject=subject_text[:255],
+                message=message_text,
+                event_type=event_type,
+                details={key: str(value) for key, value in (details or {}).items()},
+            )
+            return
         
-        # Send to all admins
-        for email in admin_emails:
-            try:
-                send_mail(
-                    subject,
-                    message,
-                    settings.DEFAULT_FROM_EMAIL,
-                    [email],
-                    html_message=html_message,
-                    fail_silently=False,
-                )
-            except Exception as e:
-                print(f"Error sending admin alert to {email}: {e}")
+        admin_emails = _admin_alert_recipients()
+        if not admin_emails:
+            print("No admin email addresses found for alert")
+            return
+        
+        subject = f'[ADMIN ALERT] {subject_text} - Teqwa'
+        message, html_message = _render_admin_alert(subject_text, message_text, event_type, details)
+        enqueue_email(subject, message, admin_emails, html_message=html_message)
                 
     except Exception as e:
         print(f"Error in send_admin_alert_email: {e}")
 
 
+def flush_admin_alert_digest():
+    """
+    Send held admin alerts as one digest email once the oldest has waited
+    ADMIN_ALERT_DIGEST_MINUTES. Returns the number of alerts included.
+    """
+    minutes = getattr(settings, 'ADMIN_ALERT_DIGEST_MINUTES', 0)
+    held = AdminAlert.objects.filter(digested_at__isnull=True)
+    oldest = held.order_by('created_at').values_list('created_at', flat=True).first()
+    if oldest is None:
+        return 0
+    # With digest mode switched off, anything still held is flushed right away
+    if minutes > 0 and oldest > timezone.now() - timedelta(minutes=minutes):
+        return 0
+    
+    with transaction.atomic():
+        alerts = list(held.select_for_update(skip_locked=True).order_by('created_at'))
+        if not alerts:
+            return 0
+        
+        admin_emails = _admin_alert_recipients()
+        if admin_emails:
+            subject = f'[ADMIN DIGEST] {len(alerts)} alert(s) - Teqwa'
+            message = "\n".join(
+                f"[{alert.created_at.strftime('%B %d, %Y at %I:%M %p')}]"
+                + _render_admin_alert(alert.subject, alert.message, alert.event_type, alert.details)[0]
+                for alert in alerts
+            )
+            items = ''.join(
+                f'''
+                    <div style="border-bottom: 1px solid #ddd; padding: 10px 0;">
+                        <p style="margin: 0; font-size: 12px; color: #999;">{alert.created_at.strftime('%B %d, %Y at %I:%M %p')} &middot; {alert.event_type}</p>
+                        <h3 style="color: #2c5282; margin: 5px 0;">{alert.subject}</h3>
+                        <p>{alert.message}</p>
+                        {''.join([f'<p><strong>{key}:</strong> {value}</p>' for key, value in alert.details.items()])}
+                    </div>
+                '''
+                for alert in alerts
+            )
+            html_message = f"""
+        <html>
+            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                    <div style="background-color: #d32f2f; color: white; padding: 15px; border-radius: 5px; margin-bottom: 20px;">
+                        <h2 style="margin: 0;">ADMIN DIGEST ({len(alerts)})</h2>
+                    </div>
+                    {items}
+                    <p style="color: #999; font-size: 12px;">
+                        Teqwa Management System
+                    </p>
+                </div>
+            </body>
+        </html>
+        """
+            enqueue_email(subject, message, admin_emails, html_message=html_message)
+        else:
+            print("No admin email addresses found for alert digest")
+        
+        AdminAlert.objects.filter(id__in=[alert.id for alert in alerts]).update(digested_at=timezone.now())
+    return len(alerts)
+
+
 def send_new_user_registration_alert(user):
     """Send alert to admins when a new user registers"""
     send_admin_alert_email(
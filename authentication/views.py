@@ -12,6 +12,7 @@ from .serializers import (
     ChangePasswordSerializer, EmailVerificationSerializer
 )
 from .models import User
+from .tokens import RoleRefreshToken
 from .utils import (
     send_verification_email, send_password_reset_email,
     generate_verification_token, send_new_user_registration_alert
@@ -43,7 +44,7 @@ def register(request):
             print(f"Error sending admin registration alert: {e}")
         
         # Generate tokens for immediate login (optional - can require verification first)
-        refresh = RefreshToken.for_user(user)
+        refresh = RoleRefreshToken.for_user(user)
         
         return Response({
             'message': 'User registered successfully. Please check your email to verify your account.',
@@ -62,7 +63,7 @@ def login(request):
     serializer = LoginSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.validated_data['user']
-        refresh = RefreshToken.for_user(user)
+        refresh = RoleRefreshToken.for_user(user)
         return Response({
             'message': 'Login successful',
             'user': UserSerializer(user).data,
@@ -92,6 +92,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third party apps
     'rest_framework',
@@ -126,6 +127,7 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'accounts.middleware.UserSessionMiddleware',
+    'accounts.activity.ActivityBufferMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -177,6 +179,34 @@ else:
     }
 
 
+# Cache
+# Defaults to per-process local memory. With several gunicorn workers set
+# CACHE_URL to a shared backend (e.g. rediscache://redis:6379/1) or a file
+# cache (filecache:///app/cache) so invalidations reach every worker.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://teqwa-default'),
+}
+
+# Public list endpoint caching (see TeqwaCore.cache)
+PUBLIC_CACHE_ALIAS = 'default'
+PUBLIC_CACHE_TIMEOUT = env.int('PUBLIC_CACHE_TIMEOUT', default=300)
+
+# UserSession.last_activity is written at most once per interval per session (accounts.middleware)
+USER_SESSION_ACTIVITY_INTERVAL = env.int('USER_SESSION_ACTIVITY_INTERVAL', default=300)
+# UserActivity rows logged during a request are inserted together at its end (accounts.activity)
+USER_ACTIVITY_BUFFERED = env.bool('USER_ACTIVITY_BUFFERED', default=True)
+# archive_user_activity moves older rows into monthly summaries and a cold table (accounts.archive)
+USER_ACTIVITY_RETENTION_DAYS = env.int('USER_ACTIVITY_RETENTION_DAYS', default=180)
+
+# Community-points leaderboard snapshot (accounts.points), rebuilt by refresh_leaderboard
+LEADERBOARD_REFRESH_SECONDS = env.int('LEADERBOARD_REFRESH_SECONDS', default=300)
+LEADERBOARD_MAX_SIZE = env.int('LEADERBOARD_MAX_SIZE', default=100)
+
+# JWT-authenticated users are served from a per-process cache (authentication.user_cache)
+USER_CACHE_TTL_SECONDS = env.int('USER_CACHE_TTL_SECONDS', default=60)
+USER_CACHE_MAX_ENTRIES = env.int('USER_CACHE_MAX_ENTRIES', default=10000)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -221,6 +251,40 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Protected media (TeqwaCore.media): set MEDIA_ACCEL_REDIRECT when nginx serves
+# MEDIA_ROOT at the internal MEDIA_ACCEL_PREFIX location; otherwise Django
+# streams the files itself with Range support
+MEDIA_ACCEL_REDIRECT = env.bool('MEDIA_ACCEL_REDIRECT', default=False)
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+PROTECTED_MEDIA_URL_MAX_AGE = env.int('PROTECTED_MEDIA_URL_MAX_AGE', default=6 * 3600)
+
+# Direct-to-storage uploads (TeqwaCore.uploads): presigned PUT on S3, signed local endpoint otherwise
+UPLOAD_INTENT_EXPIRY_SECONDS = env.int('UPLOAD_INTENT_EXPIRY_SECONDS', default=3600)
+UPLOAD_MAX_PROOF_IMAGE_BYTES = env.int('UPLOAD_MAX_PROOF_IMAGE_BYTES', default=10 * 1024 * 1024)
+UPLOAD_MAX_LECTURE_MEDIA_BYTES = env.int('UPLOAD_MAX_LECTURE_MEDIA_BYTES', default=2 * 1024 * 1024 * 1024)
+# Resumable chunked uploads (TeqwaCore.resumable); part files never live under MEDIA_ROOT
+RESUMABLE_UPLOAD_DIR = env('RESUMABLE_UPLOAD_DIR', default=str(BASE_DIR / 'tmp' / 'resumable_uploads'))
+RESUMABLE_UPLOAD_MAX_CHUNK_BYTES = env.int('RESUMABLE_UPLOAD_MAX_CHUNK_BYTES', default=16 * 1024 * 1024)
+RESUMABLE_UPLOAD_EXPIRY_SECONDS = env.int('RESUMABLE_UPLOAD_EXPIRY_SECONDS', default=24 * 3600)
+RESUMABLE_UPLOAD_LOCK_SECONDS = env.int('RESUMABLE_UPLOAD_LOCK_SECONDS', default=300)
+
+# Lecture full-text search (education.search): text search configuration on PostgreSQL
+LECTURE_SEARCH_CONFIG = env('LECTURE_SEARCH_CONFIG', default='english')
+
+# Uploaded base64 images are decoded into media storage (TeqwaCore.images)
+IMAGE_DATA_URL_MAX_BYTES = env.int('IMAGE_DATA_URL_MAX_BYTES', default=10 * 1024 * 1024)
+IMAGE_THUMBNAIL_SIZE = (480, 480)
+
+# Responsive variants written by the process_image_variants worker (TeqwaCore.variants)
+IMAGE_VARIANT_WIDTHS = tuple(env.list('IMAGE_VARIANT_WIDTHS', cast=int, default=[320, 640, 1280]))
+IMAGE_VARIANT_FORMATS = ('webp', 'jpeg')
+IMAGE_VARIANT_QUALITY = env.int('IMAGE_VARIANT_QUALITY', default=80)
+IMAGE_VARIANT_BATCH_SIZE = env.int('IMAGE_VARIANT_BATCH_SIZE', default=10)
+IMAGE_VARIANT_MAX_ATTEMPTS = env.int('IMAGE_VARIANT_MAX_ATTEMPTS', default=5)
+IMAGE_VARIANT_RETRY_BASE_SECONDS = env.int('IMAGE_VARIANT_RETRY_BASE_SECONDS', default=60)
+IMAGE_VARIANT_RETRY_MAX_SECONDS = env.int('IMAGE_VARIANT_RETRY_MAX_SECONDS', default=3600)
+IMAGE_VARIANT_LOCK_SECONDS = env.int('IMAGE_VARIANT_LOCK_SECONDS', default=600)
+
 if not DEBUG:
     # Production Storage Configuration
     STORAGES = {
@@ -274,7 +338,7 @@ REST_FRAMEWORK = {
     # Authentication
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'authentication.soft_auth.SoftJWTAuthentication',
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.soft_auth.CachedJWTAuthentication',
     ],
     
     # Permissions - default to IsAuthenticated, but can be overridden per view
@@ -353,6 +417,7 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
     'TOKEN_USER_CLASS': 'rest_framework_simplejwt.models.TokenUser',
+    'TOKEN_REFRESH_SERIALIZER': 'authentication.tokens.RoleTokenRefreshSerializer',
     'JTI_CLAIM': 'jti',
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
@@ -501,6 +566,18 @@ EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS', default=True)
 EMAIL_HOST_USER = env('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='noreply@teqwa.com')
+EMAIL_TIMEOUT = env.int('EMAIL_TIMEOUT', default=30)
+
+# Email outbox (authentication.outbox): requests queue emails, the
+# process_email_outbox worker delivers them
+EMAIL_OUTBOX_BATCH_SIZE = env.int('EMAIL_OUTBOX_BATCH_SIZE', default=50)
+EMAIL_OUTBOX_MAX_ATTEMPTS = env.int('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5)
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = env.int('EMAIL_OUTBOX_RETRY_BASE_SECONDS', default=60)
+EMAIL_OUTBOX_RETRY_MAX_SECONDS = env.int('EMAIL_OUTBOX_RETRY_MAX_SECONDS', default=3600)
+EMAIL_OUTBOX_LOCK_SECONDS = env.int('EMAIL_OUTBOX_LOCK_SECONDS', default=600)
+
+# Group admin alerts into one digest email every N minutes (0 = send each alert immediately)
+ADMIN_ALERT_DIGEST_MINUTES = env.int('ADMIN_ALERT_DIGEST_MINUTES', default=0)
 
 # Frontend URL for email links
 # MUST be set via environment variable in production
@@ -516,3 +593,23 @@ CHAPA_WEBHOOK_SECRET = env('CHAPA_WEBHOOK_SECRET', default='')
 CHAPA_API_URL = 'https://api.chapa.co/v1'
 WEBHOOK_URL = env('WEBHOOK_URL', default=None)
 
+# Chapa HTTP client: pooled keep-alive session, timeouts, verify retries and circuit breaker
+CHAPA_CONNECT_TIMEOUT = env.float('CHAPA_CONNECT_TIMEOUT', default=3.05)
+CHAPA_READ_TIMEOUT = env.float('CHAPA_READ_TIMEOUT', default=20)
+CHAPA_VERIFY_RETRIES = env.int('CHAPA_VERIFY_RETRIES', default=2)
+CHAPA_POOL_MAXSIZE = env.int('CHAPA_POOL_MAXSIZE', default=10)
+CHAPA_BREAKER_FAILURE_THRESHOLD = env.int('CHAPA_BREAKER_FAILURE_THRESHOLD', default=5)
+CHAPA_BREAKER_RESET_SECONDS = env.int('CHAPA_BREAKER_RESET_SECONDS', default=30)
+
+# Verify polling: one upstream Chapa call per tx_ref per interval, shared by concurrent polls
+PAYMENT_VERIFY_MIN_INTERVAL_SECONDS = env.int('PAYMENT_VERIFY_MIN_INTERVAL_SECONDS', default=5)
+PAYMENT_VERIFY_LOCK_SECONDS = env.int('PAYMENT_VERIFY_LOCK_SECONDS', default=30)
+PAYMENT_VERIFY_WAIT_SECONDS = env.int('PAYMENT_VERIFY_WAIT_SECONDS', default=5)
+
+# Chapa webhook worker (payments.services / process_payment_webhooks)
+PAYMENT_WEBHOOK_BATCH_SIZE = env.int('PAYMENT_WEBHOOK_BATCH_SIZE', default=20)
+PAYMENT_WEBHOOK_MAX_ATTEMPTS = env.int('PAYMENT_WEBHOOK_MAX_ATTEMPTS', default=8)
+PAYMENT_WEBHOOK_RETRY_BASE_SECONDS = env.int('PAYMENT_WEBHOOK_RETRY_BASE_SECONDS', default=30)
+PAYMENT_WEBHOOK_RETRY_MAX_SECONDS = env.int('PAYMENT_WEBHOOK_RETRY_MAX_SECONDS', default=1800)
+PAYMENT_WEBHOOK_LOCK_SECONDS = env.int('PAYMENT_WEBHOOK_LOCK_SECONDS', default=300)
+
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Donation, DonationCause
+from .models import Donation, DonationCause, DonationTotal, DonationDailyRollup
 
 
 @admin.register(DonationCause)
@@ -7,7 +7,7 @@ class DonationCauseAdmin(admin.ModelAdmin):
     list_display = ['title', 'target_amount', 'raised_amount', 'progress_percentage', 'status']
     list_filter = ['status', 'created_at']
     search_fields = ['title', 'description']
-    readonly_fields = ['progress_percentage', 'created_at', 'updated_at']
+    readonly_fields = ['raised_amount', 'progress_percentage', 'thumbnail', 'created_at', 'updated_at']
 
 
 @admin.register(Donation)
@@ -19,4 +19,17 @@ class DonationAdmin(admin.ModelAdmin):
 
     def has_proof(self, obj):
         return bool(obj.proof_image)
-    has_proof.boolean = True
\ No newline at end of file
+    has_proof.boolean = True
+
+
+@admin.register(DonationTotal)
+class DonationTotalAdmin(admin.ModelAdmin):
+    list_display = ['status', 'count', 'amount', 'updated_at']
+    readonly_fields = ['status', 'count', 'amount', 'updated_at']
+
+
+@admin.register(DonationDailyRollup)
+class DonationDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ['day', 'cause', 'method', 'status', 'currency', 'count', 'amount']
+    list_filter = ['status', 'method', 'currency', 'day']
+    readonly_fields = ['day', 'cause', 'method', 'status', 'currency', 'count', 'amount']
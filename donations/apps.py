@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class DonationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'donations'
\ No newline at end of file
+    name = 'donations'
+
+    def ready(self):
+        import donations.signals
+        import donations.fulfilment
@@ -0,0 +1,24 @@
+from payments.fulfilment import register_handler
+
+
+def fulfil_donation(donation, transaction):
+    """Mark a paid donation completed and queue the confirmation emails"""
+    donation.status = 'completed'
+    donation.save()
+
+    try:
+        from authentication.utils import (
+            send_donation_confirmation_email,
+            send_new_donation_alert,
+            send_large_donation_alert
+        )
+        user = donation.user if donation.user else None
+        if user:
+            send_donation_confirmation_email(donation, user)
+            send_new_donation_alert(donation, user)
+            send_large_donation_alert(donation, user, threshold=10000)
+    except Exception as e:
+        print(f"Error sending donation email notifications: {e}")
+
+
+register_handler('donations.Donation', fulfil_donation)
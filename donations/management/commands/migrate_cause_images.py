@@ -0,0 +1,46 @@
+"""
+Move base64 data URLs out of DonationCause.image into media storage.
+
+Each matching cause is decoded into image_file (filesystem or S3, whichever
+default storage is configured), gets a thumbnail, and has its image column
+cleared. Causes that already have an image_file but no thumbnail get one too.
+Rows are processed one at a time, so the base64 text of only one cause is in
+memory at once. Safe to re-run.
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from donations.models import DonationCause
+
+
+class Command(BaseCommand):
+    help = 'Decode base64 donation cause images into media storage and generate thumbnails'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many causes would be converted')
+
+    def handle(self, *args, **options):
+        pending = DonationCause.objects.filter(
+            Q(image__startswith='data:') |
+            (Q(image_file__isnull=False) & ~Q(image_file='') & (Q(thumbnail__isnull=True) | Q(thumbnail='')))
+        )
+        ids = list(pending.order_by('id').values_list('id', flat=True))
+        if options['dry_run']:
+            self.stdout.write(f'{len(ids)} donation cause(s) would be converted')
+            return
+
+        converted = failed = 0
+        for cause_id in ids:
+            cause = DonationCause.objects.filter(pk=cause_id).first()
+            if cause is None:
+                continue
+            try:
+                cause.save(update_fields=['image', 'image_file', 'thumbnail'])
+            except Exception as e:
+                self.stderr.write(f'Could not convert image of cause {cause_id} ({cause.title}): {e}')
+                failed += 1
+                continue
+            converted += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Converted {converted} donation cause image(s), {failed} failed'))
@@ -0,0 +1,40 @@
+"""
+Recompute the donation rollups from the donations table: cause raised
+amounts, per-status DonationTotal rows and the DonationDailyRollup time
+series. The rollups are normally maintained incrementally; run this after
+bulk imports, manual SQL edits or to repair drift.
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from donations.models import DonationTotal
+from donations.rollups import rebuild_rollups, rebuild_daily_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild donation cause raised amounts, per-status totals and daily rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=str, default=None,
+                            help='Only rebuild daily rollups from this date (YYYY-MM-DD)')
+        parser.add_argument('--daily-only', action='store_true',
+                            help='Skip cause raised amounts and per-status totals')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('--since must be a date in YYYY-MM-DD format')
+
+        if not options['daily_only']:
+            causes = rebuild_rollups()
+            self.stdout.write(self.style.SUCCESS(f'Recomputed raised_amount for {causes} cause(s)'))
+            for total in DonationTotal.objects.order_by('status'):
+                self.stdout.write(f'  {total.status}: {total.count} donation(s), {total.amount}')
+
+        rows = rebuild_daily_rollups(since=since)
+        scope = f' since {since}' if since else ''
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} daily rollup row(s){scope}'))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:55
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_rollups(apps, schema_editor):
+    Donation = apps.get_model('donations', 'Donation')
+    DonationCause = apps.get_model('donations', 'DonationCause')
+    DonationTotal = apps.get_model('donations', 'DonationTotal')
+
+    completed = Donation.objects.filter(
+        cause=OuterRef('pk'), status='completed'
+    ).order_by().values('cause').annotate(total=Sum('amount')).values('total')
+    DonationCause.objects.update(
+        raised_amount=Coalesce(Subquery(completed), Value(Decimal('0')), output_field=DecimalField())
+    )
+
+    totals = Donation.objects.order_by().values('status').annotate(count=Count('id'), amount=Sum('amount'))
+    for row in totals:
+        DonationTotal.objects.create(status=row['status'], count=row['count'], amount=row['amount'] or 0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonationTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('failed', 'Failed'), ('refunded', 'Refunded')], max_length=20, unique=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_rollups(apps, schema_editor):
+    Donation = apps.get_model('donations', 'Donation')
+    DonationDailyRollup = apps.get_model('donations', 'DonationDailyRollup')
+    grouped = (
+        Donation.objects.order_by()
+        .annotate(day=TruncDate('created_at'))
+        .values('day', 'cause_id', 'method', 'status', 'currency')
+        .annotate(count=Count('id'), amount=Sum('amount'))
+    )
+    DonationDailyRollup.objects.bulk_create([
+        DonationDailyRollup(
+            day=row['day'], cause_id=row['cause_id'], method=row['method'] or '',
+            status=row['status'], currency=row['currency'] or '',
+            count=row['count'], amount=row['amount'] or 0,
+        )
+        for row in grouped.iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0002_donation_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonationDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('method', models.CharField(choices=[('card', 'Credit Card (Chapa)'), ('manual_qr', 'Manual Transfer / QR Code'), ('paypal', 'PayPal'), ('bank_transfer', 'Bank Transfer'), ('cash', 'Cash')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('failed', 'Failed'), ('refunded', 'Refunded')], max_length=20)),
+                ('currency', models.CharField(max_length=3)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cause', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='donations.donationcause')),
+            ],
+            options={
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['status', 'day'], name='donation_daily_status_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'cause', 'method', 'status', 'currency'), name='donation_daily_rollup_key')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0003_donationdailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donationcause',
+            name='image_file',
+            field=models.ImageField(blank=True, help_text='Upload an image file', null=True, upload_to='donations/causes/'),
+        ),
+        migrations.AddField(
+            model_name='donationcause',
+            name='thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='donations/causes/thumbnails/'),
+        ),
+        migrations.AlterField(
+            model_name='donationcause',
+            name='image',
+            field=models.TextField(blank=True, help_text='External image URL or media path (base64 data URLs are moved to image_file on save)', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0004_cause_image_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donation',
+            name='proof_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
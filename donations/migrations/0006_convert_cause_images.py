@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+def convert_cause_images(apps, schema_editor):
+    """Decode base64 cause images into image_file with a thumbnail, as DonationCause.save() does"""
+    from TeqwaCore.images import decode_data_url, make_thumbnail
+
+    DonationCause = apps.get_model('donations', 'DonationCause')
+    ids = list(DonationCause.objects.filter(image__startswith='data:').order_by('id').values_list('id', flat=True))
+    for cause_id in ids:
+        # One row at a time, so only one cause's base64 text is in memory
+        cause = DonationCause.objects.get(pk=cause_id)
+        try:
+            image_file = decode_data_url(cause.image, name_prefix='cause')
+            cause.image_file.save(image_file.name, image_file, save=False)
+            thumbnail = make_thumbnail(cause.image_file)
+            cause.thumbnail.save(thumbnail.name, thumbnail, save=False)
+        except Exception as e:
+            # Left as is: the API keeps serving the stored value and
+            # migrate_cause_images can retry it
+            print(f"\n  Could not convert image of donation cause {cause_id}: {e}")
+            continue
+        cause.image = ''
+        cause.save(update_fields=['image', 'image_file', 'thumbnail'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0005_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(convert_cause_images, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from TeqwaCore.images import decode_data_url, is_data_url, make_thumbnail
+
 User = get_user_model()
 
 
@@ -14,17 +16,57 @@ class DonationCause(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
     target_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    # Sum of completed donations, maintained by donations.rollups
     raised_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     currency = models.CharField(max_length=3, default='ETB')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
     end_date = models.DateTimeField(null=True, blank=True)
-    image = models.TextField(blank=True, null=True, help_text='Image URL, file path, or base64 data URL')
+    image = models.TextField(blank=True, null=True, help_text='External image URL or media path (base64 data URLs are moved to image_file on save)')
+    image_file = models.ImageField(upload_to='donations/causes/', blank=True, null=True, help_text='Upload an image file')
+    thumbnail = models.ImageField(upload_to='donations/causes/thumbnails/', blank=True, null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'image_file' in instance.__dict__:
+            instance._loaded_image_file = instance.__dict__['image_file']
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'image', 'image_file'} & set(update_fields):
+            self.store_images()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'image', 'image_file', 'thumbnail'}
+        super().save(*args, **kwargs)
+        self._loaded_image_file = self.image_file.name if self.image_file else None
+
+    def store_images(self):
+        """Move a base64 `image` into image_file and keep the thumbnail in step with it"""
+        if is_data_url(self.image):
+            self.image_file = decode_data_url(self.image, name_prefix='cause')
+            self.image = ''
+
+        replaced = hasattr(self, '_loaded_image_file') and self.image_file.name != self._loaded_image_file
+        if self.image_file and (not self.thumbnail or replaced):
+            thumbnail = make_thumbnail(self.image_file)
+            self.thumbnail.save(thumbnail.name, thumbnail, save=False)
+        elif not self.image_file and self.thumbnail:
+            self.thumbnail = None
+
+    def get_image_url(self):
+        """Return the image URL - either from the stored file or the external URL/path"""
+        if self.image_file:
+            return self.image_file.url
+        if self.image and not is_data_url(self.image):
+            return self.image
+        return None
+
     @property
     def progress_percentage(self):
         if self.target_amount > 0:
@@ -57,6 +99,8 @@ class Donation(models.Model):
     cause = models.ForeignKey(DonationCause, on_delete=models.CASCADE, related_name='donations')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     proof_image = models.ImageField(upload_to='donations/proofs/', blank=True, null=True, help_text='Payment proof for manual transfers')
+    # Resized copies written by the process_image_variants worker (TeqwaCore.variants)
+    proof_image_variants = models.JSONField(default=dict, blank=True, editable=False)
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -65,4 +109,41 @@ class Donation(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"{self.donor_name} - {self.amount} ETB"
\ No newline at end of file
+        return f"{self.donor_name} - {self.amount} ETB"
+
+
+class DonationTotal(models.Model):
+    """Running count and sum of donations per status, maintained by donations.rollups"""
+    status = models.CharField(max_length=20, choices=Donation.STATUS_CHOICES, unique=True)
+    count = models.PositiveIntegerField(default=0)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.status}: {self.count} donations, {self.amount}"
+
+
+class DonationDailyRollup(models.Model):
+    """Donations per day, cause, method, status and currency, maintained by donations.rollups"""
+    day = models.DateField()
+    cause = models.ForeignKey(DonationCause, on_delete=models.CASCADE, related_name='daily_rollups')
+    method = models.CharField(max_length=20, choices=Donation.METHOD_CHOICES)
+    status = models.CharField(max_length=20, choices=Donation.STATUS_CHOICES)
+    currency = models.CharField(max_length=3)
+    count = models.PositiveIntegerField(default=0)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ['day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'cause', 'method', 'status', 'currency'],
+                name='donation_daily_rollup_key',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'day'], name='donation_daily_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.cause_id} {self.method} {self.status}: {self.count}, {self.amount} {self.currency}"
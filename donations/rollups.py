@@ -0,0 +1,232 @@
+"""
+Incremental donation rollups.
+
+Three rollups are adjusted with F() expressions whenever a donation is
+created, changes status, amount, cause or method, or is deleted:
+
+* DonationCause.raised_amount - completed donations per cause
+* DonationTotal - count and sum per status
+* DonationDailyRollup - count and sum per (day, cause, method, status, currency)
+
+The updates run in the same transaction as the donation save, so a payment
+fulfilment that rolls back also rolls back its rollups.
+rebuild_donation_rollups recomputes everything from the donations table.
+"""
+from collections import namedtuple
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, TruncDate
+from django.db.models.signals import post_init, pre_save, post_save, pre_delete, post_delete
+from django.utils import timezone
+
+from TeqwaCore.cache import invalidate_namespace
+from .models import Donation, DonationCause, DonationDailyRollup, DonationTotal
+
+STATE_ATTR = '_rollup_state'
+ZERO = Decimal('0')
+
+# What a donation contributes to the rollups
+DonationState = namedtuple('DonationState', ['status', 'cause_id', 'amount', 'method', 'currency', 'day'])
+EMPTY_STATE = DonationState(None, None, ZERO, None, None, None)
+TRACKED_FIELDS = ('status', 'cause_id', 'amount', 'method', 'currency', 'created_at')
+
+
+def _day(created_at):
+    return timezone.localdate(created_at) if created_at else None
+
+
+def _state(instance, fallback=EMPTY_STATE):
+    """Rollup state of an instance; deferred fields keep their fallback value"""
+    values = instance.__dict__
+    return DonationState(
+        status=values.get('status', fallback.status),
+        cause_id=values.get('cause_id', fallback.cause_id),
+        amount=Decimal(str(values['amount'] or 0)) if 'amount' in values else fallback.amount,
+        method=values.get('method', fallback.method),
+        currency=values.get('currency', fallback.currency),
+        day=_day(values['created_at']) if 'created_at' in values else fallback.day,
+    )
+
+
+def _bump(queryset, create, changes, count):
+    """
+    Apply F() changes to a rollup row, creating it first if it does not exist.
+    A missing row is never created for a decrement: there is nothing to take
+    away, and the cause may be in the middle of a cascade delete.
+    """
+    if not queryset.update(**changes) and count > 0:
+        create()
+        queryset.update(**changes)
+
+
+def _counter_changes(count, amount):
+    return {
+        'count': Greatest(F('count') + count, Value(0)),
+        'amount': Greatest(F('amount') + amount, Value(ZERO)),
+    }
+
+
+def bump_total(status, count, amount):
+    """Add count/amount to the DonationTotal row of a status"""
+    if not status:
+        return
+    _bump(
+        DonationTotal.objects.filter(status=status),
+        lambda: DonationTotal.objects.get_or_create(status=status),
+        _counter_changes(count, amount),
+        count,
+    )
+
+
+def bump_daily(state, count, amount):
+    """Add count/amount to the daily rollup row a donation state belongs to"""
+    if not state.status or not state.cause_id or not state.day:
+        return
+    key = {
+        'day': state.day,
+        'cause_id': state.cause_id,
+        'method': state.method or '',
+        'status': state.status,
+        'currency': state.currency or '',
+    }
+    _bump(
+        DonationDailyRollup.objects.filter(**key),
+        lambda: DonationDailyRollup.objects.get_or_create(**key),
+        _counter_changes(count, amount),
+        count,
+    )
+
+
+def bump_raised(cause_id, amount):
+    """Add amount to a cause's raised_amount"""
+    if not cause_id or not amount:
+        return
+    DonationCause.objects.filter(pk=cause_id).update(
+        raised_amount=Greatest(F('raised_amount') + amount, Value(ZERO))
+    )
+    # Queryset updates send no signals; refresh the cached cause listings ourselves
+    transaction.on_commit(lambda: invalidate_namespace('donation_causes', 'announcements'))
+
+
+def apply_change(old, new):
+    """Move a donation's contribution from its old state to the new one"""
+    if old == new:
+        return
+
+    if (old.status, old.amount) != (new.status, new.amount):
+        bump_total(old.status, -1, -old.amount)
+        bump_total(new.status, 1, new.amount)
+
+    bump_daily(old, -1, -old.amount)
+    bump_daily(new, 1, new.amount)
+
+    if old.status == 'completed':
+        bump_raised(old.cause_id, -old.amount)
+    if new.status == 'completed':
+        bump_raised(new.cause_id, new.amount)
+
+
+def remember_state(sender, instance, **kwargs):
+    if instance.pk and all(f in instance.__dict__ for f in TRACKED_FIELDS):
+        instance.__dict__[STATE_ATTR] = _state(instance)
+
+
+def load_missing_state(sender, instance, raw=False, **kwargs):
+    if raw or STATE_ATTR in instance.__dict__ or instance._state.adding or instance.pk is None:
+        return
+    row = Donation.objects.filter(pk=instance.pk).values(*TRACKED_FIELDS).first()
+    if row:
+        instance.__dict__[STATE_ATTR] = DonationState(
+            row['status'], row['cause_id'], row['amount'], row['method'], row['currency'], _day(row['created_at'])
+        )
+
+
+def apply_save(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    old = EMPTY_STATE if created else instance.__dict__.get(STATE_ATTR, EMPTY_STATE)
+    new = _state(instance, fallback=old)
+    apply_change(old, new)
+    instance.__dict__[STATE_ATTR] = new
+
+
+def apply_delete(sender, instance, **kwargs):
+    apply_change(instance.__dict__.get(STATE_ATTR, _state(instance)), EMPTY_STATE)
+
+
+def get_totals(*statuses):
+    """
+    Running DonationTotal rows for the given statuses (zero rows when missing).
+    Returns a single row for one status, otherwise a dict keyed by status.
+    """
+    rows = {row.status: row for row in DonationTotal.objects.filter(status__in=statuses)}
+    for status_name in statuses:
+        rows.setdefault(status_name, DonationTotal(status=status_name))
+    if len(statuses) == 1:
+        return rows[statuses[0]]
+    return rows
+
+
+def connect_rollups():
+    uid = 'donation-rollups'
+    post_init.connect(remember_state, sender=Donation, dispatch_uid=f'{uid}-init')
+    pre_save.connect(load_missing_state, sender=Donation, dispatch_uid=f'{uid}-pre-save')
+    post_save.connect(apply_save, sender=Donation, dispatch_uid=f'{uid}-save')
+    pre_delete.connect(load_missing_state, sender=Donation, dispatch_uid=f'{uid}-pre-delete')
+    post_delete.connect(apply_delete, sender=Donation, dispatch_uid=f'{uid}-delete')
+
+
+def rebuild_rollups():
+    """Recompute raised_amount for every cause and the per-status totals"""
+    completed = Donation.objects.filter(
+        cause=OuterRef('pk'), status='completed'
+    ).order_by().values('cause').annotate(total=Sum('amount')).values('total')
+    causes = DonationCause.objects.update(
+        raised_amount=Coalesce(Subquery(completed), Value(ZERO), output_field=DecimalField())
+    )
+
+    totals = {
+        row['status']: row
+        for row in Donation.objects.order_by().values('status').annotate(count=Count('id'), amount=Sum('amount'))
+    }
+    for status, _ in Donation.STATUS_CHOICES:
+        row = totals.get(status, {})
+        DonationTotal.objects.update_or_create(
+            status=status,
+            defaults={'count': row.get('count') or 0, 'amount': row.get('amount') or ZERO},
+        )
+    invalidate_namespace('donation_causes', 'announcements')
+    return causes
+
+
+def rebuild_daily_rollups(since=None, batch_size=1000):
+    """
+    Recompute DonationDailyRollup from the donations table, optionally only
+    for days on or after `since`. Returns the number of rollup rows written.
+    """
+    donations = Donation.objects.order_by()
+    rollups = DonationDailyRollup.objects.all()
+    if since:
+        donations = donations.filter(created_at__date__gte=since)
+        rollups = rollups.filter(day__gte=since)
+
+    grouped = (
+        donations
+        .annotate(day=TruncDate('created_at'))
+        .values('day', 'cause_id', 'method', 'status', 'currency')
+        .annotate(count=Count('id'), amount=Sum('amount'))
+    )
+    rows = [
+        DonationDailyRollup(
+            day=row['day'], cause_id=row['cause_id'], method=row['method'] or '',
+            status=row['status'], currency=row['currency'] or '',
+            count=row['count'], amount=row['amount'] or ZERO,
+        )
+        for row in grouped.iterator()
+    ]
+    with transaction.atomic():
+        rollups.delete()
+        DonationDailyRollup.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
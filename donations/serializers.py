@@ -1,34 +1,60 @@
 from rest_framework import serializers
 from django.conf import settings
+from django.core.files.base import ContentFile
+
+from TeqwaCore.images import absolute_media_url, decode_data_url, is_data_url
+from TeqwaCore.uploads import AttachUploadsMixin, UploadIntentField
+from TeqwaCore.variants import ImageVariantsField
 from .models import Donation, DonationCause
 
 
 class DonationCauseSerializer(serializers.ModelSerializer):
     progress_percentage = serializers.ReadOnlyField()
+    # Accepts an uploaded file; responses only ever carry URLs in `image`/`thumbnail`
+    image_file = serializers.ImageField(write_only=True, required=False, allow_null=True)
+    thumbnail = serializers.SerializerMethodField()
 
     class Meta:
         model = DonationCause
         fields = ['id', 'title', 'description', 'target_amount', 'raised_amount', 
-                 'currency', 'status', 'end_date', 'image', 'progress_percentage', 
-                 'created_at', 'updated_at']
+                 'currency', 'status', 'end_date', 'image', 'image_file', 'thumbnail',
+                 'progress_percentage', 'created_at', 'updated_at']
         read_only_fields = ['id', 'raised_amount', 'created_at', 'updated_at']
 
+    def validate_image(self, value):
+        """Base64 data URLs are decoded here and stored as a file by validate()"""
+        if is_data_url(value):
+            try:
+                return decode_data_url(value, name_prefix='cause')
+            except ValueError as e:
+                raise serializers.ValidationError(str(e))
+        return value
+
+    def validate(self, attrs):
+        if isinstance(attrs.get('image'), ContentFile):
+            attrs['image_file'] = attrs['image']
+            attrs['image'] = ''
+        elif attrs.get('image_file'):
+            attrs['image'] = ''
+        return attrs
+
     def to_representation(self, instance):
         """Override to convert image path to full URL"""
         representation = super().to_representation(instance)
-        
-        # Convert image path to full URL
-        if representation.get('image'):
-            image_url = self._get_full_image_url(instance.image)
-            # Only set if we got a valid URL, otherwise keep None
-            representation['image'] = image_url if image_url else None
+        request = self.context.get('request')
+        if instance.image_file:
+            representation['image'] = absolute_media_url(instance.image_file, request)
         else:
-            representation['image'] = None
-            
+            representation['image'] = self._get_full_image_url(instance.image)
         return representation
+
+    def get_thumbnail(self, obj):
+        if obj.thumbnail:
+            return absolute_media_url(obj.thumbnail, self.context.get('request'))
+        return None
     
     def _get_full_image_url(self, image_path):
-        """Return full URL for image if it exists"""
+        """Return full URL for an external URL or media path"""
         if not image_path:
             return None
         
@@ -36,19 +62,9 @@ class DonationCauseSerializer(serializers.ModelSerializer):
         image_path = str(image_path).strip()
         if not image_path:
             return None
-        
-        # If it's a data URL (base64 encoded image), validate and return as-is
-        if image_path.startswith('data:'):
-            # Basic validation: check if it looks like a valid data URL
-            # Format: data:[<mediatype>][;base64],<data>
-            if ';base64,' in image_path or image_path.startswith('data:image/'):
-                # Check if data URL appears truncated (common issue with CharField max_length limits)
-                # Base64 data URLs should end with valid base64 characters (not with incomplete strings)
-                # This is a basic check - full validation would be more complex
-                return image_path
-            else:
-                # Invalid data URL format, return None to show fallback
-                return None
+        if is_data_url(image_path):
+            # Not converted into image_file yet (see migrate_cause_images); serve it as stored
+            return image_path
         
         # If already a full URL, return as is
         if image_path.startswith('http://') or image_path.startswith('https://'):
@@ -80,13 +96,16 @@ class DonationCauseSerializer(serializers.ModelSerializer):
             return f"{base_url.rstrip('/')}{media_url.rstrip('/')}/{image_path.lstrip('/')}"
 
 
-class DonationSerializer(serializers.ModelSerializer):
+class DonationSerializer(AttachUploadsMixin, serializers.ModelSerializer):
     cause_title = serializers.CharField(source='cause.title', read_only=True)
+    proof_image_variants = ImageVariantsField('proof_image')
+    proof_upload = UploadIntentField('proof_image', source='proof_image')
 
     class Meta:
         model = Donation
         fields = ['id', 'donor_name', 'email', 'amount', 'currency', 'method', 
-                 'message', 'cause', 'cause_title', 'status', 'proof_image', 'created_at', 'updated_at']
+                 'message', 'cause', 'cause_title', 'status', 'proof_image', 'proof_image_variants', 'proof_upload',
+                 'created_at', 'updated_at']
         read_only_fields = ['id', 'status', 'created_at', 'updated_at']
 
     def create(self, validated_data):
@@ -0,0 +1,4 @@
+from .rollups import connect_rollups
+
+# Keep DonationCause.raised_amount and DonationTotal in sync with donations
+connect_rollups()
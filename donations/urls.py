@@ -8,4 +8,5 @@ urlpatterns = [
     path('causes/create/', views.create_cause, name='create_cause'),
     path('causes/<int:cause_id>/', views.cause_detail, name='cause_detail'),
     path('stats/', views.donation_stats, name='donation_stats'),
+    path('stats/timeseries/', views.donation_timeseries, name='donation_timeseries'),
 ]
\ No newline at end of file
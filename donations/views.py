@@ -2,9 +2,14 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from datetime import date, timedelta
 from django.db.models import Sum
-from .models import Donation, DonationCause
+from django.utils import timezone
+from .models import Donation, DonationCause, DonationDailyRollup
+from .rollups import get_totals
 from .serializers import DonationSerializer, DonationCauseSerializer
+from TeqwaCore.cache import cache_public_response
+from TeqwaCore.pagination import paginated_response
 from authentication.utils import (
     send_donation_confirmation_email,
     send_new_donation_alert,
@@ -17,23 +22,20 @@ from authentication.utils import (
 def donation_list(request):
     """List donations (Admin only for full list, public for stats)"""
     if request.user.is_authenticated and request.user.role == 'admin':
-        donations = Donation.objects.all()
-        serializer = DonationSerializer(donations, many=True)
-        return Response({
-            'message': 'Donations retrieved successfully',
-            'data': serializer.data,
-            'count': donations.count()
-        })
+        donations = Donation.objects.select_related('cause')
+        return paginated_response(
+            request, donations, DonationSerializer,
+            message='Donations retrieved successfully'
+        )
     else:
-        # Public stats only
-        completed_donations = Donation.objects.filter(status='completed')
-        total_amount = completed_donations.aggregate(Sum('amount'))['amount__sum'] or 0
+        # Public stats only, read from the running totals
+        completed = get_totals('completed')
         
         return Response({
             'message': 'Donation statistics retrieved successfully',
             'data': {
-                'total_amount': float(total_amount),
-                'total_donations': completed_donations.count(),
+                'total_amount': float(completed.amount),
+                'total_donations': completed.count,
                 'currency': 'USD'
             }
         })
@@ -90,6 +92,7 @@ def create_donation(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_public_response('donation_causes')
 def donation_causes(request):
     """List donation causes"""
     active_only = request.GET.get('active', '').lower() == 'true'
@@ -134,7 +137,7 @@ def cause_detail(request, cause_id):
     })
 
 
-from accounts.models import UserActivity
+from accounts.activity import log_activity
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -150,10 +153,9 @@ def create_cause(request):
         cause = serializer.save()
         
         # Log activity
-        UserActivity.objects.create(
-            user=request.user,
-            activity_type='admin_action',
-            description=f'Created new donation cause: {cause.title}',
+        log_activity(
+            request.user, 'admin_action', f'Created new donation cause: {cause.title}',
+            source='donation_cause', source_id=cause.id, event_key='created',
             metadata={'source': 'donations', 'id': cause.id}
         )
         
@@ -169,9 +171,9 @@ def create_cause(request):
 @permission_classes([AllowAny])
 def donation_stats(request):
     """Get donation statistics (Public safe stats, full details for Admin/Staff)"""
-    completed_donations = Donation.objects.filter(status='completed')
-    total_completed = completed_donations.aggregate(Sum('amount'))['amount__sum'] or 0
-    total_completed_count = completed_donations.count()
+    totals = get_totals('completed', 'pending')
+    total_completed = totals['completed'].amount
+    total_completed_count = totals['completed'].count
     
     # Base public stats
     stats = {
@@ -182,11 +184,10 @@ def donation_stats(request):
     
     # Add sensitive stats only for admins/staff
     if request.user.is_authenticated and hasattr(request.user, 'role') and request.user.role in ['admin', 'staff']:
-        pending_donations = Donation.objects.filter(status='pending')
-        total_pending = pending_donations.aggregate(Sum('amount'))['amount__sum'] or 0
+        total_pending = totals['pending'].amount
         
         stats.update({
-            'total_pending': pending_donations.count(),
+            'total_pending': totals['pending'].count,
             'total_amount_pending': float(total_pending),
             'average_donation': float(total_completed) / total_completed_count if total_completed_count > 0 else 0,
         })
@@ -194,4 +195,94 @@ def donation_stats(request):
     return Response({
         'message': 'Donation statistics retrieved successfully',
         'data': stats
-    })
\ No newline at end of file
+    })
+
+
+TIMESERIES_GROUPS = {
+    'cause': 'cause_id',
+    'method': 'method',
+    'status': 'status',
+    'currency': 'currency',
+}
+TIMESERIES_MAX_DAYS = 366
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def donation_timeseries(request):
+    """Donations per day from the daily rollups (Admin/Staff only)"""
+    if request.user.role not in ['admin', 'staff']:
+        return Response({
+            'error': 'Permission denied'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        end = date.fromisoformat(request.GET['end']) if request.GET.get('end') else timezone.localdate()
+        start = date.fromisoformat(request.GET['start']) if request.GET.get('start') else end - timedelta(days=29)
+    except ValueError:
+        return Response({
+            'error': 'start and end must be dates in YYYY-MM-DD format'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if start > end or (end - start).days >= TIMESERIES_MAX_DAYS:
+        return Response({
+            'error': f'Date range must be between 1 and {TIMESERIES_MAX_DAYS} days'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    group_by = request.GET.get('group_by', '')
+    if group_by and group_by not in TIMESERIES_GROUPS:
+        return Response({
+            'error': f'group_by must be one of: {", ".join(TIMESERIES_GROUPS)}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    rollups = DonationDailyRollup.objects.filter(day__gte=start, day__lte=end)
+    status_filter = request.GET.get('status', 'completed')
+    if status_filter != 'all':
+        rollups = rollups.filter(status=status_filter)
+    if request.GET.get('cause'):
+        try:
+            cause_id = int(request.GET['cause'])
+        except ValueError:
+            return Response({
+                'error': 'cause must be a cause id'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        rollups = rollups.filter(cause_id=cause_id)
+    if request.GET.get('method'):
+        rollups = rollups.filter(method=request.GET['method'])
+    if request.GET.get('currency'):
+        rollups = rollups.filter(currency=request.GET['currency'])
+    
+    group_fields = ['day'] + ([TIMESERIES_GROUPS[group_by]] if group_by else [])
+    rows = rollups.order_by(*group_fields).values(*group_fields).annotate(
+        total_count=Sum('count'), total_amount=Sum('amount')
+    )
+    
+    series = []
+    for row in rows:
+        point = {
+            'day': row['day'].isoformat(),
+            'count': row['total_count'],
+            'amount': float(row['total_amount']),
+        }
+        if group_by:
+            point[group_by] = row[TIMESERIES_GROUPS[group_by]]
+        series.append(point)
+    
+    if not group_by:
+        # Fill days without donations so charts get a continuous axis
+        by_day = {point['day']: point for point in series}
+        series = [
+            by_day.get(day.isoformat(), {'day': day.isoformat(), 'count': 0, 'amount': 0.0})
+            for day in (start + timedelta(days=offset) for offset in range((end - start).days + 1))
+        ]
+    
+    return Response({
+        'message': 'Donation time series retrieved successfully',
+        'data': series,
+        'count': len(series),
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'totals': {
+            'count': sum(point['count'] for point in series),
+            'amount': sum(point['amount'] for point in series),
+        }
+    })
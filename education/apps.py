@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class EducationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'education'
\ No newline at end of file
+    name = 'education'
+
+    def ready(self):
+        import education.signals
+        import education.fulfilment
@@ -0,0 +1,40 @@
+import logging
+
+from authentication.utils import send_admin_alert_email
+from payments.fulfilment import register_handler
+
+logger = logging.getLogger(__name__)
+
+
+def fulfil_enrollment(enrollment, transaction):
+    """Confirm a paid enrollment if its course still has a seat; otherwise alert the admins"""
+    previous_status = enrollment.status
+    enrollment.status = 'confirmed'
+    enrollment.payment_status = 'paid'
+    if not enrollment.take_seat():
+        enrollment.status = previous_status
+        _alert_paid_without_seat(enrollment, transaction)
+    enrollment.save()
+
+
+def _alert_paid_without_seat(enrollment, transaction):
+    target = enrollment.course or enrollment.service
+    logger.warning(
+        "Enrollment %s was paid (transaction %s) but %s is full; left %s",
+        enrollment.pk, transaction.tx_ref if transaction else None, target, enrollment.status,
+    )
+    send_admin_alert_email(
+        subject_text="Paid Enrollment Without a Seat",
+        message_text=f"{enrollment.user.get_full_name() or enrollment.user.email} paid for {target.title}, "
+                     f"which is full. The enrollment was left {enrollment.status}; confirm or refund it.",
+        event_type="enrollment_paid_full",
+        details={
+            "Enrollment": enrollment.pk,
+            "Course": target.title,
+            "User": enrollment.user.email,
+            "Transaction": transaction.tx_ref if transaction else 'N/A',
+        }
+    )
+
+
+register_handler('education.ServiceEnrollment', fulfil_enrollment)
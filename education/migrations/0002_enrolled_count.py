@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:47
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_enrolled_count(apps, schema_editor):
+    ServiceEnrollment = apps.get_model('education', 'ServiceEnrollment')
+    for model_name, parent_field in [('Course', 'course'), ('EducationalService', 'service')]:
+        model = apps.get_model('education', model_name)
+        confirmed = ServiceEnrollment.objects.filter(
+            **{parent_field: OuterRef('pk'), 'status': 'confirmed'}
+        ).order_by().values(parent_field).annotate(total=Count('pk')).values('total')
+        model.objects.update(enrolled_count=Coalesce(Subquery(confirmed), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='enrolled_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='educationalservice',
+            name='enrolled_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_enrolled_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0002_enrolled_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lecture',
+            name='thumbnail_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='serviceenrollment',
+            name='proof_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:09
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+# PostgreSQL only: SQLite keeps the column but never fills it (education.search
+# falls back to icontains there)
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    config = getattr(settings, 'LECTURE_SEARCH_CONFIG', 'english')
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS lecture_search_vector_idx ON education_lecture USING gin (search_vector)'
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS lecture_title_trgm_idx ON education_lecture USING gin (title gin_trgm_ops)'
+    )
+    schema_editor.execute(
+        """
+        UPDATE education_lecture AS l SET search_vector =
+            setweight(to_tsvector(%(config)s::regconfig, coalesce(l.title, '')), 'A') ||
+            setweight(to_tsvector(%(config)s::regconfig, coalesce(l.subject, '')), 'B') ||
+            setweight(to_tsvector(%(config)s::regconfig,
+                                  coalesce(u.first_name, '') || ' ' || coalesce(u.last_name, '')), 'B') ||
+            setweight(to_tsvector(%(config)s::regconfig, coalesce(l.description, '')), 'C')
+        FROM authentication_user AS u
+        WHERE u.id = l.instructor_id
+        """,
+        {'config': config},
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS lecture_title_trgm_idx')
+    schema_editor.execute('DROP INDEX IF EXISTS lecture_search_vector_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0003_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lecture',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
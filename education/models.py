@@ -1,3 +1,4 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.contrib.auth import get_user_model
 
@@ -47,6 +48,8 @@ class EducationalService(models.Model):
     schedule = models.CharField(max_length=200)
     duration = models.CharField(max_length=100)
     capacity = models.PositiveIntegerField()
+    # Confirmed enrollments, maintained by TeqwaCore.counters (see education/signals.py)
+    enrolled_count = models.PositiveIntegerField(default=0, editable=False)
     level = models.CharField(max_length=20, choices=LEVEL_CHOICES)
     age_group = models.CharField(max_length=20, choices=AGE_GROUP_CHOICES)
     fee = models.DecimalField(max_digits=8, decimal_places=2, default=0)
@@ -63,10 +66,6 @@ class EducationalService(models.Model):
     def __str__(self):
         return f"{self.title} - {self.get_service_type_display()}"
 
-    @property
-    def enrolled_count(self):
-        return self.enrollments.filter(status='confirmed').count()
-
 
 class Course(models.Model):
     """Course model - multiple courses can belong to one service"""
@@ -77,6 +76,8 @@ class Course(models.Model):
     schedule = models.CharField(max_length=200)
     duration = models.CharField(max_length=100)
     capacity = models.PositiveIntegerField()
+    # Confirmed enrollments, maintained by TeqwaCore.counters (see education/signals.py)
+    enrolled_count = models.PositiveIntegerField(default=0, editable=False)
     level = models.CharField(max_length=20, choices=EducationalService.LEVEL_CHOICES)
     age_group = models.CharField(max_length=20, choices=EducationalService.AGE_GROUP_CHOICES)
     fee = models.DecimalField(max_digits=8, decimal_places=2, default=0)
@@ -93,10 +94,6 @@ class Course(models.Model):
     def __str__(self):
         return f"{self.title} - {self.service.get_service_type_display()}"
 
-    @property
-    def enrolled_count(self):
-        return self.enrollments.filter(status='confirmed').count()
-
 
 
 class ServiceEnrollment(models.Model):
@@ -125,6 +122,8 @@ class ServiceEnrollment(models.Model):
         ('free', 'Free / Scholarship'),
     ], default='free')
     proof_image = models.ImageField(upload_to='education/proofs/', blank=True, null=True)
+    # Resized copies written by the process_image_variants worker (TeqwaCore.variants)
+    proof_image_variants = models.JSONField(default=dict, blank=True, editable=False)
     enrollment_date = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True)
 
@@ -144,6 +143,11 @@ class ServiceEnrollment(models.Model):
         if not self.course and not self.service:
             raise ValidationError('Either course or service must be provided')
 
+    def take_seat(self):
+        """Reserve a seat before saving as confirmed (see TeqwaCore.counters.take_seat); False when full"""
+        from TeqwaCore.counters import take_seat
+        return take_seat(self, 'course' if self.course_id else 'service', 'enrolled_count')
+
 
 class Lecture(models.Model):
     SUBJECT_CHOICES = [
@@ -164,10 +168,17 @@ class Lecture(models.Model):
     video_file = models.FileField(upload_to='lectures/videos/', blank=True, null=True, help_text="Upload local video file")
     audio_file = models.FileField(upload_to='lectures/audio/', blank=True, null=True)
     thumbnail = models.ImageField(upload_to='lectures/thumbnails/', blank=True, null=True)
+    # Resized copies written by the process_image_variants worker (TeqwaCore.variants)
+    thumbnail_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Weighted title/subject/instructor/description vector, maintained by education.search
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
     date_recorded = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Streamable files served by the lecture_media endpoint, keyed by URL kind
+    MEDIA_FIELDS = {'video': 'video_file', 'audio': 'audio_file'}
+
     class Meta:
         ordering = ['-date_recorded']
 
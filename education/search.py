@@ -0,0 +1,95 @@
+"""
+Lecture search.
+
+On PostgreSQL each lecture carries a weighted search_vector (title A,
+subject and instructor name B, description C) backed by a GIN index, and
+results are ranked with ts_rank. Short or misspelled queries that the
+full-text match misses fall back to pg_trgm word similarity. Other databases
+(SQLite in local development) get a plain icontains filter.
+
+The vector cannot be a generated column because the instructor's name lives
+in another table, so it is kept up to date from signals (education/signals.py).
+"""
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+
+from .models import Lecture
+
+
+def is_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def _config():
+    return getattr(settings, 'LECTURE_SEARCH_CONFIG', 'english')
+
+
+def _vector(instructor_name):
+    config = _config()
+    return (
+        SearchVector('title', weight='A', config=config)
+        + SearchVector('subject', weight='B', config=config)
+        + SearchVector(Value(instructor_name or ''), weight='B', config=config)
+        + SearchVector('description', weight='C', config=config)
+    )
+
+
+def update_search_vectors(lectures=None):
+    """
+    Recompute search_vector for the given lectures (default: all of them).
+    One UPDATE per instructor, since joined fields cannot appear in UPDATE.
+    """
+    if not is_postgres():
+        return 0
+    lectures = Lecture.objects.all() if lectures is None else lectures
+    updated = 0
+    instructors = (
+        lectures.order_by().values_list('instructor_id', 'instructor__first_name', 'instructor__last_name').distinct()
+    )
+    for instructor_id, first_name, last_name in instructors:
+        name = f'{first_name or ""} {last_name or ""}'.strip()
+        updated += lectures.filter(instructor_id=instructor_id).update(search_vector=_vector(name))
+    return updated
+
+
+def search_lectures(queryset, query):
+    """Filter and order a Lecture queryset by relevance to `query`"""
+    query = (query or '').strip()
+    if not query:
+        return queryset
+
+    if not is_postgres():
+        return queryset.filter(
+            Q(title__icontains=query) | Q(description__icontains=query) | Q(subject__icontains=query) |
+            Q(instructor__first_name__icontains=query) | Q(instructor__last_name__icontains=query)
+        )
+
+    search_query = SearchQuery(query, search_type='websearch', config=_config())
+    ranked = (
+        queryset
+        .filter(search_vector=search_query)
+        .annotate(rank=SearchRank(F('search_vector'), search_query))
+        .order_by('-rank', '-date_recorded')
+    )
+    if len(query) >= 4 and ranked.exists():
+        return ranked
+
+    # Typos and word fragments: pg_trgm word similarity (the %> operator, GIN-indexed on title)
+    return (
+        queryset
+        .filter(
+            Q(search_vector=search_query) |
+            Q(title__trigram_word_similar=query) |
+            Q(instructor__first_name__trigram_word_similar=query) |
+            Q(instructor__last_name__trigram_word_similar=query)
+        )
+        .annotate(similarity=Greatest(
+            TrigramWordSimilarity(query, 'title'),
+            TrigramWordSimilarity(query, 'instructor__first_name'),
+            TrigramWordSimilarity(query, 'instructor__last_name'),
+        ))
+        .order_by('-similarity', '-date_recorded')
+    )
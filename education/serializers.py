@@ -1,5 +1,9 @@
 from rest_framework import serializers
 from .models import EducationalService, Course, ServiceEnrollment, Lecture, TimetableEntry
+from django.urls import reverse
+from TeqwaCore.media import sign_media_token
+from TeqwaCore.variants import ImageVariantsField
+from TeqwaCore.uploads import AttachUploadsMixin, UploadIntentField
 
 
 class EducationalServiceSerializer(serializers.ModelSerializer):
@@ -30,17 +34,19 @@ class CourseSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class ServiceEnrollmentSerializer(serializers.ModelSerializer):
+class ServiceEnrollmentSerializer(AttachUploadsMixin, serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
     service_title = serializers.SerializerMethodField()
     service_type = serializers.SerializerMethodField()
     course_title = serializers.CharField(source='course.title', read_only=True, allow_null=True)
+    proof_image_variants = ImageVariantsField('proof_image')
+    proof_upload = UploadIntentField('proof_image', source='proof_image')
 
     class Meta:
         model = ServiceEnrollment
         fields = ['id', 'service', 'course', 'user', 'user_name', 'service_title', 
                  'service_type', 'course_title', 'status', 'payment_status', 'payment_method', 'proof_image',
-                 'enrollment_date', 'notes']
+                 'proof_image_variants', 'proof_upload', 'enrollment_date', 'notes']
         read_only_fields = ['id', 'user', 'enrollment_date']
     
     def get_service_title(self, obj):
@@ -67,14 +73,30 @@ class LectureSerializer(serializers.ModelSerializer):
     instructor_name = serializers.CharField(source='instructor.get_full_name', read_only=True)
     instructor_avatar = serializers.CharField(source='instructor.avatar', read_only=True, allow_null=True)
     subject_display = serializers.CharField(source='get_subject_display', read_only=True)
+    thumbnail_variants = ImageVariantsField('thumbnail')
 
     class Meta:
         model = Lecture
         fields = ['id', 'title', 'description', 'instructor', 'instructor_name', 
                  'instructor_avatar', 'subject', 'subject_display', 'video_url', 'video_file',
-                 'audio_file', 'thumbnail', 'date_recorded', 'created_at']
+                 'audio_file', 'thumbnail', 'thumbnail_variants', 'date_recorded', 'created_at']
         read_only_fields = ['id', 'created_at']
 
+    def to_representation(self, instance):
+        """Point video_file/audio_file at the signed streaming endpoint instead of /media/"""
+        representation = super().to_representation(instance)
+        for kind, field_name in Lecture.MEDIA_FIELDS.items():
+            field_file = getattr(instance, field_name)
+            if field_file:
+                representation[field_name] = self._stream_url(instance, kind, field_file)
+        return representation
+
+    def _stream_url(self, lecture, kind, field_file):
+        token = sign_media_token(f'lecture:{lecture.pk}:{kind}:{field_file.name}')
+        url = f"{reverse('lecture_media', args=[lecture.pk, kind])}?token={token}"
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
 
 class TimetableEntrySerializer(serializers.ModelSerializer):
     day_display = serializers.CharField(source='get_day_of_week_display', read_only=True)
@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from TeqwaCore.counters import track_counter
+from .models import ServiceEnrollment, Lecture
+from .search import update_search_vectors
+
+# Enrollments point at either a course or (legacy) a service; each parent
+# keeps its own count of confirmed enrollments.
+track_counter(ServiceEnrollment, 'course', 'enrolled_count')
+track_counter(ServiceEnrollment, 'service', 'enrolled_count')
+
+LECTURE_SEARCH_FIELDS = {'title', 'description', 'subject', 'instructor', 'instructor_id'}
+INSTRUCTOR_NAME_FIELDS = {'first_name', 'last_name'}
+
+
+@receiver(post_save, sender=Lecture)
+def refresh_lecture_search_vector(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not LECTURE_SEARCH_FIELDS & set(update_fields)):
+        return
+    update_search_vectors(Lecture.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=get_user_model())
+def refresh_instructor_search_vectors(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Logins save last_login only; skip anything that cannot change the name
+    if raw or (update_fields is not None and not INSTRUCTOR_NAME_FIELDS & set(update_fields)):
+        return
+    update_search_vectors(Lecture.objects.filter(instructor=instance))
@@ -22,6 +22,7 @@ urlpatterns = [
     # Lectures
     path('lectures/', views.lecture_list, name='lecture_list'),
     path('lectures/<int:pk>/', views.lecture_detail, name='lecture_detail'),
+    path('lectures/<int:pk>/media/<str:kind>/', views.lecture_media, name='lecture_media'),
 
     # Timetable
     path('timetable/', views.timetable_list, name='timetable_list'),
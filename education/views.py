@@ -1,3 +1,6 @@
+import os
+
+from django.db import transaction
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes, parser_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
@@ -5,11 +8,16 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from .models import EducationalService, Course, ServiceEnrollment, Lecture, TimetableEntry
 from .serializers import EducationalServiceSerializer, CourseSerializer, ServiceEnrollmentSerializer, LectureSerializer, TimetableEntrySerializer
+from .search import search_lectures
+from TeqwaCore.cache import cache_public_response
+from TeqwaCore.media import check_media_token, serve_media_file
+from TeqwaCore.pagination import paginated_response
 from authentication.utils import send_admin_alert_email
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_public_response('education')
 def service_list(request):
     """List all educational services"""
     service_type = request.GET.get('type', '')
@@ -59,7 +67,8 @@ def service_detail(request, pk):
 
 def _process_enrollment(request, service=None, course=None):
     """Helper to process enrollment for either a service or a course"""
-    # Check capacity
+    # Early rejection only: pending enrollments hold no seat, the seat is
+    # reserved when the enrollment is confirmed (update_enrollment_status, payment)
     if course:
         if course.enrolled_count >= course.capacity:
             return Response({
@@ -166,18 +175,16 @@ def all_enrollments(request):
         }, status=status.HTTP_403_FORBIDDEN)
     
     service_id = request.GET.get('service_id', '')
-    enrollments = ServiceEnrollment.objects.select_related('user', 'service').all()
+    enrollments = ServiceEnrollment.objects.select_related('user', 'service', 'course', 'course__service').all()
     
     if service_id:
         enrollments = enrollments.filter(service_id=service_id)
     
-    serializer = ServiceEnrollmentSerializer(enrollments, many=True)
-    
-    return Response({
-        'message': 'All enrollments retrieved successfully',
-        'data': serializer.data,
-        'count': enrollments.count()
-    })
+    return paginated_response(
+        request, enrollments, ServiceEnrollmentSerializer,
+        message='All enrollments retrieved successfully',
+        cursor_field='enrollment_date'
+    )
 
 
 @api_view(['PUT'])
@@ -189,29 +196,41 @@ def update_enrollment_status(request, enrollment_id):
             'error': 'Permission denied'
         }, status=status.HTTP_403_FORBIDDEN)
     
-    try:
-        enrollment = ServiceEnrollment.objects.get(pk=enrollment_id)
-    except ServiceEnrollment.DoesNotExist:
-        return Response({
-            'error': 'Enrollment not found'
-        }, status=status.HTTP_404_NOT_FOUND)
-    
-    serializer = ServiceEnrollmentSerializer(enrollment, data=request.data, partial=True)
-    if serializer.is_valid():
-        old_status = enrollment.status
-        enrollment = serializer.save()
-        new_status = enrollment.status
+    with transaction.atomic():
+        # The row is locked so concurrent updates see each other's status and
+        # the capacity counter moves once per transition
+        try:
+            enrollment = ServiceEnrollment.objects.select_for_update().get(pk=enrollment_id)
+        except ServiceEnrollment.DoesNotExist:
+            return Response({
+                'error': 'Enrollment not found'
+            }, status=status.HTTP_404_NOT_FOUND)
         
-        # Send admin alert if status changed to approved (informational only)
-        # Note: Admin is the one updating, so no need for alert
-        # This is just for logging purposes
+        serializer = ServiceEnrollmentSerializer(enrollment, data=request.data, partial=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        return Response({
-            'message': 'Enrollment status updated successfully',
-            'data': serializer.data
-        })
+        old_status = enrollment.status
+        # Confirming takes a seat with a conditional update, so two
+        # approvals racing for the last seat cannot overbook
+        for field in ('status', 'course', 'service'):
+            if field in serializer.validated_data:
+                setattr(enrollment, field, serializer.validated_data[field])
+        if not enrollment.take_seat():
+            return Response({
+                'error': 'Course is full' if enrollment.course_id else 'Service is full'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        enrollment = serializer.save()
+    new_status = enrollment.status
     
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    # Send admin alert if status changed to approved (informational only)
+    # Note: Admin is the one updating, so no need for alert
+    # This is just for logging purposes
+    
+    return Response({
+        'message': 'Enrollment status updated successfully',
+        'data': serializer.data
+    })
 
 
 @api_view(['POST'])
@@ -236,6 +255,7 @@ def create_service(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_public_response('education')
 def course_list(request):
     """List all courses"""
     service_id = request.GET.get('service_id', '')
@@ -309,6 +329,7 @@ def create_course(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_public_response('education')
 def lecture_list(request):
     """List all lectures"""
     subject = request.GET.get('subject', '')
@@ -324,7 +345,7 @@ def lecture_list(request):
         lectures = lectures.filter(instructor_id=instructor_id)
         
     if search:
-        lectures = lectures.filter(title__icontains=search) | lectures.filter(description__icontains=search)
+        lectures = search_lectures(lectures, search)
     
     serializer = LectureSerializer(lectures, many=True, context={'request': request})
     return Response({
@@ -352,8 +373,34 @@ def lecture_detail(request, pk):
     })
 
 
+@api_view(['GET', 'HEAD'])
+@permission_classes([AllowAny])
+def lecture_media(request, pk, kind):
+    """
+    Stream a lecture's video or audio file. The signed token comes from the
+    lecture serializer; behind nginx the transfer is handed off with
+    X-Accel-Redirect, otherwise Django serves it with Range support.
+    """
+    field_name = Lecture.MEDIA_FIELDS.get(kind)
+    lecture = Lecture.objects.filter(pk=pk).only('id', 'title', 'video_file', 'audio_file').first()
+    field_file = getattr(lecture, field_name) if lecture and field_name else None
+    if not field_file:
+        return Response({
+            'error': 'Lecture media not found'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    if not check_media_token(f'lecture:{lecture.pk}:{kind}:{field_file.name}', request.GET.get('token', '')):
+        return Response({
+            'error': 'Media link is invalid or has expired'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    extension = os.path.splitext(field_file.name)[1]
+    return serve_media_file(request, field_file, download_name=f'{lecture.title}{extension}')
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_public_response('education')
 def timetable_list(request):
     """List all timetable entries for weekly schedule"""
     day = request.GET.get('day', '')
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:47
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_attendee_count(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventRegistration = apps.get_model('events', 'EventRegistration')
+    confirmed = EventRegistration.objects.filter(
+        event=OuterRef('pk'), status='confirmed'
+    ).order_by().values('event').annotate(total=Count('pk')).values('total')
+    Event.objects.update(attendee_count=Coalesce(Subquery(confirmed), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='attendee_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_attendee_count, migrations.RunPython.noop),
+    ]
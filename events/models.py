@@ -19,7 +19,11 @@ class Event(models.Model):
     location = models.CharField(max_length=200)
     capacity = models.PositiveIntegerField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='upcoming')
+    # Confirmed registrations, maintained by TeqwaCore.counters (see events/signals.py)
+    attendee_count = models.PositiveIntegerField(default=0, editable=False)
     image = models.ImageField(upload_to='events/', blank=True, null=True, help_text='Upload an image file')
+    # Resized copies written by the process_image_variants worker (TeqwaCore.variants)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     image_url = models.URLField(max_length=500, blank=True, null=True, help_text='Or provide an external image URL')
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -37,10 +41,6 @@ class Event(models.Model):
             return self.image.url
         return self.image_url
 
-    @property
-    def attendee_count(self):
-        return self.registrations.filter(status='confirmed').count()
-
 
 class EventRegistration(models.Model):
     STATUS_CHOICES = [
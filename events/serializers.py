@@ -1,16 +1,18 @@
 from rest_framework import serializers
 from .models import Event, EventRegistration
+from TeqwaCore.variants import ImageVariantsField
 
 
 class EventSerializer(serializers.ModelSerializer):
     attendee_count = serializers.ReadOnlyField()
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
     image = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField('image')
 
     class Meta:
         model = Event
         fields = ['id', 'title', 'description', 'date', 'end_date', 'location', 'capacity', 
-                 'status', 'image', 'image_url', 'attendee_count', 'created_by', 'created_by_name', 'created_at', 'updated_at']
+                 'status', 'image', 'image_url', 'image_variants', 'attendee_count', 'created_by', 'created_by_name', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
     
     def get_image(self, obj):
@@ -0,0 +1,5 @@
+from TeqwaCore.counters import track_counter
+from .models import EventRegistration
+
+# Keep Event.attendee_count in sync with confirmed registrations
+track_counter(EventRegistration, 'event', 'attendee_count')
@@ -3,12 +3,18 @@ from rest_framework.decorators import api_view, permission_classes, parser_class
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
+from django.db import IntegrityError, transaction
 from .models import Event, EventRegistration
 from .serializers import EventSerializer, EventRegistrationSerializer
+from TeqwaCore.cache import cache_public_response
+from TeqwaCore.counters import reserve_seat, mark_seat_reserved
+from TeqwaCore.pagination import paginated_response
+from authentication.utils import send_event_registration_email
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_public_response('events')
 def event_list(request):
     """List all events"""
     status_filter = request.GET.get('status', '')
@@ -86,18 +92,27 @@ def register_for_event(request, pk):
             'error': 'Already registered for this event'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    # Check capacity
-    if event.attendee_count >= event.capacity:
+    # Reserve a seat and create the registration together; the conditional
+    # update fails instead of overbooking when two requests race for the last seat
+    try:
+        with transaction.atomic():
+            if not reserve_seat(Event, event.pk, 'attendee_count'):
+                return Response({
+                    'error': 'Event is full'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            registration = EventRegistration(
+                event=event,
+                user=request.user,
+                status='confirmed'
+            )
+            mark_seat_reserved(registration, 'event')
+            registration.save()
+    except IntegrityError:
         return Response({
-            'error': 'Event is full'
+            'error': 'Already registered for this event'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    registration = EventRegistration.objects.create(
-        event=event,
-        user=request.user,
-        status='confirmed'
-    )
-    
     # Send registration confirmation email
     try:
         send_event_registration_email(event, request.user, registration)
@@ -117,8 +132,10 @@ def unregister_from_event(request, pk):
     """Unregister user from event"""
     try:
         event = Event.objects.get(pk=pk)
-        registration = EventRegistration.objects.get(event=event, user=request.user)
-        registration.delete()
+        with transaction.atomic():
+            # Locked so a repeated unregister cannot release the seat twice
+            registration = EventRegistration.objects.select_for_update().get(event=event, user=request.user)
+            registration.delete()
         return Response({
             'message': 'Successfully unregistered from event'
         })
@@ -144,11 +161,9 @@ def event_attendees(request, pk):
             'error': 'Event not found'
         }, status=status.HTTP_404_NOT_FOUND)
     
-    registrations = EventRegistration.objects.filter(event=event)
-    serializer = EventRegistrationSerializer(registrations, many=True)
-    
-    return Response({
-        'message': 'Event attendees retrieved successfully',
-        'data': serializer.data,
-        'count': registrations.count()
-    })
\ No newline at end of file
+    registrations = EventRegistration.objects.filter(event=event).select_related('user', 'event')
+    return paginated_response(
+        request, registrations, EventRegistrationSerializer,
+        message='Event attendees retrieved successfully',
+        cursor_field='registered_at'
+    )
\ No newline at end of file
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class FutsalBookingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'futsal_booking'
\ No newline at end of file
+    name = 'futsal_booking'
+
+    def ready(self):
+        import futsal_booking.fulfilment
@@ -0,0 +1,10 @@
+from payments.fulfilment import register_handler
+
+
+def fulfil_booking(booking, transaction):
+    """Confirm a paid futsal booking"""
+    booking.status = 'confirmed'
+    booking.save()
+
+
+register_handler('futsal_booking.FutsalBooking', fulfil_booking)
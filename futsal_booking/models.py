@@ -47,6 +47,8 @@ class FutsalBooking(models.Model):
         ('cash', 'Cash (On Arrival)'),
     ], default='cash')
     proof_image = models.ImageField(upload_to='futsal/proofs/', blank=True, null=True)
+    # Resized copies written by the process_image_variants worker (TeqwaCore.variants)
+    proof_image_variants = models.JSONField(default=dict, blank=True, editable=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
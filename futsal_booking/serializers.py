@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from .models import FutsalSlot, FutsalBooking
+from TeqwaCore.variants import ImageVariantsField
+from TeqwaCore.uploads import AttachUploadsMixin, UploadIntentField
 
 
 class FutsalSlotSerializer(serializers.ModelSerializer):
@@ -15,15 +17,18 @@ class FutsalSlotSerializer(serializers.ModelSerializer):
         return f"{obj.start_time.strftime('%H:%M')}-{obj.end_time.strftime('%H:%M')}"
 
 
-class FutsalBookingSerializer(serializers.ModelSerializer):
+class FutsalBookingSerializer(AttachUploadsMixin, serializers.ModelSerializer):
     slot_info = FutsalSlotSerializer(source='slot', read_only=True)
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
+    proof_image_variants = ImageVariantsField('proof_image')
+    proof_upload = UploadIntentField('proof_image', source='proof_image')
     
     class Meta:
         model = FutsalBooking
         fields = ['id', 'slot', 'slot_info', 'user', 'user_name', 'contact_name', 
                  'contact_email', 'contact_phone', 'player_count', 'status', 
-                 'agree_to_rules', 'notes', 'payment_method', 'proof_image', 'created_at', 'updated_at']
+                 'agree_to_rules', 'notes', 'payment_method', 'proof_image', 'proof_image_variants', 'proof_upload',
+                 'created_at', 'updated_at']
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
 
     def create(self, validated_data):
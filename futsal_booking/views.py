@@ -6,6 +6,7 @@ from rest_framework.response import Response
 from django.utils import timezone
 from .models import FutsalSlot, FutsalBooking
 from .serializers import FutsalSlotSerializer, FutsalBookingSerializer
+from TeqwaCore.pagination import paginated_response
 
 
 @api_view(['GET'])
@@ -121,13 +122,10 @@ def all_bookings(request):
     if status_filter:
         bookings = bookings.filter(status=status_filter)
     
-    serializer = FutsalBookingSerializer(bookings, many=True)
-    
-    return Response({
-        'message': 'All bookings retrieved successfully',
-        'data': serializer.data,
-        'count': bookings.count()
-    })
+    return paginated_response(
+        request, bookings, FutsalBookingSerializer,
+        message='All bookings retrieved successfully'
+    )
 
 
 @api_view(['PUT'])
@@ -166,7 +164,7 @@ def update_booking_status(request, booking_id):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-from accounts.models import UserActivity
+from accounts.activity import log_activity
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -182,10 +180,9 @@ def create_slot(request):
         slot = serializer.save()
         
         # Log activity
-        UserActivity.objects.create(
-            user=request.user,
-            activity_type='admin_action',
-            description=f'Created futsal slot for {slot.date} at {slot.start_time}',
+        log_activity(
+            request.user, 'admin_action', f'Created futsal slot for {slot.date} at {slot.start_time}',
+            source='futsal_slot', source_id=slot.id, event_key='created',
             metadata={'source': 'futsal', 'id': slot.id}
         )
         
@@ -5,3 +5,7 @@ class ItikafConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'itikaf'
     verbose_name = 'Iʿtikāf Programs'
+
+    def ready(self):
+        import itikaf.signals
+        import itikaf.fulfilment
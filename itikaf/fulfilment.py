@@ -0,0 +1,26 @@
+from django.utils import timezone
+
+from TeqwaCore.counters import take_seat
+from payments.fulfilment import register_handler
+
+
+def fulfil_registration(registration, transaction):
+    """Confirm a paid Iʿtikāf registration (waitlisted if the program filled up) and queue the email"""
+    registration.payment_status = 'paid'
+    if registration.status == 'pending':
+        registration.status = 'confirmed'
+        if take_seat(registration, 'program', 'participant_count'):
+            registration.confirmed_at = timezone.now()
+        else:
+            registration.status = 'waitlisted'
+    registration.save()
+
+    try:
+        from authentication.utils import send_itikaf_approval_email
+        email_status = 'waitlisted' if registration.status == 'waitlisted' else 'approved'
+        send_itikaf_approval_email(registration, registration.program, registration.user, status=email_status)
+    except Exception as e:
+        print(f"Error sending iʿtikāf approval email: {e}")
+
+
+register_handler('itikaf.ItikafRegistration', fulfil_registration)
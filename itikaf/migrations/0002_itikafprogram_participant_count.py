@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:47
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_participant_count(apps, schema_editor):
+    ItikafProgram = apps.get_model('itikaf', 'ItikafProgram')
+    ItikafRegistration = apps.get_model('itikaf', 'ItikafRegistration')
+    confirmed = ItikafRegistration.objects.filter(
+        program=OuterRef('pk'), status='confirmed'
+    ).order_by().values('program').annotate(total=Count('pk')).values('total')
+    ItikafProgram.objects.update(participant_count=Coalesce(Subquery(confirmed), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('itikaf', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='itikafprogram',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_participant_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-16 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('itikaf', '0002_itikafprogram_participant_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='itikafprogram',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='itikafregistration',
+            name='proof_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -32,6 +32,8 @@ class ItikafProgram(models.Model):
     # Location and capacity
     location = models.CharField(max_length=200, default='Main Prayer Hall')
     capacity = models.PositiveIntegerField()
+    # Confirmed registrations, maintained by TeqwaCore.counters (see itikaf/signals.py)
+    participant_count = models.PositiveIntegerField(default=0, editable=False)
     gender_restriction = models.CharField(max_length=10, choices=GENDER_CHOICES, default='both')
     
     # Program details
@@ -43,6 +45,8 @@ class ItikafProgram(models.Model):
     # Status and metadata
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='upcoming')
     image = models.ImageField(upload_to='itikaf/', blank=True, null=True)
+    # Resized copies written by the process_image_variants worker (TeqwaCore.variants)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     image_url = models.URLField(max_length=500, blank=True, null=True)
     
     # Organizer
@@ -64,16 +68,6 @@ class ItikafProgram(models.Model):
             return self.image.url
         return self.image_url
     
-    @property
-    def participant_count(self):
-        """Get the number of confirmed participants"""
-        try:
-            if self.pk:
-                return self.registrations.filter(status='confirmed').count()
-            return 0
-        except Exception:
-            return 0
-    
     @property
     def is_registration_open(self):
         """Check if registration is still open"""
@@ -170,6 +164,8 @@ class ItikafRegistration(models.Model):
         ('cash', 'Cash (On Arrival)'),
     ], default='cash')
     proof_image = models.ImageField(upload_to='itikaf/proofs/', blank=True, null=True)
+    # Resized copies written by the process_image_variants worker (TeqwaCore.variants)
+    proof_image_variants = models.JSONField(default=dict, blank=True, editable=False)
     
     # Timestamps
     registered_at = models.DateTimeField(auto_now_add=True)
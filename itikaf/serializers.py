@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from .models import ItikafProgram, ItikafSchedule, ItikafRegistration
+from TeqwaCore.variants import ImageVariantsField
+from TeqwaCore.uploads import UploadIntentField
 
 
 class ItikafScheduleSerializer(serializers.ModelSerializer):
@@ -26,6 +28,7 @@ class ItikafProgramSerializer(serializers.ModelSerializer):
     is_full = serializers.ReadOnlyField()
     organizer_name = serializers.CharField(source='organizer.get_full_name', read_only=True)
     image = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField('image')
     schedules = ItikafScheduleSerializer(many=True, read_only=True)
     
     class Meta:
@@ -35,7 +38,7 @@ class ItikafProgramSerializer(serializers.ModelSerializer):
             'start_date', 'end_date', 'registration_deadline',
             'location', 'capacity', 'gender_restriction',
             'fee', 'is_free', 'requirements', 'what_to_bring',
-            'status', 'image', 'image_url',
+            'status', 'image', 'image_url', 'image_variants',
             'organizer', 'organizer_name',
             'participant_count', 'is_registration_open', 'is_full',
             'schedules', 'created_at', 'updated_at'
@@ -64,6 +67,7 @@ class ItikafRegistrationSerializer(serializers.ModelSerializer):
     program_title = serializers.CharField(source='program.title', read_only=True)
     program_start_date = serializers.DateTimeField(source='program.start_date', read_only=True)
     program_end_date = serializers.DateTimeField(source='program.end_date', read_only=True)
+    proof_image_variants = ImageVariantsField('proof_image')
     
     class Meta:
         model = ItikafRegistration
@@ -73,7 +77,7 @@ class ItikafRegistrationSerializer(serializers.ModelSerializer):
             'status', 'emergency_contact', 'emergency_phone',
             'special_requirements', 'notes',
             'special_requirements', 'notes',
-            'payment_status', 'payment_amount', 'payment_method', 'proof_image',
+            'payment_status', 'payment_amount', 'payment_method', 'proof_image', 'proof_image_variants',
             'registered_at', 'confirmed_at', 'cancelled_at'
         ]
         read_only_fields = ['id', 'user', 'registered_at', 'confirmed_at', 'cancelled_at']
@@ -81,11 +85,12 @@ class ItikafRegistrationSerializer(serializers.ModelSerializer):
 
 class ItikafRegistrationCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating Iʿtikāf registration"""
+    proof_upload = UploadIntentField('proof_image', source='proof_image')
     
     class Meta:
         model = ItikafRegistration
         fields = [
             'program', 'emergency_contact', 'emergency_phone',
-            'special_requirements', 'notes'
+            'special_requirements', 'notes', 'payment_method', 'proof_image', 'proof_upload'
         ]
 
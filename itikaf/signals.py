@@ -0,0 +1,5 @@
+from TeqwaCore.counters import track_counter
+from .models import ItikafRegistration
+
+# Keep ItikafProgram.participant_count in sync with confirmed registrations
+track_counter(ItikafRegistration, 'program', 'participant_count')
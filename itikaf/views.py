@@ -3,6 +3,7 @@ from rest_framework.decorators import api_view, permission_classes, parser_class
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.response import Response
+from django.db import transaction
 from django.utils import timezone
 from .models import ItikafProgram, ItikafSchedule, ItikafRegistration
 from .serializers import (
@@ -11,11 +12,16 @@ from .serializers import (
     ItikafRegistrationSerializer,
     ItikafRegistrationCreateSerializer
 )
+from TeqwaCore.cache import cache_public_response
+from TeqwaCore.counters import reserve_seat, mark_seat_reserved, take_seat
+from TeqwaCore.pagination import paginated_response
+from TeqwaCore.uploads import attach_uploads
 from authentication.utils import send_itikaf_approval_email
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_public_response('itikaf')
 def program_list(request):
     """List all Iʿtikāf programs"""
     status_filter = request.GET.get('status', '')
@@ -123,29 +129,7 @@ def register_for_program(request, pk):
     
     # Check capacity
     if program.is_full:
-        # Add to waitlist
-        registration = ItikafRegistration.objects.create(
-            program=program,
-            user=request.user,
-            status='waitlisted',
-            emergency_contact=request.data.get('emergency_contact', ''),
-            emergency_phone=request.data.get('emergency_phone', ''),
-            special_requirements=request.data.get('special_requirements', ''),
-            notes=request.data.get('notes', ''),
-            payment_amount=program.fee
-        )
-        
-        # Send waitlist notification email
-        try:
-            send_itikaf_approval_email(registration, program, request.user, status='waitlisted')
-        except Exception as e:
-            print(f"Error sending iʿtikāf waitlist email: {e}")
-        
-        serializer = ItikafRegistrationSerializer(registration)
-        return Response({
-            'message': 'Program is full. You have been added to the waitlist.',
-            'data': serializer.data
-        }, status=status.HTTP_201_CREATED)
+        return _waitlist_registration(request, program)
     
     # Create registration
     registration_data = {
@@ -157,20 +141,30 @@ def register_for_program(request, pk):
         'payment_method': request.data.get('payment_method', 'card'),
         'proof_image': request.data.get('proof_image', None)
     }
+    if request.data.get('proof_upload'):
+        registration_data['proof_upload'] = request.data.get('proof_upload')
     
-    serializer = ItikafRegistrationCreateSerializer(data=registration_data)
+    serializer = ItikafRegistrationCreateSerializer(data=registration_data, context={'request': request})
     if serializer.is_valid():
         # Determine status based on fee
         initial_status = 'confirmed' if program.fee == 0 else 'pending'
         
-        registration = serializer.save(
+        registration = ItikafRegistration(
+            **serializer.validated_data,
             user=request.user,
             status=initial_status,
             payment_amount=program.fee
         )
         
-        if initial_status == 'confirmed':
-            registration.confirmed_at = timezone.now()
+        with transaction.atomic():
+            if initial_status == 'confirmed':
+                registration.confirmed_at = timezone.now()
+                # Free programs take their seat immediately; the conditional
+                # update keeps concurrent registrations from overbooking
+                if not reserve_seat(ItikafProgram, program.pk, 'participant_count'):
+                    return _waitlist_registration(request, program)
+                mark_seat_reserved(registration, 'program')
+            attach_uploads(serializer)
             registration.save()
         
         result_serializer = ItikafRegistrationSerializer(registration)
@@ -189,6 +183,32 @@ def register_for_program(request, pk):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def _waitlist_registration(request, program):
+    """Add the user to the waitlist of a full program"""
+    registration = ItikafRegistration.objects.create(
+        program=program,
+        user=request.user,
+        status='waitlisted',
+        emergency_contact=request.data.get('emergency_contact', ''),
+        emergency_phone=request.data.get('emergency_phone', ''),
+        special_requirements=request.data.get('special_requirements', ''),
+        notes=request.data.get('notes', ''),
+        payment_amount=program.fee
+    )
+    
+    # Send waitlist notification email
+    try:
+        send_itikaf_approval_email(registration, program, request.user, status='waitlisted')
+    except Exception as e:
+        print(f"Error sending iʿtikāf waitlist email: {e}")
+    
+    serializer = ItikafRegistrationSerializer(registration)
+    return Response({
+        'message': 'Program is full. You have been added to the waitlist.',
+        'data': serializer.data
+    }, status=status.HTTP_201_CREATED)
+
+
 @api_view(['PUT', 'PATCH'])
 @permission_classes([IsAuthenticated])
 def update_registration_status(request, registration_id):
@@ -198,27 +218,35 @@ def update_registration_status(request, registration_id):
             'error': 'Permission denied'
         }, status=status.HTTP_403_FORBIDDEN)
     
-    try:
-        registration = ItikafRegistration.objects.get(pk=registration_id)
-    except ItikafRegistration.DoesNotExist:
-        return Response({
-            'error': 'Registration not found'
-        }, status=status.HTTP_404_NOT_FOUND)
-    
-    old_status = registration.status
-    new_status = request.data.get('status', old_status)
-    
-    if new_status not in ['pending', 'confirmed', 'waitlisted', 'cancelled']:
+    new_status = request.data.get('status')
+    if new_status is not None and new_status not in ['pending', 'confirmed', 'waitlisted', 'cancelled']:
         return Response({
             'error': 'Invalid status'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    registration.status = new_status
-    if new_status == 'confirmed' and not registration.confirmed_at:
-        registration.confirmed_at = timezone.now()
-    elif new_status == 'cancelled' and not registration.cancelled_at:
-        registration.cancelled_at = timezone.now()
-    registration.save()
+    with transaction.atomic():
+        # The row is locked so concurrent updates see each other's status and
+        # the capacity counter moves once per transition
+        try:
+            registration = ItikafRegistration.objects.select_for_update().get(pk=registration_id)
+        except ItikafRegistration.DoesNotExist:
+            return Response({
+                'error': 'Registration not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        old_status = registration.status
+        new_status = new_status or old_status
+        registration.status = new_status
+        if new_status == 'confirmed' and not registration.confirmed_at:
+            registration.confirmed_at = timezone.now()
+        elif new_status == 'cancelled' and not registration.cancelled_at:
+            registration.cancelled_at = timezone.now()
+        # Confirming takes a seat with a conditional update, as registration does
+        if not take_seat(registration, 'program', 'participant_count'):
+            return Response({
+                'error': 'Program is full'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        registration.save()
     
     # Send email notification if status changed
     if old_status != new_status:
@@ -240,12 +268,14 @@ def unregister_from_program(request, pk):
     """Unregister user from Iʿtikāf program"""
     try:
         program = ItikafProgram.objects.get(pk=pk)
-        registration = ItikafRegistration.objects.get(program=program, user=request.user)
-        
-        # Update status to cancelled
-        registration.status = 'cancelled'
-        registration.cancelled_at = timezone.now()
-        registration.save()
+        with transaction.atomic():
+            # Locked so a repeated cancel cannot release the seat twice
+            registration = ItikafRegistration.objects.select_for_update().get(program=program, user=request.user)
+            
+            # Update status to cancelled
+            registration.status = 'cancelled'
+            registration.cancelled_at = timezone.now()
+            registration.save()
         
         return Response({
             'message': 'Successfully unregistered from Iʿtikāf program'
@@ -286,14 +316,12 @@ def program_participants(request, pk):
             'error': 'Iʿtikāf program not found'
         }, status=status.HTTP_404_NOT_FOUND)
     
-    registrations = ItikafRegistration.objects.filter(program=program)
-    serializer = ItikafRegistrationSerializer(registrations, many=True)
-    
-    return Response({
-        'message': 'Program participants retrieved successfully',
-        'data': serializer.data,
-        'count': registrations.count()
-    })
+    registrations = ItikafRegistration.objects.filter(program=program).select_related('user', 'program')
+    return paginated_response(
+        request, registrations, ItikafRegistrationSerializer,
+        message='Program participants retrieved successfully',
+        cursor_field='registered_at'
+    )
 
 
 @api_view(['POST'])
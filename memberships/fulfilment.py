@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from payments.fulfilment import register_handler
+
+# Tier prices are monthly
+MEMBERSHIP_PERIOD = timedelta(days=30)
+
+
+def fulfil_membership(membership, transaction):
+    """Activate a paid membership, extending any remaining period"""
+    now = timezone.now()
+    period_start = membership.expiry_date if membership.expiry_date and membership.expiry_date > now else now
+    membership.status = 'active'
+    membership.last_payment_date = now
+    membership.expiry_date = period_start + MEMBERSHIP_PERIOD
+    membership.save()
+
+
+register_handler('memberships.UserMembership', fulfil_membership)
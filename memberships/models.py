@@ -49,6 +49,8 @@ class UserMembership(models.Model):
         ('cash', 'Cash'),
     ], default='card')
     proof_image = models.ImageField(upload_to='memberships/proofs/', blank=True, null=True)
+    # Resized copies written by the process_image_variants worker (TeqwaCore.variants)
+    proof_image_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return f"{self.user.username} - {self.tier.name} ({self.status})"
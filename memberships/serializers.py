@@ -1,16 +1,21 @@
 from rest_framework import serializers
 from .models import MembershipTier, UserMembership
+from TeqwaCore.variants import ImageVariantsField
+from TeqwaCore.uploads import AttachUploadsMixin, UploadIntentField
 
 class MembershipTierSerializer(serializers.ModelSerializer):
     class Meta:
         model = MembershipTier
         fields = ['id', 'name', 'slug', 'description', 'price', 'benefits', 'color', 'icon', 'is_featured']
 
-class UserMembershipSerializer(serializers.ModelSerializer):
+class UserMembershipSerializer(AttachUploadsMixin, serializers.ModelSerializer):
     tier_details = MembershipTierSerializer(source='tier', read_only=True)
+    proof_image_variants = ImageVariantsField('proof_image')
+    proof_upload = UploadIntentField('proof_image', source='proof_image')
 
     class Meta:
         model = UserMembership
         fields = ['id', 'user', 'tier', 'tier_details', 'status', 'start_date', 'expiry_date', 
-                 'last_payment_date', 'auto_renew', 'payment_method', 'proof_image']
+                 'last_payment_date', 'auto_renew', 'payment_method', 'proof_image',
+                 'proof_image_variants', 'proof_upload']
         read_only_fields = ['user', 'status', 'start_date', 'expiry_date', 'last_payment_date']
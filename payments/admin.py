@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Transaction
+from .models import Transaction, WebhookEvent
 
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
@@ -7,3 +7,11 @@ class TransactionAdmin(admin.ModelAdmin):
     list_filter = ('status', 'currency', 'created_at')
     search_fields = ('tx_ref', 'email', 'first_name', 'last_name')
     readonly_fields = ('tx_ref', 'created_at', 'updated_at', 'chapa_reference')
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = ('tx_ref', 'status', 'outcome', 'attempts', 'received_at', 'processed_at')
+    list_filter = ('status', 'outcome', 'received_at')
+    search_fields = ('tx_ref',)
+    readonly_fields = ('payload', 'attempts', 'last_error', 'locked_at', 'received_at', 'processed_at')
@@ -1,10 +1,130 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
 import logging
 import json
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+
+class ChapaUnavailable(Exception):
+    """Raised without calling Chapa while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Per-process circuit breaker for the Chapa API.
+
+    After `failure_threshold` consecutive failures (timeouts, connection
+    errors, 5xx) the breaker opens and calls fail fast for `reset_timeout`
+    seconds. The first call after that is let through as a probe: success
+    closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.error(f"Chapa circuit breaker opened after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+
+_session = None
+_session_lock = threading.Lock()
+breaker = CircuitBreaker(
+    failure_threshold=getattr(settings, 'CHAPA_BREAKER_FAILURE_THRESHOLD', 5),
+    reset_timeout=getattr(settings, 'CHAPA_BREAKER_RESET_SECONDS', 30),
+)
+
+
+def get_session():
+    """
+    Shared keep-alive session for Chapa calls.
+
+    GET requests (verify) are retried on connection errors and 502/503/504;
+    POST (initialize) is never retried, so a payment is not initialized twice.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=getattr(settings, 'CHAPA_VERIFY_RETRIES', 2),
+                    backoff_factor=0.3,
+                    status_forcelist=(502, 503, 504),
+                    allowed_methods=frozenset(['GET']),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=2,
+                    pool_maxsize=getattr(settings, 'CHAPA_POOL_MAXSIZE', 10),
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def _timeout():
+    return (
+        getattr(settings, 'CHAPA_CONNECT_TIMEOUT', 3.05),
+        getattr(settings, 'CHAPA_READ_TIMEOUT', 20),
+    )
+
+
+def _request(method, url, **kwargs):
+    """Send a request through the pooled session, guarded by the circuit breaker"""
+    if not breaker.allow_request():
+        raise ChapaUnavailable("Payment service is temporarily unavailable. Please try again later.")
+    try:
+        response = get_session().request(method, url, timeout=_timeout(), **kwargs)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        breaker.record_failure()
+        raise
+    except requests.exceptions.RequestException:
+        breaker.record_success()
+        raise
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
+
+
 class ChapaService:
     @staticmethod
     def initialize_payment(amount, currency, email, first_name, last_name, tx_ref, callback_url, return_url, phone_number=None, customization=None):
@@ -37,7 +157,7 @@ class ChapaService:
                 raise Exception("Chapa API Key is not configured. Please set CHAPA_SECRET_KEY environment variable.")
             
             logger.info(f"Sending to Chapa: {data}")
-            response = requests.post(url, headers=headers, json=data, timeout=30)
+            response = _request('POST', url, headers=headers, json=data)
             
             # Check response status
             if response.status_code == 401:
@@ -56,6 +176,9 @@ class ChapaService:
                 raise Exception(f"Chapa API Error: {json.dumps(result)}")
             
             return result
+        except ChapaUnavailable:
+            logger.warning("Chapa circuit breaker is open, skipping initialize call")
+            raise
         except requests.exceptions.Timeout:
             logger.error("Chapa API request timeout")
             raise Exception("Payment service timeout. Please try again.") from None
@@ -89,9 +212,15 @@ class ChapaService:
         }
         
         try:
-            response = requests.get(url, headers=headers)
+            response = _request('GET', url, headers=headers)
+            if 400 <= response.status_code < 500 and response.content:
+                # Unknown or unpaid references are answered with a 4xx "failed" body
+                return response.json()
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except ChapaUnavailable:
+            logger.warning(f"Chapa circuit breaker is open, skipping verification of {tx_ref}")
+            return None
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"Chapa verification error: {str(e)}")
             return None
@@ -0,0 +1,44 @@
+"""
+Registry of fulfilment handlers for Transaction.content_object.
+
+Each app that can be paid for registers a handler for its model in its
+fulfilment.py (imported from AppConfig.ready()):
+
+    register_handler('donations.Donation', fulfil_donation)
+
+A handler receives the paid object, already locked with select_for_update,
+and the Transaction. Handlers run inside confirm_transaction()'s atomic
+block, which also skips transactions that were fulfilled before, so a
+handler runs at most once per transaction.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+
+def register_handler(model_label, handler):
+    """Register the fulfilment handler for a model ('app_label.ModelName')"""
+    _handlers[model_label.lower()] = handler
+
+
+def fulfil(transaction):
+    """Run the registered handler for the object a transaction paid for"""
+    model = transaction.content_type.model_class()
+    if model is None:
+        logger.error(f"Transaction {transaction.tx_ref} points at a missing model")
+        return False
+
+    handler = _handlers.get(model._meta.label_lower)
+    if handler is None:
+        logger.warning(f"No fulfilment handler registered for {model._meta.label}")
+        return False
+
+    related_obj = model.objects.select_for_update().filter(pk=transaction.object_id).first()
+    if related_obj is None:
+        logger.error(f"Transaction {transaction.tx_ref}: {model._meta.label} #{transaction.object_id} not found")
+        return False
+
+    handler(related_obj, transaction)
+    return True
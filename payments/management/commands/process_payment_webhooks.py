@@ -0,0 +1,43 @@
+"""
+Verify and fulfil payments for stored Chapa webhook events.
+
+The webhook endpoint only records events; this worker verifies each tx_ref
+with Chapa and fulfils it once. Run it with --loop, as the payments_worker
+service in docker-compose does.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from payments.services import process_webhook_events
+
+
+class Command(BaseCommand):
+    help = 'Process pending Chapa webhook events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Events claimed per batch (default: PAYMENT_WEBHOOK_BATCH_SIZE)')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep polling for new events instead of exiting when none are due')
+        parser.add_argument('--interval', type=float, default=2,
+                            help='Seconds to sleep between polls when no events are due (with --loop)')
+
+    def handle(self, *args, **options):
+        totals = {}
+
+        while True:
+            close_old_connections()
+            counts = process_webhook_events(options['batch_size'])
+            for outcome, count in counts.items():
+                totals[outcome] = totals.get(outcome, 0) + count
+            if counts:
+                self.stdout.write(', '.join(f'{outcome}: {count}' for outcome, count in sorted(counts.items())))
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        summary = ', '.join(f'{outcome}: {count}' for outcome, count in sorted(totals.items())) or 'nothing to do'
+        self.stdout.write(self.style.SUCCESS(f'Webhook events processed ({summary})'))
@@ -0,0 +1,135 @@
+"""
+Reconcile pending Chapa transactions whose webhook never arrived.
+
+Pending transactions are read in id-ordered chunks and verified against
+Chapa from a bounded thread pool, throttled to --rate requests per second.
+Only the HTTP calls run in the pool; verified payments are fulfilled on the
+main thread through payments.services, the same path the webhook worker uses.
+
+Transactions Chapa reports as failed or cancelled are marked failed, and
+ones still unpaid after --expire-after minutes (abandoned checkouts) expire
+as failed, so the pending set does not grow from run to run.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from payments import chapa
+from payments.chapa import ChapaService
+from payments.models import Transaction
+from payments.services import (
+    confirm_transaction, fail_transaction, is_unpaid_final, is_verified,
+    EXPIRED, FAILED, NOT_VERIFIED, VERIFY_UNAVAILABLE
+)
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across threads"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class Command(BaseCommand):
+    help = 'Verify pending payment transactions with Chapa and fulfil the paid ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=10,
+                            help='Only reconcile transactions created at least this many minutes ago')
+        parser.add_argument('--expire-after', type=int, default=1440,
+                            help='Mark transactions still unpaid after this many minutes failed (0 = never)')
+        parser.add_argument('--chunk-size', type=int, default=200,
+                            help='Pending transactions loaded per query')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Concurrent verify requests')
+        parser.add_argument('--rate', type=float, default=5,
+                            help='Maximum verify requests per second (0 = unlimited)')
+        parser.add_argument('--limit', type=int, default=None,
+                            help='Stop after this many transactions')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Verify only, do not fulfil anything')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options['older_than'])
+        expire_before = (
+            timezone.now() - timedelta(minutes=options['expire_after']) if options['expire_after'] > 0 else None
+        )
+        limiter = RateLimiter(options['rate'])
+        counts = {}
+        processed = 0
+        last_id = 0
+
+        def verify(tx_ref):
+            limiter.wait()
+            return tx_ref, ChapaService.verify_payment(tx_ref)
+
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as pool:
+            while options['limit'] is None or processed < options['limit']:
+                size = options['chunk_size']
+                if options['limit'] is not None:
+                    size = min(size, options['limit'] - processed)
+                chunk = list(
+                    Transaction.objects
+                    .filter(status='pending', created_at__lte=cutoff, id__gt=last_id)
+                    .order_by('id')
+                    .values_list('id', 'tx_ref', 'created_at')[:size]
+                )
+                if not chunk:
+                    break
+                last_id = chunk[-1][0]
+                created = {tx_ref: created_at for _, tx_ref, created_at in chunk}
+
+                for tx_ref, verification in pool.map(verify, list(created)):
+                    if verification is None:
+                        outcome = VERIFY_UNAVAILABLE
+                    elif is_verified(verification):
+                        outcome = self.fulfil(tx_ref, verification, options['dry_run'])
+                    elif is_unpaid_final(verification):
+                        outcome = self.fail(tx_ref, FAILED, options['dry_run'])
+                    elif expire_before and created[tx_ref] <= expire_before:
+                        outcome = self.fail(tx_ref, EXPIRED, options['dry_run'])
+                    else:
+                        outcome = NOT_VERIFIED
+                    counts[outcome] = counts.get(outcome, 0) + 1
+                processed += len(chunk)
+                self.stdout.write(f'Checked {processed} transaction(s)')
+
+                if chapa.breaker.is_open:
+                    self.stderr.write(self.style.WARNING(
+                        'Chapa circuit breaker is open; stopping. Re-run once the payment service recovers.'
+                    ))
+                    break
+
+        summary = ', '.join(f'{outcome}: {count}' for outcome, count in sorted(counts.items())) or 'nothing pending'
+        self.stdout.write(self.style.SUCCESS(f'Reconciled {processed} transaction(s) ({summary})'))
+
+    def fulfil(self, tx_ref, verification, dry_run):
+        if dry_run:
+            return 'would_fulfil'
+        try:
+            return confirm_transaction(tx_ref, verification['data'])
+        except Exception as e:
+            self.stderr.write(f'Error fulfilling {tx_ref}: {e}')
+            return 'error'
+
+    def fail(self, tx_ref, outcome, dry_run):
+        """Mark a pending transaction failed; outcome is FAILED or EXPIRED"""
+        if dry_run:
+            return f'would_mark_{outcome}'
+        return outcome if fail_transaction(tx_ref) else 'changed_meanwhile'
@@ -0,0 +1,221 @@
+"""
+Payment verification and fulfilment.
+
+Both the webhook worker (process_payment_webhooks) and VerifyPaymentView go
+through process_transaction(), which is idempotent per tx_ref: the
+Transaction row is locked while it is marked successful, and a transaction
+that is already 'success' is never fulfilled again, however many webhook
+retries or verify calls arrive for it.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction as db_transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .chapa import ChapaService
+from .fulfilment import fulfil
+from .models import Transaction, WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+# Outcomes returned by process_transaction()
+FULFILLED = 'fulfilled'
+ALREADY_FULFILLED = 'already_fulfilled'
+NOT_VERIFIED = 'not_verified'
+VERIFY_UNAVAILABLE = 'verify_unavailable'
+NOT_FOUND = 'not_found'
+FAILED = 'failed'
+EXPIRED = 'expired'
+
+# Chapa payment statuses after which a checkout can no longer be paid
+UNPAID_FINAL_STATUSES = ('failed', 'cancelled', 'reversed')
+
+
+def is_verified(verification):
+    """True when a Chapa verify response reports a successful payment"""
+    return bool(
+        verification
+        and verification.get('status') == 'success'
+        and (verification.get('data') or {}).get('status') == 'success'
+    )
+
+
+def is_unpaid_final(verification):
+    """True when a Chapa verify response says the payment failed or was cancelled"""
+    return bool(
+        verification
+        and ((verification.get('data') or {}).get('status') or '').lower() in UNPAID_FINAL_STATUSES
+    )
+
+
+def fail_transaction(tx_ref):
+    """
+    Mark a transaction failed if it is still pending. Returns True if it was.
+    A failed transaction is still fulfilled if a verified payment turns up later.
+    """
+    return Transaction.objects.filter(tx_ref=tx_ref, status='pending').update(
+        status='failed', updated_at=timezone.now()
+    ) == 1
+
+
+def confirm_transaction(tx_ref, verification_data):
+    """
+    Mark a verified transaction successful and fulfil it, exactly once.
+
+    The Transaction row stays locked while the registered fulfilment handler
+    updates the paid object, all in one atomic block.
+
+    Returns FULFILLED, or ALREADY_FULFILLED when another worker or request got
+    there first.
+    """
+    with db_transaction.atomic():
+        transaction = Transaction.objects.select_for_update().get(tx_ref=tx_ref)
+        if transaction.status == 'success':
+            return ALREADY_FULFILLED
+
+        transaction.status = 'success'
+        transaction.chapa_reference = verification_data.get('reference', '') or ''
+        transaction.save()
+        fulfil(transaction)
+    return FULFILLED
+
+
+def coalesced_verify(tx_ref):
+    """
+    Verify tx_ref with Chapa at most once per PAYMENT_VERIFY_MIN_INTERVAL_SECONDS.
+
+    The first caller takes a cache lock and makes the upstream call; callers
+    arriving meanwhile wait for its result instead of calling Chapa
+    themselves, and callers within the interval get the cached answer. Use a
+    shared CACHE_URL (Redis/Memcached) to coalesce across gunicorn workers.
+    """
+    result_key = f'chapa-verify:{tx_ref}'
+    lock_key = f'chapa-verify-lock:{tx_ref}'
+
+    cached = cache.get(result_key)
+    if cached is not None:
+        return cached
+
+    if cache.add(lock_key, 1, getattr(settings, 'PAYMENT_VERIFY_LOCK_SECONDS', 30)):
+        try:
+            verification = ChapaService.verify_payment(tx_ref)
+            if verification is not None:
+                cache.set(result_key, verification, getattr(settings, 'PAYMENT_VERIFY_MIN_INTERVAL_SECONDS', 5))
+            return verification
+        finally:
+            cache.delete(lock_key)
+
+    # Another request is verifying this tx_ref right now: wait for its answer
+    deadline = time.monotonic() + getattr(settings, 'PAYMENT_VERIFY_WAIT_SECONDS', 5)
+    while time.monotonic() < deadline:
+        time.sleep(0.1)
+        cached = cache.get(result_key)
+        if cached is not None:
+            return cached
+        if cache.get(lock_key) is None:
+            break
+    return None
+
+
+def process_transaction(tx_ref, coalesce=False):
+    """
+    Verify a transaction with Chapa and fulfil it if the payment succeeded.
+
+    The Chapa call is made without holding any row lock. With coalesce=True
+    (user-facing polling) the verify call goes through coalesced_verify().
+    Returns (outcome, verification).
+    """
+    current_status = Transaction.objects.filter(tx_ref=tx_ref).values_list('status', flat=True).first()
+    if current_status is None:
+        return NOT_FOUND, None
+    if current_status == 'success':
+        return ALREADY_FULFILLED, None
+
+    if coalesce:
+        verification = coalesced_verify(tx_ref)
+    else:
+        verification = ChapaService.verify_payment(tx_ref)
+    if verification is None:
+        return VERIFY_UNAVAILABLE, None
+    if not is_verified(verification):
+        return NOT_VERIFIED, verification
+
+    return confirm_transaction(tx_ref, verification['data']), verification
+
+
+def _retry_delay(attempts):
+    base = getattr(settings, 'PAYMENT_WEBHOOK_RETRY_BASE_SECONDS', 30)
+    cap = getattr(settings, 'PAYMENT_WEBHOOK_RETRY_MAX_SECONDS', 1800)
+    return timedelta(seconds=min(base * 2 ** max(attempts - 1, 0), cap))
+
+
+def claim_webhook_events(batch_size):
+    """Lock a batch of due webhook events (SELECT ... FOR UPDATE SKIP LOCKED)"""
+    now = timezone.now()
+    stale = now - timedelta(seconds=getattr(settings, 'PAYMENT_WEBHOOK_LOCK_SECONDS', 300))
+    with db_transaction.atomic():
+        ids = list(
+            WebhookEvent.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status='pending', next_attempt_at__lte=now) |
+                Q(status='processing', locked_at__lt=stale)
+            )
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if ids:
+            WebhookEvent.objects.filter(id__in=ids).update(status='processing', locked_at=now)
+    return list(WebhookEvent.objects.filter(id__in=ids).order_by('id'))
+
+
+def process_webhook_events(batch_size=None):
+    """
+    Process one batch of stored webhook events.
+
+    Chapa retries deliver the same tx_ref several times; each tx_ref in the
+    batch is verified once and all of its events share the outcome.
+    Returns a dict of outcome -> number of events.
+    """
+    batch_size = batch_size or getattr(settings, 'PAYMENT_WEBHOOK_BATCH_SIZE', 20)
+    max_attempts = getattr(settings, 'PAYMENT_WEBHOOK_MAX_ATTEMPTS', 8)
+    events = claim_webhook_events(batch_size)
+
+    by_tx_ref = {}
+    for event in events:
+        by_tx_ref.setdefault(event.tx_ref, []).append(event)
+
+    counts = {}
+    for tx_ref, tx_events in by_tx_ref.items():
+        try:
+            outcome, _ = process_transaction(tx_ref)
+            error = ''
+        except Exception as e:
+            logger.error(f"Webhook processing error for {tx_ref}: {str(e)}", exc_info=True)
+            outcome, error = 'error', str(e)
+
+        retry = outcome in (VERIFY_UNAVAILABLE, 'error')
+        for event in tx_events:
+            event.attempts += 1
+            event.outcome = outcome
+            event.last_error = error[:2000]
+            event.locked_at = None
+            if not retry:
+                event.status = 'processed'
+                event.processed_at = timezone.now()
+            elif event.attempts >= max_attempts:
+                event.status = 'failed'
+                logger.error(f"Giving up on webhook event {event.id} ({tx_ref}) after {event.attempts} attempts")
+            else:
+                event.status = 'pending'
+                event.next_attempt_at = timezone.now() + _retry_delay(event.attempts)
+            event.save(update_fields=[
+                'attempts', 'outcome', 'last_error', 'locked_at', 'status', 'processed_at', 'next_attempt_at'
+            ])
+            counts[outcome] = counts.get(outcome, 0) + 1
+    return counts
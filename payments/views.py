@@ -2,9 +2,10 @@ from rest_framework import views, status, permissions
 from rest_framework.response import Response
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from .models import Transaction
+from .models import Transaction, WebhookEvent
 from .serializers import InitializePaymentSerializer
-from .chapa import ChapaService
+from .chapa import ChapaService, ChapaUnavailable
+from .services import process_transaction, FULFILLED, ALREADY_FULFILLED, VERIFY_UNAVAILABLE
 import hmac
 import hashlib
 import json
@@ -109,6 +110,13 @@ class InitializePaymentView(views.APIView):
                         'message': 'Unable to process payment at this time. Please try again later or contact support if the issue persists.'
                     }, status=status.HTTP_502_BAD_GATEWAY)
 
+            except ChapaUnavailable as e:
+                transaction.status = 'failed'
+                transaction.save()
+                return Response({
+                    'error': str(e),
+                    'message': 'Unable to process payment at this time. Please try again later or contact support.'
+                }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
             except Exception as e:
                 logger.error(f"Chapa service error: {str(e)}", exc_info=True)
                 transaction.status = 'failed'
@@ -154,7 +162,7 @@ class ChapaWebhookView(views.APIView):
         secret = settings.CHAPA_WEBHOOK_SECRET.encode('utf-8')
         expected_signature = hmac.new(secret, payload, hashlib.sha256).hexdigest()
         
-        if chapa_signature != expected_signature:
+        if not hmac.compare_digest(chapa_signature, expected_signature):
             # In some cases, Chapa might use a different hashing or payload structure verify.
             # If standard HMAC SHA256 matches, good. If not, log warning but if strictly required, fail.
             # For now we enforce it.
@@ -163,70 +171,22 @@ class ChapaWebhookView(views.APIView):
 
         try:
             event = json.loads(payload)
-            # Depending on Chapa's webhook payload structure.
-            # Usually generic structure: { "tx_ref": "...", "status": "success", ... }
-            # Or wrapped in "data".
-            # Let's assume standard payload.
-            
-            tx_ref = event.get('tx_ref')
-            # If nested
-            if not tx_ref and 'data' in event:
-                tx_ref = event['data'].get('tx_ref')
-            
-            if not tx_ref:
-                return Response({'error': 'No content'}, status=status.HTTP_200_OK) 
-
-            transaction = Transaction.objects.get(tx_ref=tx_ref)
-            
-            # Check success status
-            # It might be event['status'] or event['event'] == 'charge.success'
-            # We will rely on verifying it again to be safe or just trusting the webhook 'status' field if present.
-            # Best practice: Verify against API to be sure.
-            
-            verification = ChapaService.verify_payment(tx_ref)
-            if verification and verification.get('status') == 'success' and verification['data']['status'] == 'success':
-                transaction.status = 'success'
-                transaction.chapa_reference = verification['data'].get('reference', '')
-                transaction.save()
-                
-                # Update related object
-                related_obj = transaction.content_object
-                if related_obj:
-                    # Generic handling based on known models
-                    model_name = related_obj._meta.model_name
-                    if model_name == 'donation':
-                        related_obj.status = 'completed'
-                        related_obj.save()
-                        # Send donation confirmation email
-                        try:
-                            from authentication.utils import (
-                                send_donation_confirmation_email,
-                                send_new_donation_alert,
-                                send_large_donation_alert
-                            )
-                            user = related_obj.user if hasattr(related_obj, 'user') and related_obj.user else None
-                            if user:
-                                send_donation_confirmation_email(related_obj, user)
-                                send_new_donation_alert(related_obj, user)
-                                send_large_donation_alert(related_obj, user, threshold=10000)
-                        except Exception as e:
-                            print(f"Error sending donation email notifications: {e}")
-                    elif model_name == 'futsalbooking':
-                        related_obj.status = 'confirmed' # or completed
-                        related_obj.save()
-                    elif model_name == 'serviceenrollment':
-                        related_obj.status = 'confirmed'
-                        related_obj.payment_status = 'paid'
-                        related_obj.save()
-            
-            return Response(status=status.HTTP_200_OK)
-
-        except Transaction.DoesNotExist:
-            logger.error(f"Transaction not found for webhook: {tx_ref}")
-            return Response(status=status.HTTP_404_NOT_FOUND)
-        except Exception as e:
-            logger.error(f"Webhook error: {str(e)}")
-            return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        except ValueError:
+            return Response({'error': 'Invalid payload'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # tx_ref is at the top level or nested in "data" depending on the event type
+        tx_ref = event.get('tx_ref') if isinstance(event, dict) else None
+        if not tx_ref and isinstance(event, dict) and isinstance(event.get('data'), dict):
+            tx_ref = event['data'].get('tx_ref')
+        
+        if not tx_ref:
+            return Response({'error': 'No content'}, status=status.HTTP_200_OK)
+        
+        # Store the event and acknowledge right away. Verification against the
+        # Chapa API and fulfilment happen in the process_payment_webhooks
+        # worker, so Chapa's retries can never run the side effects twice.
+        WebhookEvent.objects.create(tx_ref=str(tx_ref)[:100], payload=event)
+        return Response(status=status.HTTP_200_OK)
 
 
 class VerifyPaymentView(views.APIView):
@@ -240,46 +200,22 @@ class VerifyPaymentView(views.APIView):
             if transaction.status == 'success':
                 return Response({'status': 'success', 'data': {'status': 'success'}})
             
-            # Otherwise, verify with Chapa
-            verification = ChapaService.verify_payment(tx_ref)
-            if verification and verification.get('status') == 'success' and verification['data']['status'] == 'success':
-                transaction.status = 'success'
-                transaction.chapa_reference = verification['data'].get('reference', '')
-                transaction.save()
-                
-                # Update related object
-                related_obj = transaction.content_object
-                if related_obj:
-                    # Generic handling 
-                    model_name = related_obj._meta.model_name
-                    if model_name == 'donation':
-                        related_obj.status = 'completed'
-                        related_obj.save()
-                        # Send donation confirmation email
-                        try:
-                            from authentication.utils import (
-                                send_donation_confirmation_email,
-                                send_new_donation_alert,
-                                send_large_donation_alert
-                            )
-                            user = related_obj.user if hasattr(related_obj, 'user') and related_obj.user else None
-                            if user:
-                                send_donation_confirmation_email(related_obj, user)
-                                send_new_donation_alert(related_obj, user)
-                                send_large_donation_alert(related_obj, user, threshold=10000)
-                        except Exception as e:
-                            print(f"Error sending donation email notifications: {e}")
-                    elif model_name == 'futsalbooking':
-                        related_obj.status = 'confirmed'
-                        related_obj.save()
-                    elif model_name == 'serviceenrollment':
-                        related_obj.status = 'confirmed'
-                        related_obj.payment_status = 'paid'
-                        related_obj.save()
-                
-                return Response({'status': 'success', 'data': verification['data']})
+            # Otherwise, verify with Chapa and fulfil (idempotent per tx_ref).
+            # Polls of the same tx_ref share one upstream call per interval.
+            outcome, verification = process_transaction(tx_ref, coalesce=True)
+            if outcome in (FULFILLED, ALREADY_FULFILLED):
+                data = verification['data'] if verification else {'status': 'success'}
+                return Response({'status': 'success', 'data': data})
+            
+            retry_after = str(getattr(settings, 'PAYMENT_VERIFY_MIN_INTERVAL_SECONDS', 5))
+            if outcome == VERIFY_UNAVAILABLE:
+                return Response({
+                    'status': 'pending',
+                    'message': 'Payment service is temporarily unavailable. Please try again shortly.'
+                }, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': retry_after})
             else:
-                return Response({'status': 'failed', 'message': 'Payment not verified'}, status=status.HTTP_400_BAD_REQUEST)
+                return Response({'status': 'failed', 'message': 'Payment not verified'},
+                                status=status.HTTP_400_BAD_REQUEST, headers={'Retry-After': retry_after})
 
         except Transaction.DoesNotExist:
             return Response({'error': 'Transaction not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -4,10 +4,12 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from .models import StaffMember, StaffAttendance, StaffTask
 from .serializers import StaffMemberSerializer, StaffAttendanceSerializer, StaffTaskSerializer
+from TeqwaCore.cache import cache_public_response
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_public_response('staff', vary_on_role=True)
 def staff_list(request):
     """List all active staff members"""
     active_only = request.GET.get('active', '').lower() == 'true'
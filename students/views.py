@@ -6,6 +6,7 @@ from django.utils import timezone
 from django.db.models import Q, Count, Avg
 from django.contrib.auth import get_user_model
 
+from TeqwaCore.pagination import paginated_response
 from .models import (
     Student, Parent, Course, Timetable, Assignment, Exam,
     Submission, Grade, StudentMessage, Announcement
@@ -331,13 +332,11 @@ def student_messages(request):
     if request.method == 'GET':
         messages = StudentMessage.objects.filter(
             Q(sender=request.user) | Q(recipient=request.user)
-        ).order_by('-created_at')
-        serializer = StudentMessageSerializer(messages, many=True)
-        return Response({
-            'message': 'Messages retrieved successfully',
-            'data': serializer.data,
-            'count': messages.count()
-        })
+        ).select_related('sender', 'recipient', 'course')
+        return paginated_response(
+            request, messages, StudentMessageSerializer,
+            message='Messages retrieved successfully'
+        )
 
     elif request.method == 'POST':
         # Students can only message teachers